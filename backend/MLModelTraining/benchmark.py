@@ -0,0 +1,426 @@
+# backend/MLModelTraining/benchmark.py
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Benchmarks for the feature, training, prediction and standings hot paths.
+# Every (case, scale) pair runs in its own worker process so peak RSS and
+# cold-start numbers are not polluted by earlier cases. Results are written to
+# data/files/Benchmarks/latest.json and compared against baseline.json.
+#
+#   python benchmark.py                      # all cases at 1x, 10x and 100x
+#   python benchmark.py --cases predict_match_warm --scales 1 10
+#   python benchmark.py --save-baseline      # record the current numbers
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+SCRIPTS_DIR = BASE_DIR / "data" / "scripts"
+SOURCE_DIR = BASE_DIR / "data" / "files" / "StandardizedSeasonMatches"
+BENCH_DIR = BASE_DIR / "data" / "files" / "Benchmarks"
+DATASET_DIR = BENCH_DIR / "datasets"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+LATEST_PATH = BENCH_DIR / "latest.json"
+
+SCALES = (1, 10, 100)
+# Wall time more than this fraction above the baseline counts as a regression
+REGRESSION_THRESHOLD = 0.25
+WARM_PREDICTIONS = 200
+# Feature rows per scale step for the batched predict_proba cases
+BATCH_ROWS = 1000
+MODEL_DIR = BASE_DIR / "data" / "files" / "MLModels"
+
+sys.path.append(str(Path(__file__).resolve().parent))
+sys.path.append(str(SCRIPTS_DIR))
+
+
+def scale_label(scale, synthetic=False):
+    """Key for a dataset in the results, e.g. '10' or '10-synthetic'"""
+    return f"{scale}-synthetic" if synthetic else str(scale)
+
+
+def dataset_dir(scale, synthetic=False):
+    """Root of the scaled dataset; season files live in its StandardizedSeasonMatches folder"""
+    return DATASET_DIR / f"x{scale_label(scale, synthetic)}"
+
+
+def build_dataset(scale, synthetic=False):
+    """The bundled seasons plus scale - 1 extra leagues per season.
+
+    By default extra league n is a tiled copy of the bundled fixtures: team
+    names get an ' L<n>' suffix, team IDs are offset by 100 * (n - 1) and
+    MatchIDs are shifted past the previous copy. With synthetic=True the
+    extra leagues come from synthetic_matches instead. Skipped if the dataset
+    is already current.
+    """
+    import pandas as pd
+    from match_store import source_signatures
+    from synthetic_matches import generate_seasons
+
+    root = dataset_dir(scale, synthetic)
+    season_dir = root / "StandardizedSeasonMatches"
+    meta_path = root / "dataset.json"
+    sources = source_signatures(SOURCE_DIR)
+    if meta_path.exists():
+        with open(meta_path) as f:
+            if json.load(f) == {'scale': scale, 'synthetic': synthetic, 'sources': sources}:
+                return root
+
+    season_dir.mkdir(parents=True, exist_ok=True)
+    season_files = sorted(SOURCE_DIR.glob("EPLS*.csv"))
+    id_stride = max(int(pd.read_csv(file, usecols=['MatchID'])['MatchID'].max()) for file in season_files)
+
+    generated = {}
+    if synthetic and scale > 1:
+        codes = [file.stem.replace('EPLS', '') for file in season_files]
+        generated = generate_seasons(n_leagues=scale - 1, n_seasons=len(codes), first_season=2000 + int(codes[0][:2]),
+                                     first_team_id=100, first_match_id=id_stride + 1)
+
+    for file in season_files:
+        season = pd.read_csv(file)
+        copies = [season]
+        code = file.stem.replace('EPLS', '')
+        if code in generated:
+            copies.append(generated[code])
+        for n in range(2, scale + 1) if not synthetic else []:
+            copy = season.copy()
+            for col in ['HomeTeam', 'AwayTeam']:
+                copy[col] = copy[col] + f" L{n}"
+            for col in ['homeTeamID', 'awayTeamID']:
+                copy[col] = copy[col] + 100 * (n - 1)
+            copy['MatchID'] = copy['MatchID'] + id_stride * (n - 1)
+            copies.append(copy)
+        pd.concat(copies, ignore_index=True).to_csv(season_dir / file.name, index=False)
+
+    with open(meta_path, "w") as f:
+        json.dump({'scale': scale, 'synthetic': synthetic, 'sources': sources}, f)
+    return root
+
+
+# --- Cases ---------------------------------------------------------------
+# Each setup takes the dataset root and returns a callable that runs the
+# measured code once and returns the number of rows (or predictions) handled.
+
+def _engineer(root):
+    from feature_engineering import FeatureEngineer
+    from match_store import open_match_store
+    open_match_store(root / "StandardizedSeasonMatches")  # Store build is not part of the measurement
+    return FeatureEngineer(root / "StandardizedSeasonMatches", root / "MLData")
+
+
+def setup_load_all_seasons(root):
+    engineer = _engineer(root)
+    return lambda: len(engineer.load_all_seasons())
+
+
+def setup_create_current_season_features(root):
+    engineer = _engineer(root)
+    matches = engineer.load_all_seasons()
+    return lambda: len(engineer.create_current_season_features(matches)[0])
+
+
+def setup_create_historical_features(root):
+    engineer = _engineer(root)
+    matches = engineer.load_all_seasons()
+    return lambda: len(engineer.create_historical_features(matches)[0])
+
+
+def _historical_training(root):
+    engineer = _engineer(root)
+    features, _ = engineer.create_historical_features(engineer.load_all_seasons())
+    return features.drop(columns=['Season'])
+
+
+def setup_prepare_data_splits(root):
+    from train_models import EnsembleModelTrainer
+    trainer = EnsembleModelTrainer()
+    training = _historical_training(root)
+    return lambda: len(trainer.prepare_data_splits(training)[0])
+
+
+def setup_train_with_validation(root):
+    from train_models import EnsembleModelTrainer
+    trainer = EnsembleModelTrainer()
+    X_train, X_val, _, y_train, y_val, *_ = trainer.prepare_data_splits(_historical_training(root))
+
+    def run():
+        trainer.train_with_validation(X_train, X_val, y_train, y_val)
+        return len(X_train)
+    return run
+
+
+def _predictor_class(root):
+    from predict_matches import CrossSeasonMatchPredictor
+
+    class BenchmarkPredictor(CrossSeasonMatchPredictor):
+        DATA_DIR = root / "StandardizedSeasonMatches"
+        INDEX_DIR = root / "MLData"
+    return BenchmarkPredictor
+
+
+def setup_predict_match_warm(root):
+    from match_store import open_match_store
+    open_match_store(root / "StandardizedSeasonMatches")
+    predictor = _predictor_class(root)()
+    predictor.predict_match('Arsenal', 'Chelsea', '2324', '2324')
+
+    def run():
+        for i in range(WARM_PREDICTIONS):
+            season = ('1819', '2021', '2223', '2324')[i % 4]
+            predictor.predict_match('Arsenal', 'Liverpool', season, '2324')
+        return WARM_PREDICTIONS
+    return run
+
+
+def setup_predict_match_cold(root):
+    # Nothing is imported before the measurement; the indexes for the dataset are
+    # expected to exist already (predict_match_warm runs first and builds them)
+    def run():
+        _predictor_class(root)().predict_match('Arsenal', 'Chelsea', '2324', '2324')
+        return 1
+    return run
+
+
+def setup_load_model_pickles(root):
+    def run():
+        import joblib
+        for part in ('ensemble', 'scaler', 'features'):
+            joblib.load(MODEL_DIR / f'historical_{part}.pkl')
+        return 1
+    return run
+
+
+def _export_kernel():
+    """Kernel exported from the current pickles into the benchmark directory"""
+    import joblib
+    from ensemble_kernel import EnsembleKernel
+    kernel = EnsembleKernel.from_sklearn(*[joblib.load(MODEL_DIR / f'historical_{part}.pkl')
+                                           for part in ('ensemble', 'scaler', 'features')])
+    path = DATASET_DIR / 'historical_kernel.npz'
+    kernel.save(path)
+    return path
+
+
+def setup_load_model_kernel(root):
+    # The kernel is exported by the parent process, so sklearn is never imported here
+    def run():
+        from ensemble_kernel import EnsembleKernel
+        EnsembleKernel.load(DATASET_DIR / 'historical_kernel.npz')
+        return 1
+    return run
+
+
+def _batch_rows(root, n_features):
+    """BATCH_ROWS standard-normal (already scaled) rows per scale step of the dataset"""
+    import numpy as np
+    scale = int(root.name.lstrip('x').split('-')[0])
+    return np.random.default_rng(0).standard_normal((BATCH_ROWS * scale, n_features))
+
+
+def setup_predict_batch_sklearn(root):
+    import joblib
+    ensemble = joblib.load(MODEL_DIR / 'historical_ensemble.pkl')
+    X = _batch_rows(root, ensemble.n_features_in_)
+
+    def run():
+        ensemble.predict_proba(X)
+        return len(X)
+    return run
+
+
+def setup_predict_batch_kernel(root):
+    from ensemble_kernel import EnsembleKernel
+    kernel = EnsembleKernel.load(DATASET_DIR / 'historical_kernel.npz')
+    X = _batch_rows(root, len(kernel.feature_names))
+
+    def run():
+        kernel.predict_proba(X)
+        return len(X)
+    return run
+
+
+def setup_createyearlystandings(root):
+    import pullAllData
+    from match_store import open_match_store
+    open_match_store(root / "StandardizedSeasonMatches")
+    pullAllData.DATA_DIR = str(root / "StandardizedSeasonMatches")
+    pullAllData.STANDINGS_DIR = str(root / "Standings")
+    os.makedirs(pullAllData.STANDINGS_DIR, exist_ok=True)
+    matches = len(pullAllData.load_matches(columns=['MatchID'], source_dir=pullAllData.DATA_DIR))
+
+    def run():
+        pullAllData.createyearlystandings()
+        return matches
+    return run
+
+
+# name -> (setup, largest scale run by default)
+CASES = {
+    'load_all_seasons': (setup_load_all_seasons, 100),
+    'create_current_season_features': (setup_create_current_season_features, 100),
+    'create_historical_features': (setup_create_historical_features, 100),
+    'prepare_data_splits': (setup_prepare_data_splits, 100),
+    'train_with_validation': (setup_train_with_validation, 1),  # SVC fits grow super-linearly
+    'predict_match_warm': (setup_predict_match_warm, 100),
+    'predict_match_cold': (setup_predict_match_cold, 100),
+    'load_model_pickles': (setup_load_model_pickles, 1),  # model cases do not depend on the dataset
+    'load_model_kernel': (setup_load_model_kernel, 1),
+    'predict_batch_sklearn': (setup_predict_batch_sklearn, 10),
+    'predict_batch_kernel': (setup_predict_batch_kernel, 10),
+    'createyearlystandings': (setup_createyearlystandings, 100),
+}
+COLD_CASES = {'predict_match_cold', 'load_model_pickles', 'load_model_kernel'}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    # ru_maxrss survives exec on Linux, so a worker would report the parent's peak;
+    # VmHWM starts afresh with the new program
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_worker(case, scale, repeat, synthetic=False):
+    """Run one case in this process and print its measurements as JSON"""
+    os.chdir(BASE_DIR)
+    root = dataset_dir(scale, synthetic)
+    setup, _ = CASES[case]
+
+    log = io.StringIO()  # Pipeline progress prints are not part of the report
+    with redirect_stdout(log):
+        run = setup(root)
+        walls, cpus, rows = [], [], 0
+        for _ in range(repeat):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            rows = run()
+            walls.append(time.perf_counter() - wall_start)
+            cpus.append(time.process_time() - cpu_start)
+
+    wall = min(walls)
+    print(json.dumps({
+        'wall_s': wall,
+        'wall_runs_s': walls,
+        'cpu_s': min(cpus),
+        'rows': rows,
+        'throughput_rows_s': rows / wall if wall else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def run_case(case, scale, repeat, synthetic=False):
+    """Measurements for one case from a fresh worker process"""
+    command = [sys.executable, __file__, '--worker', case, '--scales', str(scale), '--repeat', str(repeat)]
+    result = subprocess.run(command + (['--synthetic'] if synthetic else []), capture_output=True, text=True)
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'worker failed'}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print a table of the results against the baseline; returns the regressed (case, scale) pairs"""
+    regressions = []
+    print(f"\n{'case':32} {'scale':>12} {'wall s':>9} {'rows/s':>12} {'RSS MB':>8} {'vs baseline':>12}")
+    for case, by_scale in results.items():
+        for scale, result in by_scale.items():
+            if 'error' in result or 'skipped' in result:
+                print(f"{case:32} {scale:>12} {result.get('error') or result['skipped']}")
+                continue
+
+            change = ''
+            base = baseline.get(case, {}).get(scale)
+            if base and 'wall_s' in base:
+                ratio = result['wall_s'] / base['wall_s'] - 1
+                change = f"{ratio:+.0%}"
+                if ratio > threshold:
+                    change += ' REGRESSION'
+                    regressions.append((case, scale))
+            print(f"{case:32} {scale:>12} {result['wall_s']:9.3f} {result['throughput_rows_s']:12.1f} "
+                  f"{result['peak_rss_mb']:8.0f} {change:>12}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ML pipeline hot paths")
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--scales', nargs='+', type=int, default=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case; the fastest is reported")
+    parser.add_argument('--synthetic', action='store_true',
+                        help="fill the extra leagues with generated seasons instead of tiled copies")
+    parser.add_argument('--all-scales', action='store_true', help="ignore the per-case scale limits")
+    parser.add_argument('--save-baseline', action='store_true', help="store these results as the baseline")
+    parser.add_argument('--worker', metavar='CASE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.scales[0], args.repeat, args.synthetic)
+        return 0
+
+    DATASET_DIR.mkdir(parents=True, exist_ok=True)
+    if any(case.endswith('kernel') for case in args.cases):
+        _export_kernel()
+    results = {case: {} for case in args.cases}
+    for scale in args.scales:
+        label = scale_label(scale, args.synthetic)
+        print(f"Preparing {label}x dataset...")
+        build_dataset(scale, args.synthetic)
+        for case in args.cases:
+            _, max_scale = CASES[case]
+            if scale > max_scale and not args.all_scales:
+                results[case][label] = {'skipped': f"above {max_scale}x (use --all-scales)"}
+                continue
+            # Cold starts are only meaningful once per process
+            repeat = 1 if case in COLD_CASES else args.repeat
+            print(f"  {case} @ {label}x")
+            results[case][label] = run_case(case, scale, repeat, args.synthetic)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(LATEST_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)['results']
+    regressions = compare(results, baseline)
+
+    if args.save_baseline:
+        # Cases and scales that were not run keep their previous baseline
+        for case, by_scale in results.items():
+            baseline.setdefault(case, {}).update(by_scale)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({**report, 'results': baseline}, f, indent=2)
+        print(f"\nBaseline saved to {BASELINE_PATH}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# backend/MLModelTraining/candidate_cache.py
+import copy
+import joblib
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from instrumentation import stage
+
+
+def describe(model):
+    """Short label such as 'SVC C=10.0 gamma=auto' from the params that differ from the defaults"""
+    defaults = type(model)().get_params()
+    params = [f"{name}={value}" for name, value in model.get_params().items()
+              if name != 'random_state' and value != defaults.get(name)]
+    return ' '.join([type(model).__name__] + params)
+
+
+def _fit_candidate(model, X_train, y_train, X_val):
+    """Fit one candidate and predict the validation set (runs in a worker)"""
+    with stage(f"fit {describe(model)}", rows=len(X_train)):
+        model.fit(X_train, y_train)
+    return model, model.predict(X_val)
+
+
+class CandidateCache:
+    """Fitted candidate models for one train/validation split.
+
+    Models are keyed by (estimator, params, data fingerprint). random_state is
+    only part of the key for estimators whose fit actually uses it, so retrain
+    attempts that differ only in seed reuse the deterministic fits instead of
+    repeating them.
+    """
+
+    def __init__(self, X_train, y_train, X_val, n_jobs=-1):
+        self.X_train = X_train
+        self.y_train = y_train
+        self.X_val = X_val
+        self.n_jobs = n_jobs
+        self.fingerprint = joblib.hash((X_train, y_train, X_val))
+        self.fitted = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def seed_dependent(model) -> bool:
+        """Whether refitting with a different random_state can change the model"""
+        if isinstance(model, SVC):
+            return model.probability is True  # Platt scaling uses a seeded internal CV
+        if isinstance(model, LogisticRegression):
+            return model.solver in ('liblinear', 'sag', 'saga')
+        return 'random_state' in model.get_params()
+
+    def key(self, model):
+        params = model.get_params()
+        if not self.seed_dependent(model):
+            params.pop('random_state', None)
+        return (type(model).__name__, repr(sorted(params.items())), self.fingerprint)
+
+    def fit(self, models):
+        """Fitted models and validation predictions, in the order given; only cache misses are fitted"""
+        keys = [self.key(model) for model in models]
+        missing = {}
+        for key, model in zip(keys, models):
+            if key not in self.fitted and key not in missing:
+                missing[key] = model
+
+        self.hits += len(models) - len(missing)
+        self.misses += len(missing)
+        results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_candidate)(model, self.X_train, self.y_train, self.X_val) for model in missing.values()
+        )
+        self.fitted.update(zip(missing, results))
+
+        fitted = []
+        for key, model in zip(keys, models):
+            cached, val_pred = self.fitted[key]
+            if cached is not model:
+                # Same fitted state, but report the params that were asked for (e.g. the attempt's seed)
+                cached = copy.copy(cached)
+                cached.set_params(**model.get_params())
+            fitted.append((cached, val_pred))
+        return fitted
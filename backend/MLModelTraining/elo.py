@@ -0,0 +1,70 @@
+# backend/MLModelTraining/elo.py
+import numpy as np
+
+
+def expected_score(home_rating, away_rating, home_advantage=0):
+    """Expected home score given the two ratings (floats or arrays)"""
+    return 1 / (1 + 10 ** ((away_rating - (home_rating + home_advantage)) / 400))
+
+
+class EloRatingEngine:
+    """Elo ratings stored in a flat array indexed by encoded team ID"""
+
+    def __init__(self, n_teams, k_factor=32, initial_rating=1500, home_advantage=0):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.home_advantage = home_advantage
+        self.ratings = np.full(n_teams, float(initial_rating))
+
+    @staticmethod
+    def encode_results(ftr):
+        """Map an FTR column to home scores (1 win, 0.5 draw, 0 otherwise)"""
+        ftr = np.asarray(ftr)
+        return np.where(ftr == 'H', 1.0, np.where(ftr == 'D', 0.5, 0.0))
+
+    def resize(self, n_teams):
+        """Grow the rating table, giving new teams the initial rating"""
+        if n_teams > len(self.ratings):
+            extra = np.full(n_teams - len(self.ratings), float(self.initial_rating))
+            self.ratings = np.concatenate([self.ratings, extra])
+
+    def expected_home(self, home_id, away_id):
+        """Expected home score for a fixture under the current ratings"""
+        return expected_score(self.ratings[home_id], self.ratings[away_id], self.home_advantage)
+
+    def update(self, home_id, away_id, result):
+        """Apply one match and return the pre-match (home, away) ratings"""
+        home_rating = float(self.ratings[home_id])
+        away_rating = float(self.ratings[away_id])
+
+        expected = expected_score(home_rating, away_rating, self.home_advantage)
+        self.ratings[home_id] = home_rating + self.k_factor * (result - expected)
+        self.ratings[away_id] = away_rating + self.k_factor * ((1 - result) - (1 - expected))
+
+        return home_rating, away_rating
+
+    def replay(self, home_ids, away_ids, results):
+        """Apply matches in order and return arrays of pre-match home/away ratings"""
+        home_ids = np.asarray(home_ids, dtype=np.int64)
+        away_ids = np.asarray(away_ids, dtype=np.int64)
+        results = np.asarray(results, dtype=np.float64)
+
+        # Plain Python floats avoid per-element NumPy scalar overhead in the sequential loop
+        ratings = self.ratings.tolist()
+        k_factor = self.k_factor
+        home_advantage = self.home_advantage
+        home_ratings = np.empty(len(home_ids))
+        away_ratings = np.empty(len(home_ids))
+
+        for i, (home_id, away_id, result) in enumerate(zip(home_ids.tolist(), away_ids.tolist(), results.tolist())):
+            home_rating = ratings[home_id]
+            away_rating = ratings[away_id]
+            home_ratings[i] = home_rating
+            away_ratings[i] = away_rating
+
+            expected = expected_score(home_rating, away_rating, home_advantage)
+            ratings[home_id] = home_rating + k_factor * (result - expected)
+            ratings[away_id] = away_rating + k_factor * ((1 - result) - (1 - expected))
+
+        self.ratings = np.array(ratings)
+        return home_ratings, away_ratings
@@ -0,0 +1,364 @@
+# backend/MLModelTraining/ensemble_kernel.py
+import json
+import numpy as np
+from pathlib import Path
+
+# Pure-NumPy inference for the trained soft-voting ensemble. The scaler and
+# the LR, KNN and SVC members are exported to a single .npz file, so the
+# predictor can score fixtures without importing scikit-learn, pandas or
+# joblib. predict_proba mirrors what sklearn computes for the same members.
+
+KERNEL_SUFFIX = '_kernel.npz'
+# Bumped whenever the arrays or metadata stored in the .npz change
+FORMAT_VERSION = 2
+# Rows scored per block, bounding the (rows, reference rows) distance matrices
+CHUNK_ROWS = 2048
+# Largest probability difference from sklearn accepted at export, by the dtype the
+# ensemble was trained on (sklearn computes float32 models partly in float32)
+PARITY_ATOL = {'float64': 1e-9, 'float32': 1e-6}
+# Neighbour search for the KNN member: a scan of the reference matrix, or a
+# scipy KD-tree (imported only when asked for)
+KNN_INDEXES = ('brute', 'kd_tree')
+DEFAULT_LEAF_SIZE = 64
+DISTANCE_BLOCK = 2 ** 22
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(values):
+    return 0.5 * (1 + np.tanh(0.5 * values))
+
+
+def _kernel_matrix(X, support_vectors, kernel, gamma, degree, coef0):
+    """libsvm kernel values between every row of X and every support vector"""
+    if kernel == 'linear':
+        return X @ support_vectors.T
+    if kernel == 'rbf':
+        sq_dist = ((X ** 2).sum(axis=1)[:, None] - 2 * X @ support_vectors.T
+                   + (support_vectors ** 2).sum(axis=1)[None, :])
+        return np.exp(-gamma * np.maximum(sq_dist, 0))
+    if kernel == 'poly':
+        return (gamma * X @ support_vectors.T + coef0) ** degree
+    if kernel == 'sigmoid':
+        return np.tanh(gamma * X @ support_vectors.T + coef0)
+    raise ValueError(f"Unsupported SVC kernel '{kernel}'")
+
+
+def _ovr_decision(decision, n_classes):
+    """SVC's one-vs-rest decision values from one-vs-one ones: votes plus scaled confidence"""
+    votes = np.zeros((len(decision), n_classes))
+    confidence = np.zeros((len(decision), n_classes))
+    pair = 0
+    for i in range(n_classes):
+        for j in range(i + 1, n_classes):
+            confidence[:, i] += decision[:, pair]
+            confidence[:, j] -= decision[:, pair]
+            votes[:, i] += decision[:, pair] >= 0
+            votes[:, j] += decision[:, pair] < 0
+            pair += 1
+    return votes + confidence / (3 * (np.abs(confidence) + 1))
+
+
+def _pairwise_coupling(pairwise, n_classes):
+    """Class probabilities from pairwise probabilities (libsvm's multiclass_probability).
+
+    pairwise[:, i, j] is P(class i | class i or j). Iterates per row until the
+    same tolerance libsvm uses is reached.
+    """
+    n_rows = pairwise.shape[0]
+    Q = -pairwise.transpose(0, 2, 1) * pairwise
+    diag = (pairwise.transpose(0, 2, 1) ** 2).sum(axis=2) - pairwise.diagonal(axis1=1, axis2=2) ** 2
+    idx = np.arange(n_classes)
+    Q[:, idx, idx] = diag
+
+    p = np.full((n_rows, n_classes), 1.0 / n_classes)
+    eps = 0.005 / n_classes
+    active = np.ones(n_rows, dtype=bool)
+    for _ in range(max(100, n_classes)):
+        Qp = np.einsum('nij,nj->ni', Q, p)
+        pQp = (p * Qp).sum(axis=1)
+        active &= np.abs(Qp - pQp[:, None]).max(axis=1) >= eps
+        if not active.any():
+            break
+        rows = np.flatnonzero(active)
+        Qa, pa, Qpa, pQpa = Q[rows], p[rows], Qp[rows], pQp[rows]
+        for t in range(n_classes):
+            diff = (-Qpa[:, t] + pQpa) / Qa[:, t, t]
+            pa[:, t] += diff
+            pQpa = (pQpa + diff * (diff * Qa[:, t, t] + 2 * Qpa[:, t])) / (1 + diff) ** 2
+            Qpa = (Qpa + diff[:, None] * Qa[:, t, :]) / (1 + diff)[:, None]
+            pa /= (1 + diff)[:, None]
+        p[rows] = pa
+    return p
+
+
+def knn_proba(X, reference, labels, k, weights, n_classes, tree=None):
+    """KNeighborsClassifier.predict_proba over a reference matrix or a KD-tree built on it.
+
+    labels are class indices; weights is 'uniform' or 'distance'.
+    """
+    if tree is not None:
+        distances, nearest = tree.query(X, k=[*range(1, k + 1)])
+    else:
+        # Distances are computed at the precision the reference matrix is stored in,
+        # a block of rows at a time so the distance matrix stays around DISTANCE_BLOCK entries
+        X = X.astype(reference.dtype, copy=False)
+        reference_sq = (reference ** 2).sum(axis=1)
+        block = max(1, DISTANCE_BLOCK // len(reference))
+        distances = np.empty((len(X), k))
+        nearest = np.empty((len(X), k), dtype=np.intp)
+        for start in range(0, len(X), block):
+            rows = X[start:start + block]
+            sq_dist = np.maximum((rows ** 2).sum(axis=1)[:, None] - 2 * rows @ reference.T + reference_sq, 0)
+            block_nearest = np.argpartition(sq_dist, k - 1, axis=1)[:, :k]
+            nearest[start:start + block] = block_nearest
+            distances[start:start + block] = np.sqrt(np.take_along_axis(sq_dist, block_nearest, axis=1))
+
+    if weights == 'distance':
+        with np.errstate(divide='ignore'):
+            neighbour_weights = 1.0 / distances
+        # Exact matches take all the weight, as in sklearn
+        exact = np.isinf(neighbour_weights)
+        exact_rows = exact.any(axis=1)
+        neighbour_weights[exact_rows] = exact[exact_rows]
+    else:
+        neighbour_weights = np.ones_like(distances)
+
+    proba = np.zeros((len(X), n_classes))
+    np.add.at(proba, (np.arange(len(X))[:, None], labels[nearest]), neighbour_weights)
+    return proba / proba.sum(axis=1, keepdims=True)
+
+
+class EnsembleKernel:
+    """Scaler plus LR/KNN/SVC soft-voting ensemble evaluated with NumPy only"""
+
+    def __init__(self, arrays: dict, meta: dict, knn_index='brute', leaf_size=DEFAULT_LEAF_SIZE):
+        self.arrays = arrays
+        self.meta = meta
+        self.classes_ = arrays['classes']
+        self.feature_names = meta['feature_names']
+        self.set_knn_index(knn_index, leaf_size)
+
+    def set_knn_index(self, knn_index, leaf_size=DEFAULT_LEAF_SIZE):
+        """Choose how the KNN member finds neighbours (see KNN_INDEXES)"""
+        if knn_index not in KNN_INDEXES:
+            raise ValueError(f"Unknown KNN index '{knn_index}', expected one of {KNN_INDEXES}")
+        self.knn_index = knn_index
+        self._knn_tree = None
+        if knn_index == 'kd_tree':
+            from scipy.spatial import cKDTree
+            self._knn_tree = cKDTree(self.arrays['knn_X'], leafsize=leaf_size)
+
+    @classmethod
+    def from_sklearn(cls, ensemble, scaler, feature_names, source=None, knn_dtype=None) -> 'EnsembleKernel':
+        """Collect the fitted parameters of a VotingClassifier(lr, knn, svm) and its scaler.
+
+        knn_dtype (e.g. 'float32') stores the KNN reference matrix at lower
+        precision, halving its size at the cost of exact parity with sklearn.
+        """
+        members = ensemble.named_estimators_
+        lr, knn, svm = members['lr'], members['knn'], members['svm']
+        calibrators = None
+        if hasattr(svm, 'calibrated_classifiers_'):
+            # SVC calibrated on the validation split: one sigmoid per class over its OvR decision value
+            calibrated = svm.calibrated_classifiers_[0]
+            svm, calibrators = calibrated.estimator.estimator, calibrated.calibrators
+        if knn.effective_metric_ != 'euclidean':
+            raise ValueError(f"Unsupported KNN metric '{knn.effective_metric_}'")
+
+        arrays = {
+            'classes': np.asarray(ensemble.classes_),
+            'scaler_mean': np.asarray(scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)),
+            'scaler_scale': np.asarray(scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)),
+            'lr_coef': lr.coef_,
+            'lr_intercept': lr.intercept_,
+            'knn_X': knn._fit_X if knn_dtype is None else knn._fit_X.astype(knn_dtype),
+            'knn_y': knn._y,
+            'svm_support_vectors': svm.support_vectors_,
+            'svm_dual_coef': svm.dual_coef_,
+            'svm_intercept': svm.intercept_,
+            'svm_n_support': svm.n_support_,
+        }
+        if calibrators is None:
+            arrays['svm_prob_a'], arrays['svm_prob_b'] = svm._probA, svm._probB
+        else:
+            arrays['svm_prob_a'] = np.array([calibrator.a_ for calibrator in calibrators])
+            arrays['svm_prob_b'] = np.array([calibrator.b_ for calibrator in calibrators])
+        meta = {
+            'feature_names': list(feature_names),
+            'training_dtype': str(knn._fit_X.dtype),
+            'voting_weights': None if ensemble.weights is None else list(ensemble.weights),
+            'lr_ovr': lr.solver == 'liblinear',
+            'knn_neighbors': int(knn.n_neighbors),
+            'knn_weights': knn.weights,
+            'svm_kernel': svm.kernel,
+            'svm_gamma': float(svm._gamma),
+            'svm_degree': int(svm.degree),
+            'svm_coef0': float(svm.coef0),
+            'svm_calibration': 'platt_cv' if calibrators is None else 'validation',
+            'format_version': FORMAT_VERSION,
+            'source': source,
+        }
+        return cls(arrays, meta)
+
+    def save(self, path):
+        np.savez(path, meta=np.array(json.dumps(self.meta)), **self.arrays)
+
+    @classmethod
+    def load(cls, path, knn_index='brute', leaf_size=DEFAULT_LEAF_SIZE) -> 'EnsembleKernel':
+        with np.load(path, allow_pickle=False) as saved:
+            arrays = {name: saved[name] for name in saved.files if name != 'meta'}
+            meta = json.loads(str(saved['meta']))
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"{path} has kernel format {meta.get('format_version')}, expected {FORMAT_VERSION}; "
+                             f"re-export it from the ensemble pickle")
+        return cls(arrays, meta, knn_index, leaf_size)
+
+    def transform(self, X):
+        """Standardize raw feature rows like the fitted StandardScaler"""
+        return (np.asarray(X, dtype=float) - self.arrays['scaler_mean']) / self.arrays['scaler_scale']
+
+    def _lr_proba(self, X):
+        scores = X @ self.arrays['lr_coef'].T + self.arrays['lr_intercept']
+        if not self.meta['lr_ovr']:
+            return _softmax(scores)
+        proba = _sigmoid(scores)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def _knn_proba(self, X):
+        return knn_proba(X, self.arrays['knn_X'], self.arrays['knn_y'], self.meta['knn_neighbors'],
+                         self.meta['knn_weights'], len(self.classes_), self._knn_tree)
+
+    def _svm_proba(self, X):
+        arrays, meta = self.arrays, self.meta
+        kernel = _kernel_matrix(X, arrays['svm_support_vectors'], meta['svm_kernel'], meta['svm_gamma'],
+                                meta['svm_degree'], meta['svm_coef0'])
+        n_classes = len(self.classes_)
+        starts = np.concatenate([[0], np.cumsum(arrays['svm_n_support'])])
+        dual_coef = arrays['svm_dual_coef']
+
+        # One-vs-one decision values in libsvm's pair order
+        decision = np.empty((len(X), n_classes * (n_classes - 1) // 2))
+        pair = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                sv_i = slice(starts[i], starts[i + 1])
+                sv_j = slice(starts[j], starts[j + 1])
+                decision[:, pair] = (kernel[:, sv_i] @ dual_coef[j - 1, sv_i] + kernel[:, sv_j] @ dual_coef[i, sv_j]
+                                     + arrays['svm_intercept'][pair])
+                pair += 1
+
+        if meta['svm_calibration'] == 'validation':
+            return self._calibrated_proba(_ovr_decision(decision, n_classes))
+
+        # libsvm: Platt scaling per pair, then pairwise coupling
+        pairwise = np.zeros((len(X), n_classes, n_classes))
+        pair = 0
+        for i in range(n_classes):
+            for j in range(i + 1, n_classes):
+                prob = _sigmoid(-(decision[:, pair] * arrays['svm_prob_a'][pair] + arrays['svm_prob_b'][pair]))
+                prob = np.clip(prob, 1e-7, 1 - 1e-7)
+                pairwise[:, i, j] = prob
+                pairwise[:, j, i] = 1 - prob
+                pair += 1
+        return _pairwise_coupling(pairwise, n_classes)
+
+    def _calibrated_proba(self, ovr_decision):
+        """Per-class sigmoids normalised to sum to one, as CalibratedClassifierCV does"""
+        proba = _sigmoid(-(ovr_decision * self.arrays['svm_prob_a'] + self.arrays['svm_prob_b']))
+        total = proba.sum(axis=1, keepdims=True)
+        proba = np.divide(proba, total, out=np.full_like(proba, 1 / proba.shape[1]), where=total != 0)
+        proba[(proba > 1) & (proba <= 1 + 1e-5)] = 1.0
+        return proba
+
+    def predict_proba(self, X_scaled):
+        """Soft-voting class probabilities for already standardized rows"""
+        X_scaled = np.atleast_2d(np.asarray(X_scaled, dtype=float))
+        proba = np.empty((len(X_scaled), len(self.classes_)))
+        for start in range(0, len(X_scaled), CHUNK_ROWS):
+            X = X_scaled[start:start + CHUNK_ROWS]
+            members = [self._lr_proba(X), self._knn_proba(X), self._svm_proba(X)]
+            proba[start:start + CHUNK_ROWS] = np.average(members, axis=0, weights=self.meta['voting_weights'])
+        return proba
+
+    def predict(self, X_scaled):
+        return self.classes_[np.argmax(self.predict_proba(X_scaled), axis=1)]
+
+
+def check_parity(kernel: EnsembleKernel, ensemble, X_scaled, atol=None) -> float:
+    """Largest difference between kernel and sklearn probabilities on X_scaled.
+
+    Raises past atol, which defaults to PARITY_ATOL for the dtype the ensemble was trained on.
+    """
+    if atol is None:
+        atol = PARITY_ATOL.get(kernel.meta.get('training_dtype'), PARITY_ATOL['float64'])
+    if not np.array_equal(kernel.classes_, ensemble.classes_):
+        raise ValueError(f"Kernel classes {kernel.classes_} differ from the ensemble's {ensemble.classes_}")
+    max_diff = float(np.abs(kernel.predict_proba(X_scaled) - ensemble.predict_proba(X_scaled)).max())
+    if max_diff > atol:
+        raise ValueError(f"Kernel probabilities differ from sklearn by up to {max_diff:.2e} (allowed {atol:.0e})")
+    return max_diff
+
+
+def source_signature(ensemble_path) -> dict:
+    """Identifies the ensemble pickle a kernel was exported from"""
+    stat = Path(ensemble_path).stat()
+    return {'ensemble': Path(ensemble_path).name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def export_kernel(model_dir, model_name='historical', X_check=None, knn_dtype=None):
+    """Export <model_name>_ensemble/_scaler/_features.pkl to <model_name>_kernel.npz.
+
+    The kernel is checked against sklearn on X_check (scaled rows) or, by
+    default, on standard-normal rows, which is what scaled features look like.
+    A reduced-precision KNN matrix (knn_dtype) is reported but not held to
+    PARITY_ATOL.
+    """
+    import joblib
+
+    model_dir = Path(model_dir)
+    ensemble_path = model_dir / f'{model_name}_ensemble.pkl'
+    ensemble = joblib.load(ensemble_path)
+    scaler = joblib.load(model_dir / f'{model_name}_scaler.pkl')
+    kernel = EnsembleKernel.from_sklearn(ensemble, scaler, joblib.load(model_dir / f'{model_name}_features.pkl'),
+                                         source_signature(ensemble_path), knn_dtype)
+    if X_check is None:
+        X_check = np.random.default_rng(0).standard_normal((1000, scaler.n_features_in_))
+    max_diff = check_parity(kernel, ensemble, X_check, atol=None if knn_dtype is None else np.inf)
+
+    path = model_dir / f'{model_name}{KERNEL_SUFFIX}'
+    kernel.save(path)
+    return path, max_diff
+
+
+def is_current(kernel_path, ensemble_path) -> bool:
+    """Whether the kernel file has the current format and was exported from the ensemble pickle as it is now"""
+    kernel_path, ensemble_path = Path(kernel_path), Path(ensemble_path)
+    if not kernel_path.exists() or not ensemble_path.exists():
+        return False
+    with np.load(kernel_path, allow_pickle=False) as saved:
+        meta = json.loads(str(saved['meta']))
+    return meta.get('format_version') == FORMAT_VERSION and meta.get('source') == source_signature(ensemble_path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a trained ensemble to a NumPy kernel")
+    parser.add_argument('model_name', nargs='?', default='historical')
+    parser.add_argument('--knn-dtype', choices=['float32'], help="store the KNN reference matrix at lower precision")
+    args = parser.parse_args()
+
+    BASE_DIR = Path(__file__).parent.parent.parent
+    model_dir = BASE_DIR / 'data' / 'files' / 'MLModels'
+    model_name = args.model_name
+    path, max_diff = export_kernel(model_dir, model_name, knn_dtype=args.knn_dtype)
+
+    pickles = sum((model_dir / f'{model_name}_{part}.pkl').stat().st_size for part in ('ensemble', 'scaler', 'features'))
+    print(f"✓ Exported {path}")
+    print(f"  Max probability difference from sklearn: {max_diff:.1e}")
+    print(f"  Size: {path.stat().st_size / 1024:.0f} KB (pickles: {pickles / 1024:.0f} KB)")
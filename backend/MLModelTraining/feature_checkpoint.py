@@ -0,0 +1,79 @@
+# backend/MLModelTraining/feature_checkpoint.py
+import joblib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+class FeatureCheckpoint:
+    """Persisted state needed to extend the feature sets with newly added matches"""
+    CHECKPOINT_NAME = 'feature_checkpoint.pkl'
+
+    # Longest per-team window used by the rolling features
+    HISTORY_WINDOW = 10
+
+    def __init__(self, last_match_id, team_encoder, elo_ratings, h2h_counts, history):
+        self.last_match_id = last_match_id
+        self.team_encoder = team_encoder
+        self.elo_ratings = elo_ratings
+        # (team, team) sorted pair -> [matches, home side wins, away side wins]
+        self.h2h_counts = h2h_counts
+        # Raw match rows the rolling and season-level features still depend on
+        self.history = history
+
+    @property
+    def latest_season(self):
+        return self.history['Season'].max()
+
+    @staticmethod
+    def pair_key(home_team, away_team):
+        return tuple(sorted((home_team, away_team)))
+
+    @classmethod
+    def select_history(cls, matches):
+        """Keep the latest season plus each team's last home and away matches"""
+        matches = matches.assign(_SortDate=pd.to_datetime(matches['Date'], errors='coerce'))
+        matches = matches.sort_values(['_SortDate', 'MatchID'], kind='stable')
+
+        recent_home = matches.groupby('HomeTeam').cumcount(ascending=False) < cls.HISTORY_WINDOW
+        recent_away = matches.groupby('AwayTeam').cumcount(ascending=False) < cls.HISTORY_WINDOW
+        latest_season = matches['Season'] == matches['Season'].max()
+
+        keep = recent_home | recent_away | latest_season
+        return matches[keep].drop(columns=['_SortDate']).reset_index(drop=True)
+
+    @classmethod
+    def count_h2h(cls, matches):
+        """Head-to-head match and win counts for every team pair"""
+        counts = {}
+        home_wins = (matches['FTR'] == 'H').to_numpy()
+        away_wins = (matches['FTR'] == 'A').to_numpy()
+        for home_team, away_team, home_win, away_win in zip(matches['HomeTeam'], matches['AwayTeam'], home_wins, away_wins):
+            entry = counts.setdefault(cls.pair_key(home_team, away_team), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += int(home_win)
+            entry[2] += int(away_win)
+        return counts
+
+    @classmethod
+    def from_matches(cls, matches, team_encoder, elo_engine):
+        """Build a checkpoint after a full feature rebuild"""
+        matches = matches.dropna(subset=['HomeTeam', 'AwayTeam'])
+        return cls(
+            last_match_id=int(matches['MatchID'].max()),
+            team_encoder=team_encoder,
+            elo_ratings=np.array(elo_engine.ratings),
+            h2h_counts=cls.count_h2h(matches),
+            history=cls.select_history(matches),
+        )
+
+    def save(self, output_dir):
+        joblib.dump(self, Path(output_dir) / self.CHECKPOINT_NAME)
+
+    @classmethod
+    def load(cls, output_dir):
+        """Load the checkpoint from output_dir, or None if no full build has run yet"""
+        path = Path(output_dir) / cls.CHECKPOINT_NAME
+        if not path.exists():
+            return None
+        return joblib.load(path)
@@ -1,174 +1,155 @@
 # backend/MLModelTraining/feature_engineering.py
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from sklearn.preprocessing import StandardScaler, LabelEncoder
+from rolling_features import RollingFeatureEngine
+from elo import EloRatingEngine
+from feature_checkpoint import FeatureCheckpoint
+from instrumentation import stage, instrumented
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / 'data' / 'scripts'))
+from match_store import load_matches
 import warnings
 warnings.filterwarnings('ignore')
 
 class FeatureEngineer:
-    def __init__(self, data_dir='data/files/StandardizedSeasonMatches'):
+    # Per-location source columns for the rolling features
+    ROLLING_STATS = {
+        'home': {'goals_scored': 'FTHG', 'goals_conceded': 'FTAG', 'shots': 'HS', 'shots_on_target': 'HST',
+                 'corners': 'HC', 'fouls': 'HF', 'yellow_cards': 'HY'},
+        'away': {'goals_scored': 'FTAG', 'goals_conceded': 'FTHG', 'shots': 'AS', 'shots_on_target': 'AST',
+                 'corners': 'AC', 'fouls': 'AF', 'yellow_cards': 'AY'},
+    }
+    # Features are stored and trained on in single precision; intermediate sums stay float64
+    FEATURE_DTYPE = np.float32
+
+    def __init__(self, data_dir='data/files/StandardizedSeasonMatches', output_dir='data/files/MLData'):
         self.data_dir = Path(data_dir)
+        self.output_dir = Path(output_dir)
         self.scaler = StandardScaler()
         self.team_encoder = LabelEncoder()
         self.current_season = '202526'
 
-    def load_all_seasons(self):
-        """Load all season match data"""
+    @instrumented("load seasons", rows=len)
+    def load_all_seasons(self, min_season=None):
+        """Load all season match data, optionally skipping seasons before min_season"""
         season_files = sorted(self.data_dir.glob('EPLS*.csv'))
+        seasons = [file.stem.replace('EPLS', '') for file in season_files]
+        if min_season is not None:
+            seasons = [season for season in seasons if season >= min_season]
 
-        if not season_files:
+        if not seasons:
             raise FileNotFoundError(
                 f"No season files found in {self.data_dir}. "
                 f"Expected files matching pattern 'EPLS*.csv'"
             )
 
-        all_matches = []
-        print(f"Found {len(season_files)} season files")
+        print(f"Found {len(seasons)} season files")
+        all_matches = load_matches(seasons=seasons, source_dir=self.data_dir)
+        all_matches['Season'] = all_matches['Season'].astype(str)
+
+        for season, count in all_matches['Season'].value_counts(sort=False).items():
+            print(f"  Loaded EPLS{season}: {count} matches")
 
-        for file in season_files:
-            df = pd.read_csv(file)
-            season = file.stem.replace('EPLS', '')
-            df['Season'] = season
-            all_matches.append(df)
-            print(f"  Loaded {file.name}: {len(df)} matches")
+        return all_matches
 
-        return pd.concat(all_matches, ignore_index=True)
+    def compact_features(self, features_df):
+        """Cast float64 feature columns to FEATURE_DTYPE and flags to int8; metadata is left alone"""
+        floats = features_df.select_dtypes('float64').columns
+        features_df[floats] = features_df[floats].astype(self.FEATURE_DTYPE)
+        if 'IsCurrentSeason' in features_df.columns:
+            features_df['IsCurrentSeason'] = features_df['IsCurrentSeason'].astype(np.int8)
+        return features_df
 
-    def encode_teams(self, df):
+    def encode_teams(self, df, fit=True):
         """Encode team names to prevent data leakage"""
         # Remove any NaN values before encoding
         df = df.dropna(subset=['HomeTeam', 'AwayTeam'])
 
-        all_teams = pd.concat([df['HomeTeam'], df['AwayTeam']]).unique()
-        # Filter out any non-string values
-        all_teams = [team for team in all_teams if isinstance(team, str)]
+        if fit:
+            all_teams = pd.concat([df['HomeTeam'], df['AwayTeam']]).unique()
+            # Filter out any non-string values
+            all_teams = [team for team in all_teams if isinstance(team, str)]
 
-        self.team_encoder.fit(all_teams)
+            self.team_encoder.fit(all_teams)
 
         df['HomeTeamEncoded'] = self.team_encoder.transform(df['HomeTeam'])
         df['AwayTeamEncoded'] = self.team_encoder.transform(df['AwayTeam'])
 
         return df
 
+    @instrumented("current season features", rows=lambda result: len(result[0]))
     def create_current_season_features(self, df):
         """Feature engineering for current season prediction model"""
+        features_df, mapping_df = self._build_current_season_features(df)
+        return features_df.dropna(), mapping_df
+
+    def _build_current_season_features(self, df, fit_encoder=True):
+        """Current season features for every match, before incomplete rows are dropped"""
         df = df.copy()
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         df = df.sort_values('Date')
 
         # Encode teams first
-        df = self.encode_teams(df)
-
-        features_df = pd.DataFrame()
-
-        # Team-specific rolling features (no identifiers)
-        for team_col, opp_col, location in [('HomeTeam', 'AwayTeam', 'home'),
-                                            ('AwayTeam', 'HomeTeam', 'away')]:
-
-            # Goals scored/conceded rolling averages
-            for window in [5, 10]:
-                if location == 'home':
-                    goals_scored = df.groupby(team_col)['FTHG'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    goals_conceded = df.groupby(team_col)['FTAG'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                else:
-                    goals_scored = df.groupby(team_col)['FTAG'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    goals_conceded = df.groupby(team_col)['FTHG'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
+        df = self.encode_teams(df, fit=fit_encoder)
 
-                features_df[f'{location}_goals_scored_L{window}'] = goals_scored
-                features_df[f'{location}_goals_conceded_L{window}'] = goals_conceded
-                features_df[f'{location}_goal_diff_L{window}'] = goals_scored - goals_conceded
+        features_df = pd.DataFrame(index=df.index)
 
-            # Shots rolling averages
-            for window in [5, 10]:
-                if location == 'home':
-                    features_df[f'{location}_shots_L{window}'] = df.groupby(team_col)['HS'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    features_df[f'{location}_shots_on_target_L{window}'] = df.groupby(team_col)['HST'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                else:
-                    features_df[f'{location}_shots_L{window}'] = df.groupby(team_col)['AS'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    features_df[f'{location}_shots_on_target_L{window}'] = df.groupby(team_col)['AST'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-
-            # Corners rolling averages
-            for window in [5, 10]:
-                if location == 'home':
-                    features_df[f'{location}_corners_L{window}'] = df.groupby(team_col)['HC'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                else:
-                    features_df[f'{location}_corners_L{window}'] = df.groupby(team_col)['AC'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-
-            # Fouls and cards rolling averages
-            for window in [5, 10]:
-                if location == 'home':
-                    features_df[f'{location}_fouls_L{window}'] = df.groupby(team_col)['HF'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    features_df[f'{location}_yellow_cards_L{window}'] = df.groupby(team_col)['HY'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                else:
-                    features_df[f'{location}_fouls_L{window}'] = df.groupby(team_col)['AF'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-                    features_df[f'{location}_yellow_cards_L{window}'] = df.groupby(team_col)['AY'].transform(
-                        lambda x: x.rolling(window, min_periods=1).mean().shift(1)
-                    )
-
-        # Win/loss streaks
+        # Team-specific rolling features (no identifiers), one batched pass per grouping
         df['HomeWin'] = (df['FTR'] == 'H').astype(int)
         df['AwayWin'] = (df['FTR'] == 'A').astype(int)
         df['Draw'] = (df['FTR'] == 'D').astype(int)
-
-        features_df['home_win_streak'] = df.groupby('HomeTeam')['HomeWin'].transform(
-            lambda x: x.rolling(5, min_periods=1).sum().shift(1)
-        )
-        features_df['away_win_streak'] = df.groupby('AwayTeam')['AwayWin'].transform(
-            lambda x: x.rolling(5, min_periods=1).sum().shift(1)
-        )
-
-        # Form (points in last N matches)
-        def calculate_form(group, window=5):
-            points = []
-            for _, row in group.iterrows():
-                if row['FTR'] == 'H':
-                    points.append(3)
-                elif row['FTR'] == 'D':
-                    points.append(1)
-                else:
-                    points.append(0)
-            return pd.Series(points, index=group.index).rolling(window, min_periods=1).sum().shift(1)
-
-        features_df['home_form_L5'] = df.groupby('HomeTeam').apply(calculate_form).reset_index(level=0, drop=True)
-        features_df['away_form_L5'] = df.groupby('AwayTeam').apply(calculate_form).reset_index(level=0, drop=True)
+        df['FormPoints'] = np.where(df['FTR'] == 'H', 3, np.where(df['FTR'] == 'D', 1, 0))
+
+        team_groups = {}
+        with stage("rolling features", rows=len(df)):
+            for team_col, location in [('HomeTeam', 'home'), ('AwayTeam', 'away')]:
+                engine = RollingFeatureEngine(df[team_col].to_numpy())
+                team_groups[location] = engine
+
+                stat_cols = self.ROLLING_STATS[location]
+                rolling = engine.shifted(df[list(stat_cols.values())].to_numpy(), windows=[5, 10])
+                stat_index = {name: i for i, name in enumerate(stat_cols)}
+
+                for window in [5, 10]:
+                    means = rolling[window]
+                    goals_scored = means[:, stat_index['goals_scored']]
+                    goals_conceded = means[:, stat_index['goals_conceded']]
+                    features_df[f'{location}_goals_scored_L{window}'] = goals_scored
+                    features_df[f'{location}_goals_conceded_L{window}'] = goals_conceded
+                    features_df[f'{location}_goal_diff_L{window}'] = goals_scored - goals_conceded
+
+                for window in [5, 10]:
+                    features_df[f'{location}_shots_L{window}'] = rolling[window][:, stat_index['shots']]
+                    features_df[f'{location}_shots_on_target_L{window}'] = rolling[window][:, stat_index['shots_on_target']]
+
+                for window in [5, 10]:
+                    features_df[f'{location}_corners_L{window}'] = rolling[window][:, stat_index['corners']]
+
+                for window in [5, 10]:
+                    features_df[f'{location}_fouls_L{window}'] = rolling[window][:, stat_index['fouls']]
+                    features_df[f'{location}_yellow_cards_L{window}'] = rolling[window][:, stat_index['yellow_cards']]
+
+        # Win/loss streaks and form (points in last N matches)
+        home_recent = team_groups['home'].shifted(df[['HomeWin', 'FormPoints']].to_numpy(), [5], how='sum')[5]
+        away_recent = team_groups['away'].shifted(df[['AwayWin', 'FormPoints']].to_numpy(), [5], how='sum')[5]
+        features_df['home_win_streak'] = home_recent[:, 0]
+        features_df['away_win_streak'] = away_recent[:, 0]
+        features_df['home_form_L5'] = home_recent[:, 1]
+        features_df['away_form_L5'] = away_recent[:, 1]
 
         # Head-to-head features (encoded)
-        df['MatchPairEncoded'] = df.apply(
-            lambda x: tuple(sorted([x['HomeTeamEncoded'], x['AwayTeamEncoded']])), axis=1
-        )
-        features_df['h2h_home_wins'] = df.groupby('MatchPairEncoded')['HomeWin'].transform(
-            lambda x: x.expanding().sum().shift(1)
-        )
-        features_df['h2h_away_wins'] = df.groupby('MatchPairEncoded')['AwayWin'].transform(
-            lambda x: x.expanding().sum().shift(1)
-        )
+        home_encoded = df['HomeTeamEncoded'].to_numpy()
+        away_encoded = df['AwayTeamEncoded'].to_numpy()
+        n_teams = len(self.team_encoder.classes_)
+        df['MatchPairEncoded'] = np.minimum(home_encoded, away_encoded) * n_teams + np.maximum(home_encoded, away_encoded)
+        h2h = RollingFeatureEngine(df['MatchPairEncoded'].to_numpy()).shifted(
+            df[['HomeWin', 'AwayWin']].to_numpy(), [None], how='sum'
+        )[None]
+        features_df['h2h_home_wins'] = h2h[:, 0]
+        features_df['h2h_away_wins'] = h2h[:, 1]
 
         # Interaction terms
         features_df['goal_diff_interaction'] = (
@@ -192,16 +173,22 @@ class FeatureEngineer:
         # Store mapping for predictions (separate file)
         mapping_df = df[['HomeTeam', 'AwayTeam', 'HomeTeamEncoded', 'AwayTeamEncoded', 'Season', 'Date']].copy()
 
-        return features_df.dropna(), mapping_df
+        return self.compact_features(features_df), mapping_df
 
+    @instrumented("historical features", rows=lambda result: len(result[0]))
     def create_historical_features(self, df):
         """Feature engineering for cross-era historical comparison model"""
+        features_df, mapping_df = self._build_historical_features(df)
+        return features_df.dropna(), mapping_df
+
+    def _build_historical_features(self, df, fit_encoder=True):
+        """Historical features for every match, before incomplete rows are dropped"""
         df = df.copy()
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         df = df.sort_values('Date')
 
         # Encode teams
-        df = self.encode_teams(df)
+        df = self.encode_teams(df, fit=fit_encoder)
 
         features_df = pd.DataFrame()
 
@@ -224,73 +211,53 @@ class FeatureEngineer:
         features_df['away_shot_efficiency'] = df['AST'] / (df['AS'] + 1)
 
         # Relative performance indicators
-        for team_col, location in [('HomeTeam', 'home'), ('AwayTeam', 'away')]:
-            season_team_stats = df.groupby(['Season', team_col]).agg({
-                'FTR': lambda x: (x == location[0].upper()).sum() / len(x)
-            }).reset_index()
-            season_team_stats.columns = ['Season', team_col, f'{location}_win_rate']
-
-            df = df.merge(season_team_stats, on=['Season', team_col], how='left')
-            features_df[f'{location}_relative_win_rate'] = df[f'{location}_win_rate']
-
-            # Points per game
-            def calc_ppg(group):
-                ppg = []
-                total_points = 0
-                matches = 0
-                for _, row in group.iterrows():
-                    if matches > 0:
-                        ppg.append(total_points / matches)
-                    else:
-                        ppg.append(0)
-
-                    if location == 'home' and row['FTR'] == 'H':
-                        total_points += 3
-                    elif location == 'away' and row['FTR'] == 'A':
-                        total_points += 3
-                    elif row['FTR'] == 'D':
-                        total_points += 1
-                    matches += 1
-
-                return pd.Series(ppg, index=group.index)
-
-            features_df[f'{location}_ppg'] = df.groupby(['Season', team_col]).apply(calc_ppg).reset_index(level=[0,1], drop=True)
+        with stage("win rate and ppg", rows=len(df)):
+            for team_col, location in [('HomeTeam', 'home'), ('AwayTeam', 'away')]:
+                season_team_stats = df.groupby(['Season', team_col], observed=True).agg({
+                    'FTR': lambda x: (x == location[0].upper()).sum() / len(x)
+                }).reset_index()
+                season_team_stats.columns = ['Season', team_col, f'{location}_win_rate']
+
+                df = df.merge(season_team_stats, on=['Season', team_col], how='left')
+                features_df[f'{location}_relative_win_rate'] = df[f'{location}_win_rate']
+
+                # Points per game
+                def calc_ppg(group):
+                    ppg = []
+                    total_points = 0
+                    matches = 0
+                    for _, row in group.iterrows():
+                        if matches > 0:
+                            ppg.append(total_points / matches)
+                        else:
+                            ppg.append(0)
+
+                        if location == 'home' and row['FTR'] == 'H':
+                            total_points += 3
+                        elif location == 'away' and row['FTR'] == 'A':
+                            total_points += 3
+                        elif row['FTR'] == 'D':
+                            total_points += 1
+                        matches += 1
+
+                    return pd.Series(ppg, index=group.index)
+
+                features_df[f'{location}_ppg'] = df.groupby(['Season', team_col], observed=True).apply(calc_ppg).reset_index(level=[0,1], drop=True)
 
         # ELO ratings
-        team_ratings = {}
-        initial_rating = 1500
-        k_factor = 32
-
-        home_ratings = []
-        away_ratings = []
-
-        for _, row in df.iterrows():
-            home_team = row['HomeTeam']
-            away_team = row['AwayTeam']
-
-            if home_team not in team_ratings:
-                team_ratings[home_team] = initial_rating
-            if away_team not in team_ratings:
-                team_ratings[away_team] = initial_rating
-
-            home_ratings.append(team_ratings[home_team])
-            away_ratings.append(team_ratings[away_team])
-
-            expected_home = 1 / (1 + 10 ** ((team_ratings[away_team] - team_ratings[home_team]) / 400))
-
-            if row['FTR'] == 'H':
-                actual_home = 1
-            elif row['FTR'] == 'D':
-                actual_home = 0.5
-            else:
-                actual_home = 0
+        with stage("Elo", rows=len(df)):
+            elo = EloRatingEngine(len(self.team_encoder.classes_), k_factor=32, initial_rating=1500)
+            home_ratings, away_ratings = elo.replay(
+                df['HomeTeamEncoded'].to_numpy(),
+                df['AwayTeamEncoded'].to_numpy(),
+                EloRatingEngine.encode_results(df['FTR'].to_numpy())
+            )
 
-            team_ratings[home_team] += k_factor * (actual_home - expected_home)
-            team_ratings[away_team] += k_factor * ((1 - actual_home) - (1 - expected_home))
+            self.elo_engine = elo
 
-        features_df['home_elo_rating'] = home_ratings
-        features_df['away_elo_rating'] = away_ratings
-        features_df['elo_diff'] = features_df['home_elo_rating'] - features_df['away_elo_rating']
+            features_df['home_elo_rating'] = home_ratings
+            features_df['away_elo_rating'] = away_ratings
+            features_df['elo_diff'] = features_df['home_elo_rating'] - features_df['away_elo_rating']
 
         # Style compatibility metrics
         features_df['home_attack_style'] = df['HS'] / (df['HS_season_avg'] + 0.01)
@@ -298,15 +265,16 @@ class FeatureEngineer:
         features_df['style_compatibility'] = features_df['home_attack_style'] * features_df['away_attack_style']
 
         # Consistency metrics
-        for team_col, location in [('HomeTeam', 'home'), ('AwayTeam', 'away')]:
-            if location == 'home':
-                features_df[f'{location}_performance_variance'] = df.groupby(team_col)['FTHG'].transform(
-                    lambda x: x.rolling(10, min_periods=3).std().shift(1)
-                )
-            else:
-                features_df[f'{location}_performance_variance'] = df.groupby(team_col)['FTAG'].transform(
-                    lambda x: x.rolling(10, min_periods=3).std().shift(1)
-                )
+        with stage("performance variance", rows=len(df)):
+            for team_col, location in [('HomeTeam', 'home'), ('AwayTeam', 'away')]:
+                if location == 'home':
+                    features_df[f'{location}_performance_variance'] = df.groupby(team_col)['FTHG'].transform(
+                        lambda x: x.rolling(10, min_periods=3).std().shift(1)
+                    )
+                else:
+                    features_df[f'{location}_performance_variance'] = df.groupby(team_col)['FTAG'].transform(
+                        lambda x: x.rolling(10, min_periods=3).std().shift(1)
+                    )
 
         # Add only necessary metadata
         features_df['FTR'] = df['FTR']
@@ -315,14 +283,18 @@ class FeatureEngineer:
         # Store mapping
         mapping_df = df[['HomeTeam', 'AwayTeam', 'HomeTeamEncoded', 'AwayTeamEncoded', 'Season', 'Date']].copy()
 
-        return features_df.dropna(), mapping_df
+        return self.compact_features(features_df), mapping_df
 
-    def save_processed_data(self):
+    @instrumented("save_processed_data")
+    def save_processed_data(self, incremental=False):
         """Process and save both feature sets with train/val/test splits"""
+        if incremental:
+            return self.update_processed_data()
+
         print("Loading all season data...")
         all_matches = self.load_all_seasons()
 
-        output_dir = Path('data/files/MLData')
+        output_dir = self.output_dir
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Current season features
@@ -366,6 +338,10 @@ class FeatureEngineer:
         joblib.dump(self.team_encoder, output_dir / 'team_encoder.pkl')
         print("Saved team encoder")
 
+        # Save state for incremental updates
+        FeatureCheckpoint.from_matches(all_matches, self.team_encoder, self.elo_engine).save(output_dir)
+        print("Saved feature checkpoint")
+
         print("\n✓ Feature engineering complete!")
         print("  - No date/team identifiers in training data")
         print("  - Current season separated for predictions")
@@ -373,6 +349,97 @@ class FeatureEngineer:
 
         return training_features, current_season_features, historical_training
 
+    def update_processed_data(self):
+        """Append features for matches added since the last run using the saved checkpoint"""
+        output_dir = self.output_dir
+        checkpoint = FeatureCheckpoint.load(output_dir)
+        if checkpoint is None:
+            print("No feature checkpoint found, running a full rebuild...")
+            return self.save_processed_data()
+
+        print(f"Loading seasons from {checkpoint.latest_season} onwards...")
+        recent_matches = self.load_all_seasons(min_season=checkpoint.latest_season)
+        new_matches = recent_matches[recent_matches['MatchID'] > checkpoint.last_match_id]
+        new_matches = new_matches.dropna(subset=['HomeTeam', 'AwayTeam'])
+
+        if new_matches.empty:
+            print("✓ Features already up to date")
+            return None
+
+        # Team encodings are fixed by the checkpoint; a promoted newcomer needs a full rebuild
+        new_teams = set(new_matches['HomeTeam']) | set(new_matches['AwayTeam'])
+        unknown_teams = new_teams - set(checkpoint.team_encoder.classes_)
+        if unknown_teams:
+            print(f"New teams {sorted(unknown_teams)} found, running a full rebuild...")
+            return self.save_processed_data()
+
+        print(f"Computing features for {len(new_matches)} new matches...")
+        self.team_encoder = checkpoint.team_encoder
+        combined = pd.concat([checkpoint.history, new_matches], ignore_index=True)
+        new_index = combined.index[len(checkpoint.history):]
+
+        # Current season features: rolling windows come from the history, H2H from the saved counters
+        current_features, current_mapping = self._build_current_season_features(combined, fit_encoder=False)
+        current_features = current_features[current_features.index.isin(new_index)]
+        current_mapping = current_mapping[current_mapping.index.isin(new_index)]
+
+        h2h_home_wins, h2h_away_wins = [], []
+        new_rows = combined.loc[current_features.index]
+        for home_team, away_team, result in zip(new_rows['HomeTeam'], new_rows['AwayTeam'], new_rows['FTR']):
+            counts = checkpoint.h2h_counts.setdefault(FeatureCheckpoint.pair_key(home_team, away_team), [0, 0, 0])
+            h2h_home_wins.append(counts[1] if counts[0] else np.nan)
+            h2h_away_wins.append(counts[2] if counts[0] else np.nan)
+            counts[0] += 1
+            counts[1] += int(result == 'H')
+            counts[2] += int(result == 'A')
+        current_features['h2h_home_wins'] = np.array(h2h_home_wins, dtype=self.FEATURE_DTYPE)
+        current_features['h2h_away_wins'] = np.array(h2h_away_wins, dtype=self.FEATURE_DTYPE)
+        current_features = current_features.dropna()
+
+        current_season_mask = current_features['IsCurrentSeason'] == 1
+        training_features = current_features[~current_season_mask].drop(columns=['Season', 'IsCurrentSeason'])
+        current_season_features = current_features[current_season_mask].drop(columns=['Season', 'IsCurrentSeason'])
+
+        self._append_csv(training_features, output_dir / 'current_season_training.csv')
+        self._append_csv(current_season_features, output_dir / 'current_season_202526.csv')
+        self._append_csv(current_mapping, output_dir / 'team_mapping.csv')
+        print(f"Appended {len(training_features)} training and {len(current_season_features)} current season rows")
+
+        # Historical features: Elo continues from the saved ratings
+        historical_features, _ = self._build_historical_features(combined, fit_encoder=False)
+        historical_features = historical_features[historical_features.index.isin(new_index)].copy()
+
+        elo = EloRatingEngine(len(self.team_encoder.classes_))
+        elo.ratings = checkpoint.elo_ratings.copy()
+        new_rows = combined.loc[historical_features.index]
+        home_ratings, away_ratings = elo.replay(
+            self.team_encoder.transform(new_rows['HomeTeam']),
+            self.team_encoder.transform(new_rows['AwayTeam']),
+            EloRatingEngine.encode_results(new_rows['FTR'].to_numpy())
+        )
+        historical_features['home_elo_rating'] = home_ratings.astype(self.FEATURE_DTYPE)
+        historical_features['away_elo_rating'] = away_ratings.astype(self.FEATURE_DTYPE)
+        historical_features['elo_diff'] = (home_ratings - away_ratings).astype(self.FEATURE_DTYPE)
+
+        historical_training = historical_features.dropna().drop(columns=['Season'])
+        self._append_csv(historical_training, output_dir / 'historical_training.csv')
+        print(f"Appended {len(historical_training)} historical rows")
+
+        # Advance the checkpoint past the new matches
+        checkpoint.last_match_id = int(new_matches['MatchID'].max())
+        checkpoint.elo_ratings = elo.ratings
+        checkpoint.history = FeatureCheckpoint.select_history(combined)
+        checkpoint.save(output_dir)
+
+        print("\n✓ Incremental feature update complete!")
+
+        return training_features, current_season_features, historical_training
+
+    @staticmethod
+    def _append_csv(df, path):
+        """Append rows to a feature CSV, writing the header if the file is new"""
+        df.to_csv(path, mode='a', header=not path.exists(), index=False)
+
 if __name__ == "__main__":
     engineer = FeatureEngineer()
-    engineer.save_processed_data()
\ No newline at end of file
+    engineer.save_processed_data(incremental='--incremental' in sys.argv)
\ No newline at end of file
@@ -0,0 +1,138 @@
+# backend/MLModelTraining/h2h_index.py
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from team_stats_index import source_signatures
+
+
+class HeadToHeadIndex:
+    """Head-to-head record for every team pair across all seasons.
+
+    Counts are keyed by the unordered team ID pair (lower ID first) and kept
+    per season file, so new or changed files are folded in without rescanning
+    the rest. Saved as plain JSON.
+    """
+    INDEX_NAME = 'h2h_index.json'
+
+    def __init__(self, season_counts: Optional[Dict[str, Dict]] = None, sources: Optional[Dict] = None):
+        # season file -> "low-high" pair -> [matches, low team wins, high team wins]
+        self.season_counts = season_counts or {}
+        self.sources = sources or {}
+        self.totals = {}
+        for counts in self.season_counts.values():
+            self._add(counts, sign=1)
+
+    @staticmethod
+    def pair_key(team_a: int, team_b: int) -> str:
+        low, high = sorted((int(team_a), int(team_b)))
+        return f"{low}-{high}"
+
+    @classmethod
+    def count_season(cls, df: 'pd.DataFrame') -> Dict[str, list]:
+        """Pair counts for one season of matches"""
+        import pandas as pd
+
+        df = df.dropna(subset=['homeTeamID', 'awayTeamID'])
+        home_ids = df['homeTeamID'].astype(int).to_numpy()
+        away_ids = df['awayTeamID'].astype(int).to_numpy()
+
+        # Credit each decisive result to the lower or higher ID of the pair
+        home_is_low = home_ids <= away_ids
+        home_win = (df['FTR'] == 'H').to_numpy()
+        away_win = (df['FTR'] == 'A').to_numpy()
+        grouped = pd.DataFrame({
+            'low': np.minimum(home_ids, away_ids),
+            'high': np.maximum(home_ids, away_ids),
+            'matches': 1,
+            'low_wins': (home_win & home_is_low) | (away_win & ~home_is_low),
+            'high_wins': (home_win & ~home_is_low) | (away_win & home_is_low),
+        }).groupby(['low', 'high'], as_index=False).sum()
+
+        return {
+            f"{row.low}-{row.high}": [int(row.matches), int(row.low_wins), int(row.high_wins)]
+            for row in grouped.itertuples(index=False)
+        }
+
+    def _add(self, counts: Dict[str, list], sign: int):
+        for key, (matches, low_wins, high_wins) in counts.items():
+            total = self.totals.setdefault(key, [0, 0, 0])
+            total[0] += sign * matches
+            total[1] += sign * low_wins
+            total[2] += sign * high_wins
+            if total[0] == 0:
+                del self.totals[key]
+
+    def refresh(self, data_dir: Path) -> bool:
+        """Fold in new or changed season files and drop removed ones; returns True if anything changed"""
+        signatures = source_signatures(data_dir)
+        changed = False
+
+        for name in list(self.season_counts):
+            if name not in signatures:
+                self._add(self.season_counts.pop(name), sign=-1)
+                del self.sources[name]
+                changed = True
+
+        for name, signature in signatures.items():
+            if self.sources.get(name) == signature:
+                continue
+            if name in self.season_counts:
+                self._add(self.season_counts[name], sign=-1)
+            season = Path(name).stem.replace('EPLS', '')
+            from match_store import load_matches
+            counts = self.count_season(load_matches(columns=['homeTeamID', 'awayTeamID', 'FTR'],
+                                                    seasons=[season], source_dir=data_dir))
+            self.season_counts[name] = counts
+            self.sources[name] = signature
+            self._add(counts, sign=1)
+            changed = True
+
+        return changed
+
+    @classmethod
+    def build(cls, data_dir: Path) -> 'HeadToHeadIndex':
+        index = cls()
+        index.refresh(data_dir)
+        return index
+
+    def save(self, output_dir: Path):
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(output_dir / self.INDEX_NAME, 'w') as f:
+            json.dump({'season_counts': self.season_counts, 'sources': self.sources}, f)
+
+    @classmethod
+    def load(cls, output_dir: Path) -> 'HeadToHeadIndex':
+        with open(Path(output_dir) / cls.INDEX_NAME) as f:
+            saved = json.load(f)
+        return cls(saved['season_counts'], saved['sources'])
+
+    @classmethod
+    def load_or_build(cls, output_dir: Path, data_dir: Path) -> 'HeadToHeadIndex':
+        """Load the saved index and bring it up to date with the season files"""
+        path = Path(output_dir) / cls.INDEX_NAME
+        index = cls.load(output_dir) if path.exists() else cls()
+        if index.refresh(data_dir):
+            try:
+                index.save(output_dir)
+            except OSError:
+                pass  # Read-only deployments still get the in-memory index
+        return index
+
+    def lookup(self, home_id: Optional[int], away_id: Optional[int]) -> Optional[Tuple[int, int]]:
+        """(home wins, away wins) over all meetings, or None if the teams never met"""
+        if home_id is None or away_id is None:
+            return None
+        counts = self.totals.get(self.pair_key(home_id, away_id))
+        if counts is None:
+            return None
+        _, low_wins, high_wins = counts
+        return (low_wins, high_wins) if int(home_id) <= int(away_id) else (high_wins, low_wins)
+
+
+if __name__ == "__main__":
+    BASE_DIR = Path(__file__).parent.parent.parent
+    index = HeadToHeadIndex.build(BASE_DIR / "data" / "files" / "StandardizedSeasonMatches")
+    index.save(BASE_DIR / "data" / "files" / "MLData")
+    print(f"✓ Saved head-to-head records for {len(index.totals)} team pairs")
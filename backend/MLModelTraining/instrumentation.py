@@ -0,0 +1,212 @@
+# backend/MLModelTraining/instrumentation.py
+import os
+import sys
+import json
+import time
+import socket
+import resource
+import threading
+from collections import defaultdict
+from functools import wraps
+from pathlib import Path
+
+# Stage-level timing for the ML pipeline. Wrap a step in `with stage("Elo"):`
+# or decorate a function with `@instrumented("load model")`; every finished
+# stage is appended to a JSON-lines file with wall time, CPU time, rows
+# processed and peak memory. Stages nest, and each record carries its full
+# path ("save_processed_data/historical features/Elo").
+#
+# Off unless FUTSTAT_PROFILE=1. Disabled stages are a shared no-op object and
+# decorators return the function unchanged, so leaving them in costs nothing.
+# FUTSTAT_PROFILE_FILE overrides the output file.
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DEFAULT_OUTPUT = BASE_DIR / "data" / "files" / "Profiles" / "stages.jsonl"
+
+ENABLED = os.environ.get("FUTSTAT_PROFILE", "").lower() in ("1", "true", "yes", "on")
+OUTPUT_PATH = Path(os.environ.get("FUTSTAT_PROFILE_FILE", DEFAULT_OUTPUT))
+
+# Writing 5 to clear_refs resets the peak RSS counter (Linux), which gives
+# per-stage peaks; elsewhere peaks are the process high-water mark so far
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS = Path("/proc/self/status")
+
+# Worker processes (joblib) inherit the parent's run ID through the environment
+_RUN_ID = os.environ.get("FUTSTAT_PROFILE_RUN") or f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+if ENABLED:
+    os.environ["FUTSTAT_PROFILE_RUN"] = _RUN_ID
+_local = threading.local()
+_write_lock = threading.Lock()
+_output = None
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _peak_rss_mb():
+    """Peak RSS in MB since the last reset (or since process start)"""
+    try:
+        with open(_STATUS) as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _reset_peak_rss():
+    try:
+        with open(_CLEAR_REFS, 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _emit(record):
+    global _output
+    with _write_lock:
+        if _output is None:
+            OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _output = open(OUTPUT_PATH, 'a', buffering=1)
+        _output.write(json.dumps(record) + '\n')
+
+
+class Stage:
+    """One timed stage (see stage() and instrumented())"""
+
+    def __init__(self, name, rows=None, **fields):
+        self.name = name
+        self.rows = rows
+        self.fields = fields
+
+    def add_rows(self, count):
+        self.rows = (self.rows or 0) + int(count)
+
+    def __enter__(self):
+        stack = _stack()
+        if stack:
+            # The parent's peak so far is lost when the counter is reset below
+            stack[-1].peak_mb = max(stack[-1].peak_mb, _peak_rss_mb())
+        self.path = '/'.join([s.name for s in stack] + [self.name])
+        stack.append(self)
+
+        _reset_peak_rss()
+        self.peak_mb = 0.0
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        self.peak_mb = max(self.peak_mb, _peak_rss_mb())
+
+        stack = _stack()
+        stack.pop()
+        if stack:
+            stack[-1].peak_mb = max(stack[-1].peak_mb, self.peak_mb)
+
+        _emit({
+            'run': _RUN_ID,
+            'time': time.time(),
+            'stage': self.name,
+            'path': self.path,
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'rows': self.rows,
+            'rows_per_s': round(self.rows / wall, 1) if self.rows and wall > 0 else None,
+            'peak_rss_mb': round(self.peak_mb, 1),
+            'error': exc_type.__name__ if exc_type else None,
+            **self.fields,
+        })
+        return False
+
+
+class _NullStage:
+    """Stand-in used while instrumentation is disabled"""
+    rows = None
+
+    def add_rows(self, count):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, rows=None, **fields):
+    """Context manager timing one named stage; extra fields are copied into the record"""
+    if not ENABLED:
+        return _NULL_STAGE
+    return Stage(name, rows, **fields)
+
+
+def instrumented(name=None, rows=None):
+    """Decorator timing every call of a function as a stage.
+
+    rows may be a function of the return value giving the rows processed.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        stage_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with Stage(stage_name) as current:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    current.add_rows(rows(result))
+                return result
+        return wrapper
+    return decorate
+
+
+def add_rows(count):
+    """Add to the row count of the innermost running stage"""
+    if ENABLED and _stack():
+        _stack()[-1].add_rows(count)
+
+
+def load_records(path=OUTPUT_PATH):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    """Per-path totals over all runs: calls, runs, wall/CPU time, rows and worst peak memory"""
+    summary = defaultdict(lambda: {'calls': 0, 'runs': set(), 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0,
+                                   'max_wall_s': 0.0, 'peak_rss_mb': 0.0})
+    for record in records:
+        entry = summary[record['path']]
+        entry['calls'] += 1
+        entry['runs'].add(record['run'])
+        entry['wall_s'] += record['wall_s']
+        entry['cpu_s'] += record['cpu_s']
+        entry['rows'] += record['rows'] or 0
+        entry['max_wall_s'] = max(entry['max_wall_s'], record['wall_s'])
+        entry['peak_rss_mb'] = max(entry['peak_rss_mb'], record['peak_rss_mb'])
+    for entry in summary.values():
+        entry['runs'] = len(entry['runs'])
+    return dict(summary)
+
+
+if __name__ == "__main__":
+    # Usage: python instrumentation.py [stages.jsonl]
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else OUTPUT_PATH
+    summary = summarize(load_records(path))
+    print(f"{'stage':80} {'runs':>5} {'calls':>6} {'wall s/run':>11} {'cpu s/run':>10} {'rows/run':>10} {'peak MB':>8}")
+    for stage_path, entry in sorted(summary.items()):
+        runs = entry['runs']
+        print(f"{stage_path:80} {runs:5d} {entry['calls']:6d} {entry['wall_s'] / runs:11.3f} "
+              f"{entry['cpu_s'] / runs:10.3f} {entry['rows'] / runs:10.0f} {entry['peak_rss_mb']:8.0f}")
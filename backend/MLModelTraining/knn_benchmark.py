@@ -0,0 +1,135 @@
+# backend/MLModelTraining/knn_benchmark.py
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from contextlib import redirect_stdout
+from sklearn.neighbors import KNeighborsClassifier
+from ensemble_kernel import knn_proba
+from train_models import EnsembleModelTrainer
+
+# Accuracy versus latency of the neighbour indexes available to the KNN member:
+# sklearn's brute / KD-tree / ball tree, and the NumPy kernel's float64 or
+# float32 reference matrix or scipy KD-tree. The training split is tiled with
+# small jitter to stand in for multi-league training volumes, then the test
+# split is scored in one batch against each index.
+#
+#   python knn_benchmark.py --scales 1 10 100
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+OUTPUT_PATH = BASE_DIR / "data" / "files" / "Benchmarks" / "knn_indexes.json"
+
+N_NEIGHBORS = 15
+LEAF_SIZES = (8, 16, 32, 64)
+# Standard deviation of the noise added to each tiled copy of the scaled training rows
+JITTER = 0.05
+
+
+def training_split(feature_type='historical'):
+    """Scaled train and test rows from the usual 70-15-15 split"""
+    trainer = EnsembleModelTrainer(n_jobs=1)
+    with redirect_stdout(None):
+        X_train, _, X_test, y_train, _, y_test, _, _ = trainer.prepare_data_splits(trainer.load_features(feature_type))
+    return X_train, np.asarray(y_train), X_test, np.asarray(y_test)
+
+
+def tile(X, y, scale, seed=0):
+    """scale jittered copies of the training rows"""
+    if scale == 1:
+        return X, y
+    rng = np.random.default_rng(seed)
+    copies = [X] + [X + rng.normal(0, JITTER, X.shape) for _ in range(scale - 1)]
+    return np.vstack(copies), np.tile(y, scale)
+
+
+def indexes():
+    """name -> build(X_ref, y_ref) returning a predict_proba(X) callable and the reference bytes held"""
+    def sklearn_index(algorithm, leaf_size=30):
+        def build(X_ref, y_ref):
+            knn = KNeighborsClassifier(N_NEIGHBORS, weights='distance', algorithm=algorithm, leaf_size=leaf_size)
+            knn.fit(X_ref, y_ref)
+            return knn.predict_proba, X_ref.nbytes
+        return build
+
+    def numpy_index(dtype):
+        def build(X_ref, y_ref):
+            reference = X_ref.astype(dtype)
+            return (lambda X: knn_proba(X, reference, y_ref, N_NEIGHBORS, 'distance', 3)), reference.nbytes
+        return build
+
+    def scipy_index(leaf_size):
+        def build(X_ref, y_ref):
+            from scipy.spatial import cKDTree
+            tree = cKDTree(X_ref, leafsize=leaf_size)
+            return (lambda X: knn_proba(X, X_ref, y_ref, N_NEIGHBORS, 'distance', 3, tree)), X_ref.nbytes
+        return build
+
+    builders = {'sklearn brute': sklearn_index('brute')}
+    for leaf_size in LEAF_SIZES:
+        builders[f'sklearn kd_tree leaf={leaf_size}'] = sklearn_index('kd_tree', leaf_size)
+        builders[f'sklearn ball_tree leaf={leaf_size}'] = sklearn_index('ball_tree', leaf_size)
+    builders['kernel brute float64'] = numpy_index(np.float64)
+    builders['kernel brute float32'] = numpy_index(np.float32)
+    for leaf_size in LEAF_SIZES:
+        builders[f'kernel kd_tree leaf={leaf_size}'] = scipy_index(leaf_size)
+    return builders
+
+
+def run(scales, repeat=3):
+    X_train, y_train, X_test, y_test = training_split()
+    results = {}
+    for scale in scales:
+        X_ref, y_ref = tile(X_train, y_train, scale)
+        exact = None
+        for name, build in indexes().items():
+            start = time.perf_counter()
+            predict_proba, reference_bytes = build(X_ref, y_ref)
+            build_s = time.perf_counter() - start
+
+            query_times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                proba = predict_proba(X_test)
+                query_times.append(time.perf_counter() - start)
+            if exact is None:
+                exact = proba  # sklearn brute is the reference answer
+
+            query_s = min(query_times)
+            results.setdefault(str(scale), {})[name] = {
+                'reference_rows': len(X_ref),
+                'reference_mb': reference_bytes / 1024 ** 2,
+                'build_s': build_s,
+                'query_s': query_s,
+                'us_per_row': query_s / len(X_test) * 1e6,
+                'accuracy': float((proba.argmax(axis=1) == y_test).mean()),
+                'agreement': float((proba.argmax(axis=1) == exact.argmax(axis=1)).mean()),
+                'max_proba_diff': float(np.abs(proba - exact).max()),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy versus latency of KNN neighbour indexes")
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3, help="query runs per index; the fastest is reported")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat)
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTPUT_PATH, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'index':28} {'scale':>5} {'ref rows':>9} {'ref MB':>7} {'build s':>8} {'µs/row':>8} "
+          f"{'accuracy':>9} {'agree':>7} {'max Δp':>8}")
+    for scale, by_index in results.items():
+        for name, r in by_index.items():
+            print(f"{name:28} {scale:>5} {r['reference_rows']:9d} {r['reference_mb']:7.1f} {r['build_s']:8.3f} "
+                  f"{r['us_per_row']:8.1f} {r['accuracy']:9.4f} {r['agreement']:7.2%} {r['max_proba_diff']:8.1e}")
+    print(f"\nSaved to {OUTPUT_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# backend/MLModelTraining/prediction_server.py
+import sys
+import json
+from predict_matches import CrossSeasonMatchPredictor
+
+
+class PredictionWorker:
+    """Long-lived JSON-lines prediction worker.
+
+    Models and indexes are loaded once and reloaded when a model or season
+    file changes (a retrain or a data refresh); each stdin line is a request
+    such as {"id": 1, "home_team": "Arsenal", "away_team": "Chelsea",
+    "home_season": "2324", "away_season": "2425"} and is answered with one
+    stdout line {"id": 1, "result": {...}} or {"id": 1, "error": "..."}.
+    A request with a "fixtures" list of such objects is answered with a list
+    of results from a single batched prediction.
+    """
+
+    def __init__(self, predictor_class=CrossSeasonMatchPredictor):
+        self.predictor_class = predictor_class
+        self.predictor = predictor_class()
+
+    def refresh(self):
+        """Reload the predictor if its model or season files changed since it was loaded"""
+        if self.predictor_class.sources() == self.predictor.loaded_sources:
+            return
+        try:
+            self.predictor = self.predictor_class()
+        except Exception as e:
+            # Files can be mid-write during a retrain; keep serving and retry on the next request
+            print(f"Reload failed, keeping the loaded model: {e}", file=sys.stderr)
+
+    def handle(self, request: dict) -> dict:
+        """Answer a single decoded request"""
+        request_id = request.get('id')
+        self.refresh()
+        try:
+            if 'fixtures' in request:
+                fixtures = [
+                    (fixture['home_team'], fixture['away_team'], str(fixture['home_season']), str(fixture['away_season']))
+                    for fixture in request['fixtures']
+                ]
+                return {'id': request_id, 'result': self.predictor.predict_many(fixtures)}
+
+            result = self.predictor.predict_match(
+                home_team=request['home_team'],
+                away_team=request['away_team'],
+                home_season=str(request['home_season']),
+                away_season=str(request['away_season'])
+            )
+            return {'id': request_id, 'result': result}
+        except KeyError as e:
+            return {'id': request_id, 'error': f"Missing request field: {e}"}
+        except Exception as e:
+            return {'id': request_id, 'error': str(e)}
+
+    def serve(self, stdin=sys.stdin, stdout=sys.stdout):
+        """Process requests until stdin closes"""
+        self._write(stdout, {'ready': True})
+
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                self._write(stdout, {'id': None, 'error': f"Invalid JSON: {e}"})
+                continue
+            self._write(stdout, self.handle(request))
+
+    @staticmethod
+    def _write(stdout, message):
+        stdout.write(json.dumps(message) + '\n')
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    try:
+        worker = PredictionWorker()
+    except Exception as e:
+        print(json.dumps({"error": f"Failed to load models: {e}"}), file=sys.stderr)
+        sys.exit(1)
+
+    worker.serve()
@@ -0,0 +1,75 @@
+# backend/MLModelTraining/rolling_features.py
+import numpy as np
+import pandas as pd
+
+
+class RollingFeatureEngine:
+    """Batched per-group rolling statistics over a team-sorted NumPy layout.
+
+    Rows are stably sorted by group key once; every rolling window is then
+    answered from a single cumulative sum using group offsets. Results match
+    ``df.groupby(key)[col].transform(lambda x: x.rolling(w, min_periods=m).<agg>().shift(1))``.
+    """
+
+    def __init__(self, keys):
+        codes, _ = pd.factorize(np.asarray(keys))
+        n = len(codes)
+
+        # Stable sort keeps the original row order inside each group
+        self.order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[self.order]
+
+        # Offset of each row's group start within the sorted layout
+        is_start = np.ones(n, dtype=bool)
+        is_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+        starts = np.flatnonzero(is_start)
+        sizes = np.diff(np.append(starts, n))
+        self.group_start = np.repeat(starts, sizes)
+        self.n_rows = n
+
+    def _prefix_sums(self, values):
+        """Exclusive cumulative sums of values and non-NaN counts in sorted order"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        sorted_values = values[self.order]
+        valid = ~np.isnan(sorted_values)
+
+        sums = np.zeros((self.n_rows + 1, sorted_values.shape[1]))
+        counts = np.zeros((self.n_rows + 1, sorted_values.shape[1]))
+        np.cumsum(np.where(valid, sorted_values, 0.0), axis=0, out=sums[1:])
+        np.cumsum(valid, axis=0, out=counts[1:])
+        return sums, counts
+
+    def _window_bounds(self, window):
+        """[lo, hi) bounds of the previous `window` rows for every sorted position"""
+        hi = np.arange(self.n_rows)
+        if window is None:
+            lo = self.group_start
+        else:
+            lo = np.maximum(self.group_start, hi - window)
+        return lo, hi
+
+    def _unsort(self, sorted_result):
+        result = np.empty_like(sorted_result)
+        result[self.order] = sorted_result
+        return result
+
+    def shifted(self, values, windows, how='mean', min_periods=1):
+        """Rolling `how` ('mean' or 'sum') over the previous rows of each group.
+
+        `values` is a 1-D or (n_rows, n_cols) array; returns a dict mapping each
+        window to an (n_rows, n_cols) array in the original row order. A window
+        of None means an expanding window.
+        """
+        sums, counts = self._prefix_sums(values)
+        results = {}
+        for window in windows:
+            lo, hi = self._window_bounds(window)
+            total = sums[hi] - sums[lo]
+            count = counts[hi] - counts[lo]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                stat = total / count if how == 'mean' else total
+            stat[count < min_periods] = np.nan
+            results[window] = self._unsort(stat)
+        return results
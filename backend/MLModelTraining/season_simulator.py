@@ -0,0 +1,169 @@
+# backend/MLModelTraining/season_simulator.py
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from joblib import Parallel, delayed
+
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / 'data' / 'scripts'))
+from standings import build_standings, season_label
+from match_store import read_season_csv
+
+
+def _simulate_chunk(cum_probs, home_idx, away_idx, base_points, tiebreak, n_sims, seed):
+    """Simulate n_sims seasons; returns (position counts, points sum, W/D/L sums) for the chunk.
+
+    cum_probs holds cumulative (away, draw) probabilities per remaining fixture.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+    n_fixtures = len(home_idx)
+
+    draws = rng.random((n_sims, n_fixtures))
+    # 0 = away win, 1 = draw, 2 = home win (same order as the model's classes)
+    outcome = (draws >= cum_probs[:, 0]).astype(np.int8) + (draws >= cum_probs[:, 1])
+
+    home_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    away_onehot = np.zeros((n_fixtures, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_fixtures), home_idx] = 1
+    away_onehot[np.arange(n_fixtures), away_idx] = 1
+
+    home_win = (outcome == 2).astype(np.float32)
+    draw = (outcome == 1).astype(np.float32)
+    away_win = (outcome == 0).astype(np.float32)
+    wins = home_win @ home_onehot + away_win @ away_onehot
+    draws_per_team = draw @ home_onehot + draw @ away_onehot
+    losses = away_win @ home_onehot + home_win @ away_onehot
+    points = base_points + 3 * wins + draws_per_team
+
+    # Points first, then the current tiebreak order, then chance
+    sort_key = points * n_teams * 2 + tiebreak + rng.random((n_sims, n_teams))
+    order = np.argsort(-sort_key, axis=1)
+    positions = np.empty_like(order)
+    positions[np.arange(n_sims)[:, None], order] = np.arange(n_teams)
+
+    position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    np.add.at(position_counts, (np.broadcast_to(np.arange(n_teams), positions.shape), positions), 1)
+    return position_counts, points.sum(axis=0), wins.sum(axis=0), draws_per_team.sum(axis=0), losses.sum(axis=0)
+
+
+class SeasonSimulator:
+    """Monte Carlo projection of a season's final table.
+
+    Outcome probabilities for every remaining fixture come from one batched
+    CrossSeasonMatchPredictor.predict_many call; seasons are then sampled in
+    NumPy chunks (optionally across processes) on top of the points already
+    won. Goals are not simulated, so teams level on points are ordered by the
+    current table's tiebreaks and then at random.
+    """
+    BASE_DIR = Path(__file__).parent.parent.parent
+    DATA_DIR = BASE_DIR / "data" / "files" / "StandardizedSeasonMatches"
+    CHUNK_SIZE = 10_000
+
+    def __init__(self, season_code: str = '2526', predictor=None, stats_season: str = None):
+        if predictor is None:
+            from predict_matches import CrossSeasonMatchPredictor
+            predictor = CrossSeasonMatchPredictor()
+        self.predictor = predictor
+        self.season_code = season_code
+        self.stats_season = stats_season or season_code
+
+        matches = read_season_csv(self.DATA_DIR / f"EPLS{season_code}.csv")
+        matches['Season'] = season_label(season_code)
+        self.played = matches[matches['FTR'].notna()]
+
+        team_ids = {}
+        for name_col, id_col in [('HomeTeam', 'homeTeamID'), ('AwayTeam', 'awayTeamID')]:
+            pairs = matches[[name_col, id_col]].dropna().drop_duplicates()
+            team_ids.update({team: int(team_id) for team, team_id in zip(pairs[name_col], pairs[id_col])})
+        self.team_ids = team_ids
+
+        self.current = build_standings(self.played, team_ids).set_index('Team')
+        self.teams = sorted(set(matches['HomeTeam'].dropna()) | set(matches['AwayTeam'].dropna()))
+        self.current = self.current.reindex(self.teams).fillna(0)
+
+    def remaining_fixtures(self) -> pd.DataFrame:
+        """Every home/away pairing of the season's teams that has not been played yet"""
+        played = set(zip(self.played['HomeTeam'], self.played['AwayTeam']))
+        fixtures = [(home, away) for home in self.teams for away in self.teams
+                    if home != away and (home, away) not in played]
+        return pd.DataFrame(fixtures, columns=['home_team', 'away_team'])
+
+    def fixture_probabilities(self, fixtures: pd.DataFrame) -> np.ndarray:
+        """(fixtures, 3) matrix of away/draw/home probabilities from one batched prediction"""
+        if fixtures.empty:
+            return np.zeros((0, 3))
+        batch = fixtures.assign(home_season=self.stats_season, away_season=self.stats_season)
+        results = self.predictor.predict_many(batch)
+        return np.array([[r['probabilities']['away_win'], r['probabilities']['draw'], r['probabilities']['home_win']]
+                         for r in results])
+
+    def simulate(self, n_sims: int = 100_000, seed: int = 0, n_jobs: int = 1) -> pd.DataFrame:
+        """Projected final table with finishing-position probabilities per team.
+
+        Chunks get their own seeds from `seed`, so results do not depend on n_jobs.
+        """
+        fixtures = self.remaining_fixtures()
+        probabilities = self.fixture_probabilities(fixtures)
+        cum_probs = np.cumsum(probabilities, axis=1)[:, :2]
+
+        team_index = {team: i for i, team in enumerate(self.teams)}
+        home_idx = fixtures['home_team'].map(team_index).to_numpy(dtype=np.int64)
+        away_idx = fixtures['away_team'].map(team_index).to_numpy(dtype=np.int64)
+        base_points = self.current['Points'].to_numpy(dtype=np.float32)
+
+        # Rank on current goal difference then goals scored; points are scaled so this only splits ties
+        tiebreak_order = self.current.sort_values(['GoalDifference', 'GoalsScored']).index
+        tiebreak = pd.Series(np.arange(len(self.teams)), index=tiebreak_order)[self.teams].to_numpy()
+        tiebreak = (tiebreak + 1).astype(np.float32)
+
+        chunk_sizes = [min(self.CHUNK_SIZE, n_sims - start) for start in range(0, n_sims, self.CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        chunks = Parallel(n_jobs=n_jobs)(
+            delayed(_simulate_chunk)(cum_probs, home_idx, away_idx, base_points, tiebreak, size, chunk_seed)
+            for size, chunk_seed in zip(chunk_sizes, seeds)
+        )
+
+        position_counts = sum(chunk[0] for chunk in chunks)
+        expected = {name: sum(chunk[i] for chunk in chunks) / n_sims
+                    for i, name in enumerate(['Points', 'Wins', 'Draws', 'Losses'], start=1)}
+        expected['MatchesPlayed'] = (np.bincount(home_idx, minlength=len(self.teams))
+                                     + np.bincount(away_idx, minlength=len(self.teams)))
+        return self._summary(position_counts / n_sims, expected)
+
+    def _summary(self, position_probs: np.ndarray, expected: dict) -> pd.DataFrame:
+        """Standings-style table of expected final totals plus title/top-4/relegation odds"""
+        n_teams = len(self.teams)
+        current = self.current
+        table = pd.DataFrame({
+            'TeamId': pd.array([self.team_ids.get(team) for team in self.teams], dtype='Int64'),
+            'Team': self.teams,
+            'Season': season_label(self.season_code),
+            'MatchesPlayed': current['MatchesPlayed'].to_numpy(dtype=np.int64) + expected['MatchesPlayed'],
+            'Wins': current['Wins'].to_numpy() + expected['Wins'],
+            'Draws': current['Draws'].to_numpy() + expected['Draws'],
+            'Losses': current['Losses'].to_numpy() + expected['Losses'],
+            'Points': expected['Points'],
+            'Title': position_probs[:, 0],
+            'Top4': position_probs[:, :4].sum(axis=1),
+            'Relegation': position_probs[:, -3:].sum(axis=1),
+        })
+        for position in range(n_teams):
+            table[f"Pos{position + 1}"] = position_probs[:, position]
+
+        table = table.sort_values(['Points', 'Title'], ascending=False, kind='stable').reset_index(drop=True)
+        table.insert(1, 'Rank', np.arange(1, n_teams + 1))
+        return table
+
+
+if __name__ == "__main__":
+    import time
+
+    season = sys.argv[1] if len(sys.argv) > 1 else '2526'
+    n_sims = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    start = time.time()
+    simulator = SeasonSimulator(season)
+    projection = simulator.simulate(n_sims=n_sims, n_jobs=-1)
+    print(projection[['Rank', 'Team', 'Points', 'Title', 'Top4', 'Relegation']].to_string(index=False))
+    print(f"\n{n_sims} seasons simulated in {time.time() - start:.1f}s")
@@ -0,0 +1,174 @@
+# backend/MLModelTraining/team_stats_index.py
+import sys
+import json
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional
+
+# match_store (and pandas with it) is only needed to build the index, not to load it
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent / 'data' / 'scripts'))
+
+
+def season_code(season: str) -> str:
+    """Normalise '2023/2024' or '2324' to the 4-digit file code '2324'"""
+    if '/' in season:
+        years = season.split('/')
+        return years[0][-2:] + years[1][-2:]
+    return season
+
+
+def source_signatures(data_dir: Path) -> Dict[str, list]:
+    """Size and modification time of every season file"""
+    return {
+        file.name: [file.stat().st_size, file.stat().st_mtime_ns]
+        for file in sorted(Path(data_dir).glob('EPLS*.csv'))
+    }
+
+
+class TeamSeasonStatsIndex:
+    """Precomputed (season, team) aggregate table for the cross-season predictor.
+
+    Raw sums are stored in a (seasons, team IDs, stats) float array saved as .npy,
+    so it can be memory-mapped; a JSON sidecar holds the season codes, the
+    team name -> ID map seen in the data, and source file signatures.
+    """
+    ARRAY_NAME = 'team_season_stats.npy'
+    META_NAME = 'team_season_stats.json'
+
+    STATS = [
+        'games', 'goals_scored', 'goals_conceded', 'wins', 'draws',
+        'shots', 'shots_on_target', 'shots_conceded', 'shots_on_target_conceded',
+        'fouls', 'fouls_won', 'yellow_cards', 'red_cards', 'corners', 'corners_conceded',
+    ]
+
+    # Source columns for each stat, from the home side's and the away side's perspective
+    HOME_COLUMNS = ['FTHG', 'FTAG', 'HS', 'HST', 'AS', 'AST', 'HF', 'AF', 'HY', 'HR', 'HC', 'AC']
+    AWAY_COLUMNS = ['FTAG', 'FTHG', 'AS', 'AST', 'HS', 'HST', 'AF', 'HF', 'AY', 'AR', 'AC', 'HC']
+
+    def __init__(self, sums: np.ndarray, seasons, team_ids: Dict[str, int], sources: Optional[Dict] = None):
+        self.sums = sums
+        self.seasons = list(seasons)
+        self.season_index = {season: i for i, season in enumerate(self.seasons)}
+        self.team_ids = team_ids
+        self.sources = sources or {}
+
+    @classmethod
+    def build(cls, data_dir: Path) -> 'TeamSeasonStatsIndex':
+        """Aggregate every season file in data_dir in one pass"""
+        season_files = sorted(Path(data_dir).glob('EPLS*.csv'))
+        if not season_files:
+            raise FileNotFoundError(f"No season files found in {data_dir}")
+
+        from match_store import load_matches
+        columns = ['Season', 'HomeTeam', 'AwayTeam', 'homeTeamID', 'awayTeamID', 'FTR'] + cls.HOME_COLUMNS
+        matches = load_matches(columns=list(dict.fromkeys(columns + cls.AWAY_COLUMNS)), source_dir=data_dir)
+        matches = matches.dropna(subset=['homeTeamID', 'awayTeamID'])
+
+        seasons = [file.stem.replace('EPLS', '') for file in season_files]
+        season_idx = matches['Season'].astype(str).map({season: i for i, season in enumerate(seasons)}).to_numpy()
+        home_ids = matches['homeTeamID'].to_numpy().astype(np.int64)
+        away_ids = matches['awayTeamID'].to_numpy().astype(np.int64)
+
+        ones = np.ones(len(matches))
+        draws = (matches['FTR'] == 'D').to_numpy(dtype=float)
+        home_values = np.column_stack([ones, matches[cls.HOME_COLUMNS[:2]].to_numpy(dtype=float),
+                                       (matches['FTR'] == 'H').to_numpy(dtype=float), draws,
+                                       matches[cls.HOME_COLUMNS[2:]].to_numpy(dtype=float)])
+        away_values = np.column_stack([ones, matches[cls.AWAY_COLUMNS[:2]].to_numpy(dtype=float),
+                                       (matches['FTR'] == 'A').to_numpy(dtype=float), draws,
+                                       matches[cls.AWAY_COLUMNS[2:]].to_numpy(dtype=float)])
+
+        n_teams = int(max(home_ids.max(), away_ids.max())) + 1
+        sums = np.zeros((len(seasons), n_teams, len(cls.STATS)))
+        np.add.at(sums, (season_idx, home_ids), home_values)
+        np.add.at(sums, (season_idx, away_ids), away_values)
+
+        team_ids = {}
+        for name_col, id_col in [('HomeTeam', 'homeTeamID'), ('AwayTeam', 'awayTeamID')]:
+            pairs = matches[[name_col, id_col]].drop_duplicates()
+            team_ids.update({name: int(team_id) for name, team_id in zip(pairs[name_col], pairs[id_col])})
+
+        return cls(sums, seasons, team_ids, source_signatures(data_dir))
+
+    def save(self, output_dir: Path):
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        np.save(output_dir / self.ARRAY_NAME, self.sums)
+        with open(output_dir / self.META_NAME, 'w') as f:
+            json.dump({
+                'stats': self.STATS,
+                'seasons': self.seasons,
+                'team_ids': self.team_ids,
+                'sources': self.sources,
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, output_dir: Path, mmap: bool = True) -> 'TeamSeasonStatsIndex':
+        output_dir = Path(output_dir)
+        with open(output_dir / cls.META_NAME) as f:
+            meta = json.load(f)
+        if meta['stats'] != cls.STATS:
+            raise ValueError(f"Stats index in {output_dir} has an outdated layout; rebuild it")
+        sums = np.load(output_dir / cls.ARRAY_NAME, mmap_mode='r' if mmap else None)
+        return cls(sums, meta['seasons'], meta['team_ids'], meta['sources'])
+
+    @classmethod
+    def load_or_build(cls, output_dir: Path, data_dir: Path) -> 'TeamSeasonStatsIndex':
+        """Load the saved index, rebuilding and saving it if season files changed"""
+        output_dir = Path(output_dir)
+        if (output_dir / cls.META_NAME).exists() and (output_dir / cls.ARRAY_NAME).exists():
+            index = cls.load(output_dir)
+            if index.sources == source_signatures(data_dir):
+                return index
+
+        index = cls.build(data_dir)
+        try:
+            index.save(output_dir)
+        except OSError:
+            pass  # Read-only deployments still get the in-memory index
+        return index
+
+    def has_season(self, season: str) -> bool:
+        return season_code(season) in self.season_index
+
+    def lookup(self, team_id: Optional[int], season: str) -> Optional[Dict]:
+        """Average stats for a team in a season, or None if it played no games"""
+        code = season_code(season)
+        if code not in self.season_index:
+            raise FileNotFoundError(f"Season {season} not found in team stats index")
+        if team_id is None or not 0 <= team_id < self.sums.shape[1]:
+            return None
+
+        row = dict(zip(self.STATS, self.sums[self.season_index[code], team_id].tolist()))
+        total_games = row['games']
+        if total_games == 0:
+            return None
+
+        wins = row['wins']
+        draws = row['draws']
+        losses = total_games - wins - draws
+
+        return {
+            'avg_goals_scored': row['goals_scored'] / total_games,
+            'avg_goals_conceded': row['goals_conceded'] / total_games,
+            'avg_shots': row['shots'] / total_games,
+            'avg_shots_on_target': row['shots_on_target'] / total_games,
+            'avg_shots_conceded': row['shots_conceded'] / total_games,
+            'avg_shots_on_target_conceded': row['shots_on_target_conceded'] / total_games,
+            'avg_fouls': row['fouls'] / total_games,
+            'avg_fouls_won': row['fouls_won'] / total_games,
+            'avg_corners': row['corners'] / total_games,
+            'avg_corners_conceded': row['corners_conceded'] / total_games,
+            'avg_yellow_cards': row['yellow_cards'] / total_games,
+            'avg_red_cards': row['red_cards'] / total_games,
+            'win_rate': wins / total_games,
+            'draw_rate': draws / total_games,
+            'loss_rate': losses / total_games,
+        }
+
+
+if __name__ == "__main__":
+    BASE_DIR = Path(__file__).parent.parent.parent
+    index = TeamSeasonStatsIndex.build(BASE_DIR / "data" / "files" / "StandardizedSeasonMatches")
+    index.save(BASE_DIR / "data" / "files" / "MLData")
+    print(f"✓ Saved stats for {len(index.seasons)} seasons and {len(index.team_ids)} teams")
@@ -0,0 +1,6 @@
+# backend/MLModelTraining/tests/conftest.py
+import sys
+from pathlib import Path
+
+# The training modules import each other by name, as when run from backend/MLModelTraining
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
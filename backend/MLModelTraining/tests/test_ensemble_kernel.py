@@ -0,0 +1,99 @@
+# backend/MLModelTraining/tests/test_ensemble_kernel.py
+import json
+import joblib
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from candidate_cache import CandidateCache
+from ensemble_kernel import EnsembleKernel, FORMAT_VERSION, PARITY_ATOL, export_kernel, is_current
+from train_models import EnsembleModelTrainer
+
+MODEL_NAME = 'parity'
+
+
+@pytest.fixture(scope='module', params=[
+    ('platt_cv', np.float64), ('platt_cv', np.float32), ('validation', np.float64), ('validation', np.float32),
+], ids=lambda param: f"{param[0]}-{np.dtype(param[1]).name}")
+def exported(request, tmp_path_factory):
+    """Small LR + KNN + SVC ensemble trained like train_models, with pickles and an exported kernel"""
+    svm_calibration, dtype = request.param
+    X, y = make_classification(n_samples=600, n_features=10, n_informative=6, n_classes=3, random_state=0)
+    X = X.astype(dtype)
+    X_train, X_val, X_test = X[:400], X[400:500], X[500:]
+    y_train, y_val = y[:400], y[400:500]
+
+    scaler = StandardScaler().fit(X_train)
+    X_train, X_val, X_test = scaler.transform(X_train), scaler.transform(X_val), scaler.transform(X_test)
+
+    trainer = EnsembleModelTrainer(n_jobs=1, svm_calibration=svm_calibration)
+    cache = CandidateCache(X_train, y_train, X_val, n_jobs=1)
+    (lr, _), (knn, _), (svm, _) = cache.fit([
+        LogisticRegression(C=1.0, max_iter=3000, class_weight='balanced', random_state=42),
+        KNeighborsClassifier(n_neighbors=11, weights='distance'),
+        SVC(C=1.0, kernel='rbf', gamma='scale', class_weight='balanced', random_state=42),
+    ])
+    members = [('lr', lr), ('knn', knn), ('svm', trainer.calibrate_svm(cache, svm, X_val, y_val))]
+    ensemble = trainer.assemble_ensemble(members, y_train)
+
+    model_dir = tmp_path_factory.mktemp(f"{svm_calibration}-{np.dtype(dtype).name}")
+    joblib.dump(ensemble, model_dir / f'{MODEL_NAME}_ensemble.pkl')
+    joblib.dump(scaler, model_dir / f'{MODEL_NAME}_scaler.pkl')
+    joblib.dump([f'f{i}' for i in range(X.shape[1])], model_dir / f'{MODEL_NAME}_features.pkl')
+    kernel_path, _ = export_kernel(model_dir, MODEL_NAME, X_check=X_test)
+    return model_dir, kernel_path, ensemble, scaler, X_test, svm_calibration, np.dtype(dtype).name
+
+
+def test_predict_proba_matches_sklearn(exported):
+    model_dir, kernel_path, ensemble, _, X_test, svm_calibration, dtype = exported
+    kernel = EnsembleKernel.load(kernel_path)
+
+    assert kernel.meta['svm_calibration'] == svm_calibration
+    assert kernel.meta['training_dtype'] == dtype
+    np.testing.assert_array_equal(kernel.classes_, ensemble.classes_)
+    np.testing.assert_allclose(kernel.predict_proba(X_test), ensemble.predict_proba(X_test), rtol=0, atol=PARITY_ATOL[dtype])
+    np.testing.assert_array_equal(kernel.predict(X_test), ensemble.predict(X_test))
+
+
+def test_kd_tree_index_matches_sklearn(exported):
+    _, kernel_path, ensemble, _, X_test, _, dtype = exported
+    kernel = EnsembleKernel.load(kernel_path, knn_index='kd_tree', leaf_size=8)
+    np.testing.assert_allclose(kernel.predict_proba(X_test), ensemble.predict_proba(X_test), rtol=0, atol=PARITY_ATOL[dtype])
+
+
+def test_transform_matches_scaler(exported):
+    _, kernel_path, _, scaler, _, _, _ = exported
+    X_raw = np.random.default_rng(1).normal(0, 3, (50, scaler.n_features_in_))
+    np.testing.assert_allclose(EnsembleKernel.load(kernel_path).transform(X_raw), scaler.transform(X_raw), rtol=1e-6)
+
+
+def test_is_current_rejects_stale_kernel(exported, tmp_path):
+    model_dir, kernel_path, ensemble, _, _, _, _ = exported
+    ensemble_path = model_dir / f'{MODEL_NAME}_ensemble.pkl'
+    assert is_current(kernel_path, ensemble_path)
+    assert not is_current(tmp_path / 'missing_kernel.npz', ensemble_path)
+
+    # A retrain rewrites the pickle after the kernel was exported
+    stale_dir = tmp_path / 'stale'
+    stale_dir.mkdir()
+    stale_kernel = stale_dir / kernel_path.name
+    stale_kernel.write_bytes(kernel_path.read_bytes())
+    joblib.dump(ensemble, stale_dir / ensemble_path.name)
+    assert not is_current(stale_kernel, stale_dir / ensemble_path.name)
+
+
+def test_wrong_format_version_is_rejected(exported, tmp_path):
+    model_dir, kernel_path, _, _, _, _, _ = exported
+    with np.load(kernel_path, allow_pickle=False) as saved:
+        arrays = {name: saved[name] for name in saved.files if name != 'meta'}
+        meta = json.loads(str(saved['meta']))
+    meta['format_version'] = FORMAT_VERSION - 1
+    old_kernel = tmp_path / kernel_path.name
+    np.savez(old_kernel, meta=json.dumps(meta), **arrays)
+
+    assert not is_current(old_kernel, model_dir / f'{MODEL_NAME}_ensemble.pkl')
+    with pytest.raises(ValueError, match="kernel format"):
+        EnsembleKernel.load(old_kernel)
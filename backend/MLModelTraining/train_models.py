@@ -7,11 +7,18 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 from sklearn.ensemble import VotingClassifier
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.utils import Bunch
 from sklearn.metrics import accuracy_score, classification_report, f1_score, confusion_matrix
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
 import joblib
 import warnings
 import json
+from candidate_cache import CandidateCache
+from ensemble_kernel import EnsembleKernel, KERNEL_SUFFIX, check_parity, source_signature
+from instrumentation import stage, instrumented
 warnings.filterwarnings('ignore')
 
 class EnsembleModelTrainer:
@@ -19,16 +26,30 @@ class EnsembleModelTrainer:
     DATA_DIR = BASE_DIR / "data" / "files" / "MLData"
     MODEL_DIR = BASE_DIR / "data" / "files" / "MLModels"
 
-    def __init__(self):
+    def __init__(self, n_jobs=-1, knn_algorithm='auto', knn_leaf_size=30, svm_calibration='platt_cv'):
         self.MODEL_DIR.mkdir(parents=True, exist_ok=True)
         self.min_accuracy = 0.90
         self.max_retrain_attempts = 5
         self.max_home_bias = 0.15  # Maximum acceptable difference in home prediction rate
-
+        self.n_jobs = n_jobs  # Worker processes for candidate fits (-1 = all cores, 1 = sequential)
+        # Neighbour index for the KNN candidates ('auto', 'brute', 'kd_tree' or 'ball_tree');
+        # the index changes query cost, not the neighbours found
+        self.knn_algorithm = knn_algorithm
+        self.knn_leaf_size = knn_leaf_size
+        # How the chosen SVC gets probabilities: 'platt_cv' refits with libsvm's internal 5-fold CV,
+        # 'validation' fits Platt scaling once on the validation decision values (faster to train,
+        # slightly worse test log loss)
+        if svm_calibration not in ('validation', 'platt_cv'):
+            raise ValueError(f"Unknown SVM calibration '{svm_calibration}'")
+        self.svm_calibration = svm_calibration
+
+    @instrumented("load features", rows=len)
     def load_features(self, feature_type):
         """Load pre-processed features"""
         data_path = self.DATA_DIR / f'{feature_type}_training.csv'
-        df = pd.read_csv(data_path)
+        # Features are parsed straight into float32, the dtype feature engineering writes them in
+        columns = pd.read_csv(data_path, nrows=0).columns
+        df = pd.read_csv(data_path, dtype={column: 'category' if column == 'FTR' else np.float32 for column in columns})
         print(f"Loaded {feature_type} data: {len(df)} samples, {len(df.columns)} columns")
 
         # Check class distribution
@@ -61,10 +82,11 @@ class EnsembleModelTrainer:
 
         return abs(home_bias) <= self.max_home_bias
 
+    @instrumented("split and scale", rows=lambda result: len(result[0]))
     def prepare_data_splits(self, df, test_size=0.15, val_size=0.15):
         """70-15-15 split with balanced sampling"""
         X = df.drop(columns=['FTR'])
-        y = df['FTR'].map({'A': 0, 'D': 1, 'H': 2})
+        y = df['FTR'].astype(object).map({'A': 0, 'D': 1, 'H': 2})
 
         identifier_cols = ['Date', 'HomeTeam', 'AwayTeam', 'Season', 'TeamID']
         for col in identifier_cols:
@@ -96,11 +118,55 @@ class EnsembleModelTrainer:
 
         return X_train_scaled, X_val_scaled, X_test_scaled, y_train, y_val, y_test, scaler, X.columns.tolist()
 
+    def assemble_ensemble(self, members, y_train):
+        """Soft-voting ensemble over already fitted members.
+
+        VotingClassifier.fit would refit clones of each member on the same data,
+        which gives identical models, so the fitted members are used directly.
+        """
+        ensemble = VotingClassifier(estimators=members, voting='soft', n_jobs=self.n_jobs)
+        ensemble.le_ = LabelEncoder().fit(y_train)
+        ensemble.classes_ = ensemble.le_.classes_
+        ensemble.estimators_ = [model for _, model in members]
+        ensemble.named_estimators_ = Bunch(**dict(members))
+        return ensemble
+
+    def select_best(self, fitted, y_val):
+        """Pick the most accurate candidate with acceptable home bias (first one wins ties)"""
+        best_model = None
+        best_score = 0
+        for model, val_pred in fitted:
+            score = accuracy_score(y_val, val_pred)
+            has_low_bias = self.check_home_bias(y_val, val_pred)
+
+            if score > best_score and has_low_bias:
+                best_score = score
+                best_model = model
+
+        return best_model, best_score
+
+    def calibrate_svm(self, cache, svm, X_val, y_val):
+        """Probability model for the chosen SVC (see svm_calibration)"""
+        if self.svm_calibration == 'platt_cv':
+            return cache.fit([clone(svm).set_params(probability=True)])[0][0]
+        # The fitted SVC is kept as is; only the per-class sigmoids are fitted
+        with stage("calibrate svm", rows=len(X_val)):
+            return CalibratedClassifierCV(FrozenEstimator(svm), method='sigmoid').fit(X_val, y_val)
+
+    def svm_params(self, svm_member):
+        """Params of the SVC in the saved ensemble (inside the calibration wrapper for 'validation')"""
+        if self.svm_calibration == 'validation':
+            return svm_member.estimator.estimator.get_params()
+        return svm_member.get_params()
+
+    @instrumented("train_with_validation")
     def train_with_validation(self, X_train, X_val, y_train, y_val):
         """Train until requirements met using accuracy only"""
         best_accuracy = 0
         best_ensemble = None
         best_params = {}
+        cache = CandidateCache(X_train, y_train, X_val, n_jobs=self.n_jobs)
+        evaluated = set()
 
         for attempt in range(self.max_retrain_attempts):
             print(f"\n--- Attempt {attempt + 1}/{self.max_retrain_attempts} ---")
@@ -113,21 +179,6 @@ class EnsembleModelTrainer:
                 {'C': 10.0, 'max_iter': 3000, 'class_weight': 'balanced'}
             ]
 
-            best_lr = None
-            best_lr_score = 0
-            for config in lr_configs:
-                lr = LogisticRegression(random_state=42 + attempt, **config)
-                lr.fit(X_train, y_train)
-                val_pred = lr.predict(X_val)
-                score = accuracy_score(y_val, val_pred)
-                has_low_bias = self.check_home_bias(y_val, val_pred)
-
-                if score > best_lr_score and has_low_bias:
-                    best_lr_score = score
-                    best_lr = lr
-
-            print(f"Best LR val accuracy: {best_lr_score:.4f}")
-
             # KNN
             knn_configs = [
                 {'n_neighbors': 7, 'weights': 'distance'},
@@ -136,21 +187,6 @@ class EnsembleModelTrainer:
                 {'n_neighbors': 21, 'weights': 'distance'}
             ]
 
-            best_knn = None
-            best_knn_score = 0
-            for config in knn_configs:
-                knn = KNeighborsClassifier(**config)
-                knn.fit(X_train, y_train)
-                val_pred = knn.predict(X_val)
-                score = accuracy_score(y_val, val_pred)
-                has_low_bias = self.check_home_bias(y_val, val_pred)
-
-                if score > best_knn_score and has_low_bias:
-                    best_knn_score = score
-                    best_knn = knn
-
-            print(f"Best KNN val accuracy: {best_knn_score:.4f}")
-
             # SVM with balanced class weights
             svm_configs = [
                 {'C': 0.1, 'kernel': 'rbf', 'gamma': 'scale', 'class_weight': 'balanced'},
@@ -159,27 +195,42 @@ class EnsembleModelTrainer:
                 {'C': 1.0, 'kernel': 'poly', 'degree': 3, 'class_weight': 'balanced'}
             ]
 
-            best_svm = None
-            best_svm_score = 0
-            for config in svm_configs:
-                svm = SVC(probability=True, random_state=42 + attempt, **config)
-                svm.fit(X_train, y_train)
-                val_pred = svm.predict(X_val)
-                score = accuracy_score(y_val, val_pred)
-                has_low_bias = self.check_home_bias(y_val, val_pred)
+            # Fit every candidate of this attempt in one parallel batch. SVC configs are
+            # compared without Platt scaling: predict() comes from the same decision
+            # function either way, so only the chosen SVC is calibrated.
+            candidates = (
+                [LogisticRegression(random_state=42 + attempt, **config) for config in lr_configs]
+                + [KNeighborsClassifier(algorithm=self.knn_algorithm, leaf_size=self.knn_leaf_size, **config)
+                   for config in knn_configs]
+                + [SVC(random_state=42 + attempt, **config) for config in svm_configs]
+            )
+            fitted = cache.fit(candidates)
+            n_lr, n_knn = len(lr_configs), len(knn_configs)
+
+            best_lr, best_lr_score = self.select_best(fitted[:n_lr], y_val)
+            print(f"Best LR val accuracy: {best_lr_score:.4f}")
 
-                if score > best_svm_score and has_low_bias:
-                    best_svm_score = score
-                    best_svm = svm
+            best_knn, best_knn_score = self.select_best(fitted[n_lr:n_lr + n_knn], y_val)
+            print(f"Best KNN val accuracy: {best_knn_score:.4f}")
 
+            best_svm, best_svm_score = self.select_best(fitted[n_lr + n_knn:], y_val)
             print(f"Best SVM val accuracy: {best_svm_score:.4f}")
+            svm_member = None
+            if best_svm is not None:
+                svm_member = self.calibrate_svm(cache, best_svm, X_val, y_val)
+
+            members = [('lr', best_lr), ('knn', best_knn), ('svm', svm_member)]
+            # The validation calibration is deterministic given the SVC, so the SVC itself is the key;
+            # the calibrated wrapper's params include the nested SVC's per-attempt seed
+            svm_key = best_svm if self.svm_calibration == 'validation' else svm_member
+            member_keys = tuple(cache.key(model) for model in (best_lr, best_knn, svm_key) if model is not None)
+            if member_keys in evaluated:
+                print("Search space exhausted: this attempt would repeat an earlier ensemble")
+                break
+            evaluated.add(member_keys)
 
             # Ensemble
-            ensemble = VotingClassifier(
-                estimators=[('lr', best_lr), ('knn', best_knn), ('svm', best_svm)],
-                voting='soft'
-            )
-            ensemble.fit(X_train, y_train)
+            ensemble = self.assemble_ensemble(members, y_train)
 
             val_pred = ensemble.predict(X_val)
             val_accuracy = accuracy_score(y_val, val_pred)
@@ -194,7 +245,8 @@ class EnsembleModelTrainer:
                 best_params = {
                     'lr_params': best_lr.get_params(),
                     'knn_params': best_knn.get_params(),
-                    'svm_params': best_svm.get_params(),
+                    'svm_params': self.svm_params(svm_member),
+                    'svm_calibration': self.svm_calibration,
                     'val_accuracy': float(val_accuracy),
                     'attempt': attempt + 1,
                     'has_low_home_bias': True
@@ -204,6 +256,8 @@ class EnsembleModelTrainer:
                 print(f"\n✓ Requirements met! Accuracy: {val_accuracy:.4f}, Low home bias")
                 break
 
+        print(f"Candidate fits: {cache.misses} trained, {cache.hits} reused")
+
         if best_accuracy < self.min_accuracy:
             print(f"\n⚠ Warning: Best model below requirements")
             print(f"  Accuracy: {best_accuracy:.4f} (need {self.min_accuracy})")
@@ -212,55 +266,67 @@ class EnsembleModelTrainer:
 
     def train_model(self, model_name):
         """Train a single model type"""
-        print(f"\n{'='*70}")
-        print(f"=== Training {model_name.title()} Model ===")
-        print(f"{'='*70}")
-
-        df = self.load_features(model_name)
-        X_train, X_val, X_test, y_train, y_val, y_test, scaler, features = self.prepare_data_splits(df)
-
-        ensemble, params = self.train_with_validation(X_train, X_val, y_train, y_val)
-
-        print("\n--- Test Set Evaluation ---")
-        test_pred = ensemble.predict(X_test)
-        test_acc = accuracy_score(y_test, test_pred)
-        test_f1 = f1_score(y_test, test_pred, average='weighted')
-
-        print(f"Test Accuracy: {test_acc:.4f}")
-        print(f"Test F1: {test_f1:.4f}")
-
-        # Check test set home bias
-        print("\nTest set bias check:")
-        self.check_home_bias(y_test, test_pred)
-
-        print("\nConfusion Matrix:")
-        cm = confusion_matrix(y_test, test_pred)
-        print("           Predicted")
-        print("         A    D    H")
-        print(f"Actual A {cm[0][0]:4d} {cm[0][1]:4d} {cm[0][2]:4d}")
-        print(f"       D {cm[1][0]:4d} {cm[1][1]:4d} {cm[1][2]:4d}")
-        print(f"       H {cm[2][0]:4d} {cm[2][1]:4d} {cm[2][2]:4d}")
-
-        print("\n" + classification_report(y_test, test_pred, target_names=['Away', 'Draw', 'Home']))
-
-        # Save models
-        model_path = self.MODEL_DIR / f'{model_name}_ensemble.pkl'
-        scaler_path = self.MODEL_DIR / f'{model_name}_scaler.pkl'
-        features_path = self.MODEL_DIR / f'{model_name}_features.pkl'
-        params_path = self.MODEL_DIR / f'{model_name}_params.json'
-
-        joblib.dump(ensemble, model_path)
-        joblib.dump(scaler, scaler_path)
-        joblib.dump(features, features_path)
-
-        params['test_accuracy'] = float(test_acc)
-        params['test_f1_score'] = float(test_f1)
-        params['num_features'] = len(features)
-
-        with open(params_path, 'w') as f:
-            json.dump(params, f, indent=2)
-
-        print(f"\n✓ Saved to {self.MODEL_DIR}/")
+        with stage(f"train_model {model_name}"):
+            print(f"\n{'='*70}")
+            print(f"=== Training {model_name.title()} Model ===")
+            print(f"{'='*70}")
+
+            df = self.load_features(model_name)
+            X_train, X_val, X_test, y_train, y_val, y_test, scaler, features = self.prepare_data_splits(df)
+
+            ensemble, params = self.train_with_validation(X_train, X_val, y_train, y_val)
+
+            print("\n--- Test Set Evaluation ---")
+            test_pred = ensemble.predict(X_test)
+            test_acc = accuracy_score(y_test, test_pred)
+            test_f1 = f1_score(y_test, test_pred, average='weighted')
+
+            print(f"Test Accuracy: {test_acc:.4f}")
+            print(f"Test F1: {test_f1:.4f}")
+
+            # Check test set home bias
+            print("\nTest set bias check:")
+            self.check_home_bias(y_test, test_pred)
+
+            print("\nConfusion Matrix:")
+            cm = confusion_matrix(y_test, test_pred)
+            print("           Predicted")
+            print("         A    D    H")
+            print(f"Actual A {cm[0][0]:4d} {cm[0][1]:4d} {cm[0][2]:4d}")
+            print(f"       D {cm[1][0]:4d} {cm[1][1]:4d} {cm[1][2]:4d}")
+            print(f"       H {cm[2][0]:4d} {cm[2][1]:4d} {cm[2][2]:4d}")
+
+            print("\n" + classification_report(y_test, test_pred, target_names=['Away', 'Draw', 'Home']))
+
+            # Save models
+            model_path = self.MODEL_DIR / f'{model_name}_ensemble.pkl'
+            scaler_path = self.MODEL_DIR / f'{model_name}_scaler.pkl'
+            features_path = self.MODEL_DIR / f'{model_name}_features.pkl'
+            params_path = self.MODEL_DIR / f'{model_name}_params.json'
+            kernel_path = self.MODEL_DIR / f'{model_name}{KERNEL_SUFFIX}'
+
+            joblib.dump(ensemble, model_path)
+            joblib.dump(scaler, scaler_path)
+            joblib.dump(features, features_path)
+
+            # NumPy-only copy of the ensemble for fast-start prediction, checked against sklearn first
+            kernel = EnsembleKernel.from_sklearn(ensemble, scaler, features, source_signature(model_path))
+            try:
+                max_diff = check_parity(kernel, ensemble, X_test)
+                kernel.save(kernel_path)
+                print(f"✓ Exported NumPy kernel (max probability difference {max_diff:.1e})")
+            except ValueError as e:
+                kernel_path.unlink(missing_ok=True)
+                print(f"⚠ Kernel not exported: {e}")
+
+            params['test_accuracy'] = float(test_acc)
+            params['test_f1_score'] = float(test_f1)
+            params['num_features'] = len(features)
+
+            with open(params_path, 'w') as f:
+                json.dump(params, f, indent=2)
+
+            print(f"\n✓ Saved to {self.MODEL_DIR}/")
 
     def train_all_models(self):
         """Train both models"""
@@ -1,8 +1,7 @@
 const express = require('express');
 const router = express.Router();
-const { spawn } = require('child_process');
-const path = require('path');
 const pool = require('../database');
+const { runPrediction } = require('../services/mlservices');
 
 // Get all seasons
 router.get('/seasons', async (req, res) => {
@@ -45,48 +44,12 @@ router.post('/predict', async (req, res) => {
   try {
     const { homeTeam, awayTeam, homeSeasonCode, awaySeasonCode } = req.body;
 
-    // Path to Python script
-    const pythonScript = path.join(__dirname, '../MLModelTraining/predict_matches.py');
-
-    // Spawn Python process
-    const python = spawn('python3', [
-      pythonScript,
-      homeTeam,
-      awayTeam,
-      homeSeasonCode,
-      awaySeasonCode
-    ]);
-
-    let dataString = '';
-    let errorString = '';
-
-    python.stdout.on('data', (data) => {
-      dataString += data.toString();
-    });
-
-    python.stderr.on('data', (data) => {
-      errorString += data.toString();
-    });
-
-    python.on('close', (code) => {
-      if (code !== 0) {
-        console.error('Python error:', errorString);
-        return res.status(500).json({ error: 'Prediction failed', details: errorString });
-      }
-
-      try {
-        // Parse the JSON output from Python
-        const result = JSON.parse(dataString);
-        res.json(result);
-      } catch (parseError) {
-        console.error('Parse error:', parseError, 'Data:', dataString);
-        res.status(500).json({ error: 'Failed to parse prediction result' });
-      }
-    });
-
+    // Answered by the persistent Python prediction worker
+    const result = await runPrediction({ homeTeam, awayTeam, homeSeasonCode, awaySeasonCode });
+    res.json(result);
   } catch (error) {
     console.error('Prediction error:', error);
-    res.status(500).json({ error: error.message });
+    res.status(500).json({ error: 'Prediction failed', details: error.message });
   }
 });
 
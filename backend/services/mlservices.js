@@ -1,26 +1,123 @@
 const { spawn } = require('child_process');
 const path = require('path');
+const readline = require('readline');
 
-const runPrediction = (matchData) => {
-  return new Promise((resolve, reject) => {
-    const pythonProcess = spawn('python', [
-      path.join(__dirname, '../MLModelTraining/predict_matches.py'),
-      JSON.stringify(matchData)
-    ]);
-
-    let output = '';
-    pythonProcess.stdout.on('data', (data) => {
-      output += data.toString();
-    });
+const WORKER_SCRIPT = path.join(__dirname, '../MLModelTraining/prediction_server.py');
+const PYTHON_BIN = process.env.PYTHON_BIN || 'python3';
+const REQUEST_TIMEOUT_MS = 30000;
+// Only the end of the worker's stderr is kept for error messages; it logs for as long as it runs
+const STDERR_TAIL_LENGTH = 4096;
+
+// A single long-lived Python worker keeps the models loaded between requests
+let worker = null;
+let ready = null;
+let nextId = 1;
+const pending = new Map();
+
+const failPending = (error) => {
+  for (const { reject, timer } of pending.values()) {
+    clearTimeout(timer);
+    reject(error);
+  }
+  pending.clear();
+};
+
+const startWorker = () => {
+  const current = spawn(PYTHON_BIN, [WORKER_SCRIPT], { cwd: path.dirname(WORKER_SCRIPT) });
+  worker = current;
+
+  let errorTail = '';
+  current.stderr.on('data', (data) => {
+    errorTail = (errorTail + data.toString()).slice(-STDERR_TAIL_LENGTH);
+  });
+
+  // Writes to a worker that just exited fail with EPIPE; the request that wrote is rejected separately
+  current.stdin.on('error', (error) => {
+    console.error('Prediction worker stdin error:', error.message);
+  });
+
+  ready = new Promise((resolve, reject) => {
+    const lines = readline.createInterface({ input: current.stdout });
+
+    lines.on('line', (line) => {
+      let message;
+      try {
+        message = JSON.parse(line);
+      } catch (parseError) {
+        console.error('Prediction worker sent invalid output:', line);
+        return;
+      }
 
-    pythonProcess.on('close', (code) => {
-      if (code === 0) {
-        resolve(JSON.parse(output));
+      if (message.ready) {
+        resolve();
+        return;
+      }
+
+      const request = pending.get(message.id);
+      if (!request) return;
+      pending.delete(message.id);
+      clearTimeout(request.timer);
+
+      if (message.error) {
+        request.reject(new Error(message.error));
       } else {
-        reject(new Error('Prediction failed'));
+        request.resolve(message.result);
       }
     });
+
+    current.on('close', (code) => {
+      const error = new Error(`Prediction worker exited (code ${code}): ${errorTail}`);
+      console.error(error.message);
+      if (worker === current) {
+        worker = null;
+        ready = null;
+      }
+      reject(error);
+      failPending(error);
+    });
+  });
+
+  // Avoid unhandled rejections when the worker dies before anyone is waiting
+  ready.catch(() => {});
+};
+
+const runPrediction = async (matchData) => {
+  if (!worker) {
+    startWorker();
+  }
+  // The worker can exit while we wait, which resets the shared `worker` to null
+  const current = worker;
+  await ready;
+  if (worker !== current || current.exitCode !== null || current.signalCode !== null) {
+    throw new Error('Prediction worker exited before the request was sent');
+  }
+
+  const id = nextId++;
+  return new Promise((resolve, reject) => {
+    const fail = (error) => {
+      if (!pending.has(id)) return;
+      clearTimeout(pending.get(id).timer);
+      pending.delete(id);
+      reject(error);
+    };
+    const timer = setTimeout(() => fail(new Error('Prediction timed out')), REQUEST_TIMEOUT_MS);
+    pending.set(id, { resolve, reject, timer });
+
+    const request = JSON.stringify({
+      id,
+      home_team: matchData.homeTeam,
+      away_team: matchData.awayTeam,
+      home_season: matchData.homeSeasonCode,
+      away_season: matchData.awaySeasonCode
+    }) + '\n';
+    try {
+      current.stdin.write(request, (error) => {
+        if (error) fail(new Error(`Could not send request to prediction worker: ${error.message}`));
+      });
+    } catch (error) {
+      fail(new Error(`Could not send request to prediction worker: ${error.message}`));
+    }
   });
 };
 
-module.exports = { runPrediction };
\ No newline at end of file
+module.exports = { runPrediction };
@@ -1,4 +1,6 @@
 import os
+import io
+import sys
 import pandas as pd
 import psycopg2
 import urllib.parse as up 
@@ -24,163 +26,172 @@ print("DATABASE_URL from env:", DATABASE_URL)
 if not DATABASE_URL:
     raise ValueError("❌ DATABASE_URL not found in pginfo.env")
 
-# --- Connect to Neon database ---
-conn = psycopg2.connect(DATABASE_URL)
-cur = conn.cursor()
-cur.execute("SET datestyle TO 'DMY';")
-print("✅ Connected to Neon")
+conn = None
+cur = None
+
+def connect():
+    global conn, cur
+    # --- Connect to Neon database ---
+    conn = psycopg2.connect(DATABASE_URL)
+    cur = conn.cursor()
+    cur.execute("SET datestyle TO 'DMY';")
+    print("✅ Connected to Neon")
 
 # ==========================================================
 # 🧹 RESET DATABASE STATE
 # ==========================================================
-print("🧹 Dropping old tables...")
-cur.execute("DROP TABLE IF EXISTS StandardizedMatches CASCADE;")
-cur.execute("DROP TABLE IF EXISTS TeamMatches CASCADE;")
-cur.execute("DROP TABLE IF EXISTS Standings CASCADE;")
-cur.execute("DROP TABLE IF EXISTS Seasons CASCADE;")
-conn.commit()
-print("✅ Tables dropped.")
+def drop_tables():
+    print("🧹 Dropping old tables...")
+    cur.execute("DROP TABLE IF EXISTS StandardizedMatches CASCADE;")
+    cur.execute("DROP TABLE IF EXISTS TeamMatches CASCADE;")
+    cur.execute("DROP TABLE IF EXISTS Standings CASCADE;")
+    cur.execute("DROP TABLE IF EXISTS Seasons CASCADE;")
+    conn.commit()
+    print("✅ Tables dropped.")
 
 # ==========================================================
 # 🏗️ RECREATE TABLES CLEAN
 # ==========================================================
-
-# --- Create Seasons table ---
-cur.execute("""
-CREATE TABLE IF NOT EXISTS Seasons (
-    id SERIAL PRIMARY KEY,
-    code VARCHAR(20) UNIQUE,
-    start_year INT,
-    end_year INT,
-    notes TEXT
-);
-""")
-
-# --- Create StandardizedMatches (MatchID is the real primary key) ---
-cur.execute("""
-CREATE TABLE IF NOT EXISTS StandardizedMatches (
-    MatchID BIGINT PRIMARY KEY,
-    HomeTeamId BIGINT,
-    AwayTeamId BIGINT,
-    Date DATE,
-    HomeTeam VARCHAR(100),
-    AwayTeam VARCHAR(100),
-    FTHG INT,
-    FTAG INT,
-    FTR VARCHAR(5),
-    HTHG INT,
-    HTAG INT,
-    HTR VARCHAR(5),
-    Referee VARCHAR(100),
-    HS INT,
-    AS_ INT,
-    HST INT,
-    AST INT,
-    HF INT,
-    AF INT,
-    HC INT,
-    AC INT,
-    HY INT,
-    AY INT,
-    HR INT,
-    AR INT,
-    B365H FLOAT,
-    B365D FLOAT,
-    B365A FLOAT,
-    Season VARCHAR(20),
-    SeasonId INT REFERENCES Seasons(id)
-);
-""")
-
-# Create Teams table if not exists
-cur.execute("""
-CREATE TABLE IF NOT EXISTS Teams (
-    id SERIAL PRIMARY KEY,
-    name VARCHAR(100) UNIQUE
-);
-""")
-
-# --- Create TeamMatches (weak entity referencing StandardizedMatches) ---
-cur.execute("""
-CREATE TABLE IF NOT EXISTS TeamMatches (
-    MatchID BIGINT PRIMARY KEY REFERENCES StandardizedMatches(MatchID),
-    homeTeamID BIGINT,
-    awayTeamID INT,
-    Date DATE,
-    HomeTeam VARCHAR(100),
-    AwayTeam VARCHAR(100),
-    FTHG INT,
-    FTAG INT,
-    FTR VARCHAR(5),
-    HTHG INT,
-    HTAG INT,
-    HTR VARCHAR(5),
-    Referee VARCHAR(100),
-    HS INT,
-    AS_ INT,
-    HST INT,
-    AST INT,
-    HF INT,
-    AF INT,
-    HC INT,
-    AC INT,
-    HY INT,
-    AY INT,
-    HR INT,
-    AR INT,
-    B365H FLOAT,
-    B365D FLOAT,
-    B365A FLOAT,
-    Season VARCHAR(20),
-    SeasonId INT REFERENCES Seasons(id)
-);
-""")
-
-# --- Create Standings (league table summary per season/team) ---
-cur.execute("""
-CREATE TABLE IF NOT EXISTS Standings (
-    id SERIAL PRIMARY KEY,
-    TeamId INT,
-    Rank INT,
-    Team VARCHAR(100),
-    Season VARCHAR(20),
-    MatchesPlayed INT,
-    Wins INT,
-    Draws INT,
-    Losses INT,
-    Points INT,
-    GoalsScored INT,
-    GoalsConceded INT,
-    GoalDifference INT,
-    TotalHS INT,
-    PerGameHS FLOAT,
-    TotalAS INT,
-    PerGameAS FLOAT,
-    TotalHST INT,
-    PerGameHST FLOAT,
-    TotalAST INT,
-    PerGameAST FLOAT,
-    TotalHC INT,
-    PerGameHC FLOAT,
-    TotalAC INT,
-    PerGameAC FLOAT,
-    TotalHF INT,
-    PerGameHF FLOAT,
-    TotalAF INT,
-    PerGameAF FLOAT,
-    TotalHY INT,
-    PerGameHY FLOAT,
-    TotalAY INT,
-    PerGameAY FLOAT,
-    TotalHR INT,
-    PerGameHR FLOAT,
-    TotalAR INT,
-    PerGameAR FLOAT,
-    SeasonId INT REFERENCES Seasons(id)
-);
-""")
-
-conn.commit()
+def create_tables():
+    # --- Create Seasons table ---
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS Seasons (
+        id SERIAL PRIMARY KEY,
+        code VARCHAR(20) UNIQUE,
+        start_year INT,
+        end_year INT,
+        notes TEXT
+    );
+    """)
+
+    # --- Create StandardizedMatches (MatchID is the real primary key) ---
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS StandardizedMatches (
+        MatchID BIGINT PRIMARY KEY,
+        HomeTeamId BIGINT,
+        AwayTeamId BIGINT,
+        Date DATE,
+        HomeTeam VARCHAR(100),
+        AwayTeam VARCHAR(100),
+        FTHG INT,
+        FTAG INT,
+        FTR VARCHAR(5),
+        HTHG INT,
+        HTAG INT,
+        HTR VARCHAR(5),
+        Referee VARCHAR(100),
+        HS INT,
+        AS_ INT,
+        HST INT,
+        AST INT,
+        HF INT,
+        AF INT,
+        HC INT,
+        AC INT,
+        HY INT,
+        AY INT,
+        HR INT,
+        AR INT,
+        B365H FLOAT,
+        B365D FLOAT,
+        B365A FLOAT,
+        Season VARCHAR(20),
+        RowHash BIGINT,
+        SeasonId INT REFERENCES Seasons(id)
+    );
+    """)
+
+    # Create Teams table if not exists
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS Teams (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(100) UNIQUE
+    );
+    """)
+
+    # --- Create TeamMatches (weak entity referencing StandardizedMatches) ---
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS TeamMatches (
+        MatchID BIGINT PRIMARY KEY REFERENCES StandardizedMatches(MatchID),
+        homeTeamID BIGINT,
+        awayTeamID INT,
+        Date DATE,
+        HomeTeam VARCHAR(100),
+        AwayTeam VARCHAR(100),
+        FTHG INT,
+        FTAG INT,
+        FTR VARCHAR(5),
+        HTHG INT,
+        HTAG INT,
+        HTR VARCHAR(5),
+        Referee VARCHAR(100),
+        HS INT,
+        AS_ INT,
+        HST INT,
+        AST INT,
+        HF INT,
+        AF INT,
+        HC INT,
+        AC INT,
+        HY INT,
+        AY INT,
+        HR INT,
+        AR INT,
+        B365H FLOAT,
+        B365D FLOAT,
+        B365A FLOAT,
+        Season VARCHAR(20),
+        RowHash BIGINT,
+        SeasonId INT REFERENCES Seasons(id)
+    );
+    """)
+
+    # --- Create Standings (league table summary per season/team) ---
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS Standings (
+        id SERIAL PRIMARY KEY,
+        TeamId INT,
+        Rank INT,
+        Team VARCHAR(100),
+        Season VARCHAR(20),
+        MatchesPlayed INT,
+        Wins INT,
+        Draws INT,
+        Losses INT,
+        Points INT,
+        GoalsScored INT,
+        GoalsConceded INT,
+        GoalDifference INT,
+        TotalHS INT,
+        PerGameHS FLOAT,
+        TotalAS INT,
+        PerGameAS FLOAT,
+        TotalHST INT,
+        PerGameHST FLOAT,
+        TotalAST INT,
+        PerGameAST FLOAT,
+        TotalHC INT,
+        PerGameHC FLOAT,
+        TotalAC INT,
+        PerGameAC FLOAT,
+        TotalHF INT,
+        PerGameHF FLOAT,
+        TotalAF INT,
+        PerGameAF FLOAT,
+        TotalHY INT,
+        PerGameHY FLOAT,
+        TotalAY INT,
+        PerGameAY FLOAT,
+        TotalHR INT,
+        PerGameHR FLOAT,
+        TotalAR INT,
+        PerGameAR FLOAT,
+        RowHash BIGINT,
+        SeasonId INT REFERENCES Seasons(id)
+    );
+    """)
+
+    conn.commit()
 
 # ==========================================================
 # 📁 Folder paths
@@ -206,216 +217,431 @@ def drop_duplicate_columns_for_pg(df):
             seen.add(col_lower)
     return df[keep_cols]
 
+def integer_columns_for_pg(df):
+    """Whole-number float columns (ints that picked up NaNs) back to integers so COPY accepts them"""
+    for col in df.columns:
+        if pd.api.types.is_float_dtype(df[col]):
+            values = df[col].dropna()
+            if (values == values.round()).all():
+                df[col] = df[col].astype("Int64")
+    return df
+
+def row_hashes(df):
+    """Content hash per row, stored as RowHash so sync can spot changed rows"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64")
+
+def read_csv_for_pg(path, table_name):
+    """Read one CSV and shape it like the rows stored in table_name"""
+    df = pd.read_csv(path)
+
+    df.rename(columns={"AS": "AS_"}, inplace=True)
+    df = drop_duplicate_columns_for_pg(df)
+    # Remove duplicate match rows inside TeamMatches CSVs
+    if table_name == "TeamMatches" and "MatchID" in df.columns:
+        df = df.drop_duplicates(subset=["MatchID"])
+    df = integer_columns_for_pg(df)
+    df["RowHash"] = row_hashes(df)
+    return df
+
+def copy_dataframe(df, table_name):
+    """Stream a DataFrame into table_name with a single COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cols = ', '.join(df.columns)
+    cur.copy_expert(f"COPY {table_name} ({cols}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def stage_rows(df, table_name):
+    """COPY rows into a temporary staging table with table_name's types for df's columns; returns its name"""
+    staging = f"staging_{table_name}"
+    # Only the CSV's columns: the rest (e.g. Standings.id) keep their defaults in the merge
+    # instead of failing NOT NULL constraints copied from table_name
+    cols = ', '.join(df.columns)
+    cur.execute(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {cols} FROM {table_name} WITH NO DATA;")
+    copy_dataframe(df, staging)
+    return staging
+
 def load_folder_to_table(folder_path, table_name):
     if not os.path.exists(folder_path):
         print(f"❌ Folder not found: {folder_path}")
         return
 
     print(f"📂 Loading data from: {folder_path}")
-    for file in os.listdir(folder_path):
+    for file in sorted(os.listdir(folder_path)):
         if not file.endswith(".csv"):
             continue
 
         print(f"→ Inserting: {file}")
-        df = pd.read_csv(os.path.join(folder_path, file))
-
-        df.rename(columns={"AS": "AS_"}, inplace=True)
-        df = drop_duplicate_columns_for_pg(df)  
-        # Remove duplicate match rows inside TeamMatches CSVs
-        if table_name == "TeamMatches" and "MatchID" in df.columns:
-            df = df.drop_duplicates(subset=["MatchID"])
-        df = df.where(pd.notnull(df), None)
+        df = read_csv_for_pg(os.path.join(folder_path, file), table_name)
 
+        # COPY into a staging table, then merge in one statement; rows that already
+        # exist (e.g. matches shared between team files) are skipped by ON CONFLICT
         cols = ', '.join(df.columns)
-        placeholders = ', '.join(['%s'] * len(df.columns))
-        sql = f"INSERT INTO {table_name} ({cols}) VALUES ({placeholders})"
-
-        for idx, row in df.iterrows():
-          try:
-              cur.execute(sql, tuple(row))
-          except Exception as e:
-              # ✅ Skip duplicates automatically
-              if "duplicate key value violates unique constraint" in str(e):
-                  continue
-              print(f"\n❌ ERROR in file: {file}")
-              print(f"   → Row number: {idx + 2}")
-              print(f"   → Error: {e}")
-              print(f"   → Row data:\n{row}\n")
-              conn.rollback()
-              conn.commit()
-              break
-
-        conn.commit()
-        print(f"✅ Done: {file}")
-# ==========================================================
-# 🚚 Load Data
-# ==========================================================
-# --- Load Standardized match data first (this defines MatchID) ---
-load_folder_to_table(STANDARDIZED_DIR, "StandardizedMatches")
-
-# --- Then load the TeamMatches (which references MatchID) ---
-load_folder_to_table(TEAMFILES_DIR, "TeamMatches")
+        try:
+            staging = stage_rows(df, table_name)
+            cur.execute(f"""
+                INSERT INTO {table_name} ({cols})
+                SELECT {cols} FROM {staging}
+                ON CONFLICT DO NOTHING;
+            """)
+            inserted = cur.rowcount
+            conn.commit()
+        except psycopg2.Error as e:
+            print(f"\n❌ ERROR in file: {file}")
+            print(f"   → Error: {e}")
+            conn.rollback()
+            continue
 
-# --- Finally load Standings ---
-load_folder_to_table(STANDINGS_DIR, "Standings")
+        print(f"✅ Done: {file} ({inserted} new rows, {len(df) - inserted} skipped)")
 
 # ==========================================================
 # 🏗️ Build & Assign Team IDs
 # ==========================================================
-print("\n🏗️ Populating Teams table from StandardizedMatches...")
-
-cur.execute("""
-INSERT INTO Teams (name)
-SELECT DISTINCT TRIM(HomeTeam)
-FROM StandardizedMatches
-WHERE HomeTeam IS NOT NULL
-ON CONFLICT (name) DO NOTHING;
-""")
-
-cur.execute("""
-INSERT INTO Teams (name)
-SELECT DISTINCT TRIM(AwayTeam)
-FROM StandardizedMatches
-WHERE AwayTeam IS NOT NULL
-ON CONFLICT (name) DO NOTHING;
-""")
-
-conn.commit()
-print("✅ Teams inserted")
-
-print("\n🔗 Assigning TeamId to StandardizedMatches and TeamMatches...")
-
-cur.execute("""
-UPDATE StandardizedMatches sm
-SET HomeTeamId = t.id
-FROM Teams t
-WHERE sm.HomeTeam = t.name;
-""")
-
-cur.execute("""
-UPDATE StandardizedMatches sm
-SET AwayTeamId = t.id
-FROM Teams t
-WHERE sm.AwayTeam = t.name;
-""")
-
-cur.execute("""
-UPDATE TeamMatches tm
-SET HomeTeamId = t.id
-FROM Teams t
-WHERE tm.HomeTeam = t.name;
-""")
-
-cur.execute("""
-UPDATE TeamMatches tm
-SET AwayTeamId = t.id
-FROM Teams t
-WHERE tm.AwayTeam = t.name;
-""")
-
-conn.commit()
-print("✅ TeamIds assigned successfully")
+def assign_team_ids():
+    print("\n🏗️ Populating Teams table from StandardizedMatches...")
+
+    cur.execute("""
+    INSERT INTO Teams (name)
+    SELECT DISTINCT TRIM(HomeTeam)
+    FROM StandardizedMatches
+    WHERE HomeTeam IS NOT NULL
+    ON CONFLICT (name) DO NOTHING;
+    """)
+
+    cur.execute("""
+    INSERT INTO Teams (name)
+    SELECT DISTINCT TRIM(AwayTeam)
+    FROM StandardizedMatches
+    WHERE AwayTeam IS NOT NULL
+    ON CONFLICT (name) DO NOTHING;
+    """)
+
+    conn.commit()
+    print("✅ Teams inserted")
+
+    print("\n🔗 Assigning TeamId to StandardizedMatches and TeamMatches...")
+
+    cur.execute("""
+    UPDATE StandardizedMatches sm
+    SET HomeTeamId = t.id
+    FROM Teams t
+    WHERE sm.HomeTeam = t.name;
+    """)
+
+    cur.execute("""
+    UPDATE StandardizedMatches sm
+    SET AwayTeamId = t.id
+    FROM Teams t
+    WHERE sm.AwayTeam = t.name;
+    """)
+
+    cur.execute("""
+    UPDATE TeamMatches tm
+    SET HomeTeamId = t.id
+    FROM Teams t
+    WHERE tm.HomeTeam = t.name;
+    """)
+
+    cur.execute("""
+    UPDATE TeamMatches tm
+    SET AwayTeamId = t.id
+    FROM Teams t
+    WHERE tm.AwayTeam = t.name;
+    """)
+
+    conn.commit()
+    print("✅ TeamIds assigned successfully")
 
 # ==========================================================
 # 🧼 Normalize seasons, derive missing seasons from Date, and link SeasonId
 # ==========================================================
-print("\n🧼 Normalizing seasons and linking SeasonId...")
-
-# 0) Make sure helper columns exist where needed
-cur.execute("ALTER TABLE StandardizedMatches ADD COLUMN IF NOT EXISTS Season VARCHAR(20);")
-cur.execute("ALTER TABLE StandardizedMatches ADD COLUMN IF NOT EXISTS SeasonId INT;")
-cur.execute("ALTER TABLE Standings ADD COLUMN IF NOT EXISTS SeasonId INT;")
-cur.execute("ALTER TABLE TeamMatches ADD COLUMN IF NOT EXISTS Season VARCHAR(20);")
-cur.execute("ALTER TABLE TeamMatches ADD COLUMN IF NOT EXISTS SeasonId INT;")
-conn.commit()
-
-# 1) Fix reversed season formatting '2019/2018' → '2018/2019'
-cur.execute("""
-UPDATE Standings
-SET Season = CONCAT(
-      LEAST(LEFT(Season,4)::INT, RIGHT(Season,4)::INT),
-      '/',
-      GREATEST(LEFT(Season,4)::INT, RIGHT(Season,4)::INT)
+def link_seasons():
+    print("\n🧼 Normalizing seasons and linking SeasonId...")
+
+    # 0) Make sure helper columns exist where needed
+    cur.execute("ALTER TABLE StandardizedMatches ADD COLUMN IF NOT EXISTS Season VARCHAR(20);")
+    cur.execute("ALTER TABLE StandardizedMatches ADD COLUMN IF NOT EXISTS SeasonId INT;")
+    cur.execute("ALTER TABLE Standings ADD COLUMN IF NOT EXISTS SeasonId INT;")
+    cur.execute("ALTER TABLE TeamMatches ADD COLUMN IF NOT EXISTS Season VARCHAR(20);")
+    cur.execute("ALTER TABLE TeamMatches ADD COLUMN IF NOT EXISTS SeasonId INT;")
+    conn.commit()
+
+    # 1) Fix reversed season formatting '2019/2018' → '2018/2019'
+    cur.execute("""
+    UPDATE Standings
+    SET Season = CONCAT(
+          LEAST(LEFT(Season,4)::INT, RIGHT(Season,4)::INT),
+          '/',
+          GREATEST(LEFT(Season,4)::INT, RIGHT(Season,4)::INT)
+        )
+    WHERE Season IS NOT NULL
+      AND Season ~ '^[0-9]{4}/[0-9]{4}$'
+      AND LEFT(Season,4)::INT > RIGHT(Season,4)::INT;
+    """)
+    conn.commit()
+
+    # 2) Derive Season for StandardizedMatches
+    cur.execute("""
+    UPDATE StandardizedMatches
+    SET Season =
+        CASE
+          WHEN Date IS NULL THEN NULL
+          WHEN EXTRACT(MONTH FROM Date) >= 7
+            THEN CONCAT(EXTRACT(YEAR FROM Date)::INT, '/', (EXTRACT(YEAR FROM Date)::INT + 1))
+          ELSE CONCAT((EXTRACT(YEAR FROM Date)::INT - 1), '/', EXTRACT(YEAR FROM Date)::INT)
+        END
+    WHERE Season IS NULL
+       OR Season !~ '^[0-9]{4}/[0-9]{4}$';
+    """)
+    conn.commit()
+
+    # 3) Derive Season for TeamMatches
+    cur.execute("""
+    UPDATE TeamMatches
+    SET Season =
+        CASE
+          WHEN Date IS NULL THEN NULL
+          WHEN EXTRACT(MONTH FROM Date) >= 7
+            THEN CONCAT(EXTRACT(YEAR FROM Date)::INT, '/', (EXTRACT(YEAR FROM Date)::INT + 1))
+          ELSE CONCAT((EXTRACT(YEAR FROM Date)::INT - 1), '/', EXTRACT(YEAR FROM Date)::INT)
+        END
+    WHERE Season IS NULL
+       OR Season !~ '^[0-9]{4}/[0-9]{4}$';
+    """)
+    conn.commit()
+
+    # 4) Insert Seasons into Season table
+    cur.execute("""
+    INSERT INTO Seasons (code, start_year, end_year)
+    SELECT code, LEFT(code,4)::INT, RIGHT(code,4)::INT
+    FROM (
+      SELECT DISTINCT Season AS code FROM Standings WHERE Season IS NOT NULL
+      UNION
+      SELECT DISTINCT Season FROM StandardizedMatches WHERE Season IS NOT NULL
+      UNION
+      SELECT DISTINCT Season FROM TeamMatches WHERE Season IS NOT NULL
+    ) s
+    WHERE code ~ '^[0-9]{4}/[0-9]{4}$'
+    ON CONFLICT (code) DO NOTHING;
+    """)
+    conn.commit()
+
+    # 5) Link SeasonId everywhere
+    cur.execute("""
+    UPDATE Standings s
+    SET SeasonId = se.id
+    FROM Seasons se
+    WHERE s.Season = se.code;
+    """)
+
+    cur.execute("""
+    UPDATE StandardizedMatches sm
+    SET SeasonId = se.id
+    FROM Seasons se
+    WHERE sm.Season = se.code;
+    """)
+
+    cur.execute("""
+    UPDATE TeamMatches tm
+    SET SeasonId = se.id
+    FROM Seasons se
+    WHERE tm.Season = se.code;
+    """)
+    conn.commit()
+
+def sanity_checks():
+    # 6) Sanity checks
+    cur.execute("SELECT COUNT(*) FROM StandardizedMatches WHERE SeasonId IS NULL;")
+    print("StandardizedMatches missing SeasonId:", cur.fetchone()[0])
+    cur.execute("SELECT COUNT(*) FROM TeamMatches WHERE SeasonId IS NULL;")
+    print("TeamMatches missing SeasonId:", cur.fetchone()[0])
+    cur.execute("SELECT COUNT(*) FROM Standings WHERE SeasonId IS NULL;")
+    print("Standings missing SeasonId:", cur.fetchone()[0])
+
+# ==========================================================
+# 🚚 Full rebuild
+# ==========================================================
+def rebuild():
+    """Drop and recreate every table, then load all CSVs"""
+    drop_tables()
+    create_tables()
+
+    # --- Load Standardized match data first (this defines MatchID) ---
+    load_folder_to_table(STANDARDIZED_DIR, "StandardizedMatches")
+
+    # --- Then load the TeamMatches (which references MatchID) ---
+    load_folder_to_table(TEAMFILES_DIR, "TeamMatches")
+
+    # --- Finally load Standings ---
+    load_folder_to_table(STANDINGS_DIR, "Standings")
+
+    assign_team_ids()
+    link_seasons()
+
+# ==========================================================
+# 🔄 Incremental sync
+# ==========================================================
+# Season code ('2023/2024') for a match date; seasons start in July
+def season_from_date(date_col):
+    return (
+        "CASE"
+        f" WHEN {date_col} IS NULL THEN NULL"
+        f" WHEN EXTRACT(MONTH FROM {date_col}) >= 7"
+        f" THEN CONCAT(EXTRACT(YEAR FROM {date_col})::INT, '/', (EXTRACT(YEAR FROM {date_col})::INT + 1))"
+        f" ELSE CONCAT((EXTRACT(YEAR FROM {date_col})::INT - 1), '/', EXTRACT(YEAR FROM {date_col})::INT)"
+        " END"
+    )
+
+def normalize_season(season):
+    """Fix reversed season formatting '2019/2018' → '2018/2019'"""
+    if isinstance(season, str) and len(season) == 9 and season[4] == "/":
+        start, end = season.split("/")
+        if start.isdigit() and end.isdigit() and int(start) > int(end):
+            return f"{end}/{start}"
+    return season
+
+def read_folder_for_pg(folder_path, table_name, required_col):
+    """All CSVs of a folder as one DataFrame, skipping files without required_col"""
+    frames = []
+    for file in sorted(os.listdir(folder_path)):
+        if not file.endswith(".csv"):
+            continue
+        df = read_csv_for_pg(os.path.join(folder_path, file), table_name)
+        if required_col not in df.columns:
+            print(f"⚠ Skipping {file}: no {required_col} column")
+            continue
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    # Columns missing from some files come back from concat as floats with NaNs
+    return integer_columns_for_pg(pd.concat(frames, ignore_index=True))
+
+def insert_new_seasons(season_sql, staging):
+    cur.execute(
+        "INSERT INTO Seasons (code, start_year, end_year) "
+        "SELECT DISTINCT code, LEFT(code,4)::INT, RIGHT(code,4)::INT "
+        f"FROM (SELECT {season_sql} AS code FROM {staging} s) x "
+        "WHERE code ~ '^[0-9]{4}/[0-9]{4}$' "
+        "ON CONFLICT (code) DO NOTHING;"
     )
-WHERE Season IS NOT NULL
-  AND Season ~ '^[0-9]{4}/[0-9]{4}$'
-  AND LEFT(Season,4)::INT > RIGHT(Season,4)::INT;
-""")
-conn.commit()
-
-# 2) Derive Season for StandardizedMatches
-cur.execute("""
-UPDATE StandardizedMatches
-SET Season =
-    CASE
-      WHEN Date IS NULL THEN NULL
-      WHEN EXTRACT(MONTH FROM Date) >= 7
-        THEN CONCAT(EXTRACT(YEAR FROM Date)::INT, '/', (EXTRACT(YEAR FROM Date)::INT + 1))
-      ELSE CONCAT((EXTRACT(YEAR FROM Date)::INT - 1), '/', EXTRACT(YEAR FROM Date)::INT)
-    END
-WHERE Season IS NULL
-   OR Season !~ '^[0-9]{4}/[0-9]{4}$';
-""")
-conn.commit()
-
-# 3) Derive Season for TeamMatches
-cur.execute("""
-UPDATE TeamMatches
-SET Season =
-    CASE
-      WHEN Date IS NULL THEN NULL
-      WHEN EXTRACT(MONTH FROM Date) >= 7
-        THEN CONCAT(EXTRACT(YEAR FROM Date)::INT, '/', (EXTRACT(YEAR FROM Date)::INT + 1))
-      ELSE CONCAT((EXTRACT(YEAR FROM Date)::INT - 1), '/', EXTRACT(YEAR FROM Date)::INT)
-    END
-WHERE Season IS NULL
-   OR Season !~ '^[0-9]{4}/[0-9]{4}$';
-""")
-conn.commit()
-
-# 4) Insert Seasons into Season table
-cur.execute("""
-INSERT INTO Seasons (code, start_year, end_year)
-SELECT code, LEFT(code,4)::INT, RIGHT(code,4)::INT
-FROM (
-  SELECT DISTINCT Season AS code FROM Standings WHERE Season IS NOT NULL
-  UNION
-  SELECT DISTINCT Season FROM StandardizedMatches WHERE Season IS NOT NULL
-  UNION
-  SELECT DISTINCT Season FROM TeamMatches WHERE Season IS NOT NULL
-) s
-WHERE code ~ '^[0-9]{4}/[0-9]{4}$'
-ON CONFLICT (code) DO NOTHING;
-""")
-conn.commit()
-
-# 5) Link SeasonId everywhere
-cur.execute("""
-UPDATE Standings s
-SET SeasonId = se.id
-FROM Seasons se
-WHERE s.Season = se.code;
-""")
-
-cur.execute("""
-UPDATE StandardizedMatches sm
-SET SeasonId = se.id
-FROM Seasons se
-WHERE sm.Season = se.code;
-""")
-
-cur.execute("""
-UPDATE TeamMatches tm
-SET SeasonId = se.id
-FROM Seasons se
-WHERE tm.Season = se.code;
-""")
-conn.commit()
-
-# 6) Sanity checks
-cur.execute("SELECT COUNT(*) FROM StandardizedMatches WHERE SeasonId IS NULL;")
-print("StandardizedMatches missing SeasonId:", cur.fetchone()[0])
-cur.execute("SELECT COUNT(*) FROM TeamMatches WHERE SeasonId IS NULL;")
-print("TeamMatches missing SeasonId:", cur.fetchone()[0])
-cur.execute("SELECT COUNT(*) FROM Standings WHERE SeasonId IS NULL;")
-print("Standings missing SeasonId:", cur.fetchone()[0])
+
+def sync_matches(folder_path, table_name):
+    """Upsert new or changed matches (by MatchID and RowHash) with TeamIds and SeasonId resolved inline"""
+    df = read_folder_for_pg(folder_path, table_name, "MatchID")
+    if df.empty:
+        print(f"❌ No match files found in {folder_path}")
+        return
+    # The same match can appear in several team files; the first one wins, as in a full load
+    df = df.drop_duplicates(subset=["MatchID"])
+
+    if table_name == "TeamMatches":
+        # TeamMatches references StandardizedMatches(MatchID); one orphan row would abort the whole upsert
+        cur.execute("SELECT MatchID FROM StandardizedMatches;")
+        known = df["MatchID"].isin([match_id for (match_id,) in cur.fetchall()])
+        if not known.all():
+            print(f"⚠ Skipping {(~known).sum()} TeamMatches rows with no StandardizedMatches row: "
+                  f"MatchID {', '.join(map(str, df.loc[~known, 'MatchID']))}")
+            df = df[known]
+
+    cur.execute(f"SELECT MatchID, RowHash FROM {table_name};")
+    existing = dict(cur.fetchall())
+    changed = df[[existing.get(match_id) != row_hash for match_id, row_hash in zip(df["MatchID"], df["RowHash"])]]
+    if changed.empty:
+        print(f"✅ {table_name} already up to date ({len(df)} matches)")
+        return
+
+    staging = stage_rows(changed, table_name)
+
+    # New teams and seasons first, so the upsert below can resolve their ids
+    cur.execute(f"""
+    INSERT INTO Teams (name)
+    SELECT DISTINCT TRIM(name)
+    FROM (SELECT HomeTeam AS name FROM {staging} UNION SELECT AwayTeam FROM {staging}) t
+    WHERE name IS NOT NULL
+    ON CONFLICT (name) DO NOTHING;
+    """)
+    season_sql = season_from_date("s.Date")
+    insert_new_seasons(season_sql, staging)
+
+    resolved = {"hometeamid": "home_team.id", "awayteamid": "away_team.id"}
+    cols = list(changed.columns) + ["Season", "SeasonId"]
+    select_cols = [resolved.get(col.lower(), f"s.{col}") for col in changed.columns] + [season_sql, "se.id"]
+    updates = ', '.join(f"{col} = EXCLUDED.{col}" for col in cols if col.lower() != "matchid")
+    cur.execute(f"""
+    INSERT INTO {table_name} ({', '.join(cols)})
+    SELECT {', '.join(select_cols)}
+    FROM {staging} s
+    LEFT JOIN Teams home_team ON home_team.name = s.HomeTeam
+    LEFT JOIN Teams away_team ON away_team.name = s.AwayTeam
+    LEFT JOIN Seasons se ON se.code = {season_sql}
+    ON CONFLICT (MatchID) DO UPDATE SET {updates};
+    """)
+    conn.commit()
+    print(f"✅ {table_name}: {len(changed)} new or changed matches synced, {len(df) - len(changed)} unchanged")
+
+def sync_standings():
+    """Replace standings rows whose (Season, Team) content changed, with SeasonId resolved inline"""
+    df = read_folder_for_pg(STANDINGS_DIR, "Standings", "Season")
+    if df.empty:
+        print(f"❌ No standings files found in {STANDINGS_DIR}")
+        return
+    df["Season"] = df["Season"].map(normalize_season)
+
+    # A (Season, Team) can have several rows (e.g. a mislabelled season file), so each key's
+    # rows are compared and replaced together, leaving the table as a full rebuild would
+    cur.execute("SELECT Season, Team, RowHash FROM Standings;")
+    existing = {}
+    for season, team, row_hash in cur.fetchall():
+        existing.setdefault((season, team), []).append(row_hash)
+    keys = list(zip(df["Season"], df["Team"]))
+    incoming = {}
+    for key, row_hash in zip(keys, df["RowHash"]):
+        incoming.setdefault(key, []).append(int(row_hash))
+    changed_keys = {key for key, hashes in incoming.items() if sorted(hashes) != sorted(existing.get(key, []))}
+    changed = df[[key in changed_keys for key in keys]]
+    if changed.empty:
+        print(f"✅ Standings already up to date ({len(df)} rows)")
+        return
+
+    staging = stage_rows(changed, "Standings")
+    insert_new_seasons("s.Season", staging)
+
+    cols = list(changed.columns)
+    cur.execute(f"""
+    DELETE FROM Standings st
+    USING {staging} s
+    WHERE st.Season = s.Season AND st.Team = s.Team;
+    """)
+    cur.execute(f"""
+    INSERT INTO Standings ({', '.join(cols)}, SeasonId)
+    SELECT {', '.join(f's.{col}' for col in cols)}, se.id
+    FROM {staging} s
+    LEFT JOIN Seasons se ON se.code = s.Season;
+    """)
+    conn.commit()
+    print(f"✅ Standings: {len(changed)} new or changed rows synced, {len(df) - len(changed)} unchanged")
+
+def sync():
+    """Bring the database up to date with the CSVs without dropping anything"""
+    create_tables()
+    for table_name in ["StandardizedMatches", "TeamMatches", "Standings"]:
+        cur.execute(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS RowHash BIGINT;")
+    conn.commit()
+
+    # Matches first: TeamMatches references StandardizedMatches(MatchID)
+    sync_matches(STANDARDIZED_DIR, "StandardizedMatches")
+    sync_matches(TEAMFILES_DIR, "TeamMatches")
+    sync_standings()
+
+
+def main():
+    connect()
+    if "--sync" in sys.argv:
+        sync()
+    else:
+        rebuild()
+    sanity_checks()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+from standings import RANK_ORDER, season_label
+from match_store import read_season_csv
+
+# In-season league table that is updated one result at a time instead of
+# being rebuilt from the season CSV. Each applied match is logged so it can be
+# rolled back and so tables can be rewound to any date.
+
+STANDINGS_DIR = "data/files/Standings"
+
+# Per-team counters kept for every team in the table
+PLAYED, WINS, DRAWS, LOSSES, GOALS_FOR, GOALS_AGAINST = range(6)
+
+
+class LiveLeagueTable:
+    """League table with O(1) result updates, rollback and as-of-date snapshots.
+
+    Teams start from a baseline (an empty table or the totals in a standings
+    file); results applied afterwards are kept in a log keyed by MatchID.
+    Snapshots can rewind logged results but not what is already folded into
+    the baseline.
+    """
+
+    def __init__(self, season, teams=(), team_ids=None):
+        self.season = season
+        self.teams = []
+        self.team_index = {}
+        self.team_ids = dict(team_ids or {})
+        self.id_index = {}  # TeamId -> row, so long and short team names share a row
+        self.baseline = np.zeros((0, 6), dtype=np.int64)
+        self.totals = np.zeros((0, 6), dtype=np.int64)
+        self.results = {}  # MatchID -> (home index, away index, home goals, away goals, date)
+        self._table = None
+        for team in teams:
+            self._team(team)
+
+    @classmethod
+    def from_standings(cls, season_code, standings_dir=STANDINGS_DIR, team_ids=None):
+        """Seed from the saved standings file of a season.
+
+        team_ids (name -> TeamId) lets results use other spellings of the team
+        names in the file, e.g. long names against a file with short names.
+        """
+        season = season_label(season_code)
+        path = os.path.join(standings_dir, f"EPLStandings{season.replace('/', '-')}.csv")
+        standings = pd.read_csv(path)
+
+        file_ids = {team: int(team_id) for team, team_id in zip(standings['Team'], standings['TeamId'])
+                    if pd.notna(team_id)}
+        table = cls(season, standings['Team'], file_ids)
+        table.team_ids = {**(team_ids or {}), **file_ids}
+        table.baseline = standings[['MatchesPlayed', 'Wins', 'Draws', 'Losses', 'GoalsScored',
+                                    'GoalsConceded']].to_numpy(dtype=np.int64)
+        table.totals = table.baseline.copy()
+        return table
+
+    @classmethod
+    def from_matches(cls, season, matches, team_ids=None):
+        """Start from an empty table and apply every match in date order"""
+        if team_ids is None and 'homeTeamID' in matches.columns:
+            team_ids = {}
+            for name_col, id_col in [('HomeTeam', 'homeTeamID'), ('AwayTeam', 'awayTeamID')]:
+                pairs = matches[[name_col, id_col]].dropna().drop_duplicates()
+                team_ids.update({team: int(team_id) for team, team_id in zip(pairs[name_col], pairs[id_col])})
+
+        table = cls(season, team_ids=team_ids)
+        matches = matches.assign(Date=pd.to_datetime(matches['Date'], dayfirst=True))
+        matches = matches.sort_values('Date', kind='stable')
+        for row in matches.itertuples(index=False):
+            table.apply_result(row.MatchID, row.HomeTeam, row.AwayTeam, row.FTHG, row.FTAG, row.Date)
+        return table
+
+    def _team(self, team, team_id=None):
+        """Row index for a team, adding it on first sight"""
+        index = self.team_index.get(team)
+        if index is not None:
+            return index
+
+        team_id = team_id if team_id is not None else self.team_ids.get(team)
+        if team_id is not None and int(team_id) in self.id_index:
+            index = self.id_index[int(team_id)]  # Same club under another name
+        else:
+            index = len(self.teams)
+            self.teams.append(team)
+            if team_id is not None:
+                self.id_index[int(team_id)] = index
+                self.team_ids.setdefault(team, int(team_id))
+            self.baseline = np.vstack([self.baseline, np.zeros((1, 6), dtype=np.int64)])
+            self.totals = np.vstack([self.totals, np.zeros((1, 6), dtype=np.int64)])
+        self.team_index[team] = index
+        return index
+
+    def _add(self, totals, home, away, home_goals, away_goals, sign):
+        """Add (sign=1) or remove (sign=-1) one result from a totals array"""
+        totals[home, PLAYED] += sign
+        totals[away, PLAYED] += sign
+        totals[home, GOALS_FOR] += sign * home_goals
+        totals[home, GOALS_AGAINST] += sign * away_goals
+        totals[away, GOALS_FOR] += sign * away_goals
+        totals[away, GOALS_AGAINST] += sign * home_goals
+        if home_goals > away_goals:
+            totals[home, WINS] += sign
+            totals[away, LOSSES] += sign
+        elif home_goals < away_goals:
+            totals[home, LOSSES] += sign
+            totals[away, WINS] += sign
+        else:
+            totals[home, DRAWS] += sign
+            totals[away, DRAWS] += sign
+
+    def apply_result(self, match_id, home_team, away_team, home_goals, away_goals, date=None,
+                     home_id=None, away_id=None):
+        """Add a result; applying a MatchID again replaces its earlier score"""
+        if match_id in self.results:
+            self.rollback(match_id)
+        home, away = self._team(home_team, home_id), self._team(away_team, away_id)
+        home_goals, away_goals = int(home_goals), int(away_goals)
+        date = pd.Timestamp(date) if date is not None else None
+
+        self._add(self.totals, home, away, home_goals, away_goals, sign=1)
+        self.results[match_id] = (home, away, home_goals, away_goals, date)
+        self._table = None
+
+    def rollback(self, match_id):
+        """Remove a previously applied result"""
+        if match_id not in self.results:
+            raise KeyError(f"Match {match_id} has not been applied")
+        home, away, home_goals, away_goals, _ = self.results.pop(match_id)
+        self._add(self.totals, home, away, home_goals, away_goals, sign=-1)
+        self._table = None
+
+    def _ranked(self, totals):
+        table = pd.DataFrame(totals, columns=['MatchesPlayed', 'Wins', 'Draws', 'Losses',
+                                              'GoalsScored', 'GoalsConceded'])
+        table.insert(0, 'Team', self.teams)
+        table.insert(0, 'TeamId', pd.array([self.team_ids.get(team) for team in self.teams], dtype='Int64'))
+        table['Season'] = self.season
+        table['Points'] = 3 * table['Wins'] + table['Draws']
+        table['GoalDifference'] = table['GoalsScored'] - table['GoalsConceded']
+        table = table.sort_values(RANK_ORDER, ascending=False, kind='stable').reset_index(drop=True)
+        table.insert(1, 'Rank', np.arange(1, len(table) + 1))
+        return table[['TeamId', 'Rank', 'Team', 'Season', 'MatchesPlayed', 'Wins', 'Draws', 'Losses',
+                      'Points', 'GoalsScored', 'GoalsConceded', 'GoalDifference']]
+
+    def table(self):
+        """Current ranked table (cached until the next change)"""
+        if self._table is None:
+            self._table = self._ranked(self.totals)
+        return self._table.copy()
+
+    def as_of(self, date):
+        """Ranked table counting only logged results played on or before date"""
+        date = pd.Timestamp(date)
+        totals = self.baseline.copy()
+        for home, away, home_goals, away_goals, played_on in self.results.values():
+            if played_on is not None and played_on <= date:
+                self._add(totals, home, away, home_goals, away_goals, sign=1)
+        return self._ranked(totals)
+
+
+if __name__ == "__main__":
+    # Usage: python live_table.py <season code> [date]
+    season_code = sys.argv[1] if len(sys.argv) > 1 else "2526"
+    season_file = os.path.join("data/files/StandardizedSeasonMatches", f"EPLS{season_code}.csv")
+    live = LiveLeagueTable.from_matches(season_label(season_code), read_season_csv(season_file))
+    print((live.as_of(sys.argv[2]) if len(sys.argv) > 2 else live.table()).to_string(index=False))
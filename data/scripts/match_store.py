@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Consolidated, typed copy of every StandardizedSeasonMatches/EPLS*.csv file.
+# Each column is saved as its own .npy file so readers can memory-map only the
+# columns they need; strings are stored as small integer codes into shared
+# category lists kept in meta.json.
+
+SOURCE_DIR = Path(__file__).resolve().parent.parent / "files" / "StandardizedSeasonMatches"
+STORE_FORMAT_VERSION = 2
+
+# Columns stored as codes into a shared category list
+CATEGORICAL_COLUMNS = {
+    'HomeTeam': 'teams',
+    'AwayTeam': 'teams',
+    'Referee': 'referees',
+    'FTR': 'results',
+    'HTR': 'results',
+    'Season': 'seasons',
+}
+DATE_COLUMNS = ['Date']
+# Per-match counts (goals, shots, fouls, corners, cards) fit in int8; sums over
+# them are taken by pandas/NumPy in int64, so they cannot overflow
+COUNT_COLUMNS = ['FTHG', 'FTAG', 'HTHG', 'HTAG', 'HS', 'AS', 'HST', 'AST',
+                 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+INTEGER_COLUMNS = {'MatchID': 'int32', 'homeTeamID': 'int16', 'awayTeamID': 'int16',
+                   **{column: 'int8' for column in COUNT_COLUMNS}}
+# Remaining numeric columns (betting odds, and counts with gaps) are stored as float32
+FLOAT_DTYPE = 'float32'
+
+
+def _fits(series, dtype):
+    """Whether every value of a numeric series is a whole number within dtype's range"""
+    info = np.iinfo(dtype)
+    return bool(series.notna().all() and (series % 1 == 0).all()
+                and info.min <= series.min() and series.max() <= info.max)
+
+
+def default_store_dir(source_dir):
+    """The store lives next to the season CSV folder it is built from"""
+    return Path(source_dir).parent / "MatchStore"
+
+
+def source_signatures(source_dir):
+    """Size and modification time of every season file"""
+    return {
+        file.name: [file.stat().st_size, file.stat().st_mtime_ns]
+        for file in sorted(Path(source_dir).glob("EPLS*.csv"))
+    }
+
+
+def _read_meta(store_dir):
+    meta_path = Path(store_dir) / "meta.json"
+    if not meta_path.exists():
+        return None
+    with open(meta_path) as f:
+        return json.load(f)
+
+
+def _encode_categorical(series, categories):
+    """Integer codes for a string column (-1 for missing values)"""
+    codes = pd.Categorical(series, categories=categories).codes
+    return codes.astype(np.int8 if len(categories) < 127 else np.int16)
+
+
+def apply_schema(df):
+    """Cast a frame read from a season CSV to the store's dtypes, in place.
+
+    For files read directly (e.g. a season that still has unplayed fixtures);
+    categoricals get the file's own categories rather than the store's.
+    """
+    for column in df.columns:
+        series = df[column]
+        if column in CATEGORICAL_COLUMNS:
+            df[column] = series.astype('category')
+        elif column in DATE_COLUMNS:
+            df[column] = pd.to_datetime(series, format="%d/%m/%Y", errors='coerce')
+        elif column in INTEGER_COLUMNS and _fits(series, INTEGER_COLUMNS[column]):
+            df[column] = series.astype(INTEGER_COLUMNS[column])
+        elif series.dtype.kind == 'f':
+            df[column] = series.astype(FLOAT_DTYPE)
+    return df
+
+
+def read_season_csv(path):
+    """One season CSV with the store's dtypes"""
+    return apply_schema(pd.read_csv(path))
+
+
+def build_match_store(source_dir=SOURCE_DIR, store_dir=None):
+    """Parse every season CSV once and write the columnar store; returns its metadata"""
+    source_dir = Path(source_dir)
+    store_dir = Path(store_dir) if store_dir else default_store_dir(source_dir)
+
+    season_files = sorted(source_dir.glob("EPLS*.csv"))
+    if not season_files:
+        raise FileNotFoundError(f"No season files found in {source_dir}")
+
+    frames = []
+    seasons = []
+    row_start = 0
+    for file in season_files:
+        df = pd.read_csv(file)
+        season = file.stem.replace("EPLS", "")
+        df['Season'] = season
+        frames.append(df)
+        seasons.append({'season': season, 'file': file.name, 'start': row_start, 'stop': row_start + len(df)})
+        row_start += len(df)
+
+    all_data = pd.concat(frames, ignore_index=True)
+
+    # Shared category lists so HomeTeam/AwayTeam and FTR/HTR codes are comparable
+    categories = {}
+    for column, category_name in CATEGORICAL_COLUMNS.items():
+        if column in all_data.columns:
+            values = set(all_data[column].dropna().astype(str))
+            categories[category_name] = sorted(values | set(categories.get(category_name, [])))
+
+    tmp_dir = store_dir.with_name(store_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    columns = {}
+    for column in all_data.columns:
+        series = all_data[column]
+        if column in CATEGORICAL_COLUMNS:
+            values = _encode_categorical(series.astype(object).where(series.notna(), None),
+                                         categories[CATEGORICAL_COLUMNS[column]])
+            columns[column] = {'kind': 'categorical', 'categories': CATEGORICAL_COLUMNS[column]}
+        elif column in DATE_COLUMNS:
+            values = pd.to_datetime(series, format="%d/%m/%Y", errors='coerce').to_numpy(dtype='datetime64[ns]')
+            columns[column] = {'kind': 'date'}
+        elif column in INTEGER_COLUMNS and _fits(series, INTEGER_COLUMNS[column]):
+            values = series.to_numpy().astype(INTEGER_COLUMNS[column])
+            columns[column] = {'kind': 'numeric'}
+        else:
+            values = series.to_numpy()
+            if values.dtype == object:
+                values = series.astype(str).to_numpy(dtype='U')
+            elif values.dtype.kind == 'f':
+                values = values.astype(FLOAT_DTYPE)
+            columns[column] = {'kind': 'numeric'}
+        np.save(tmp_dir / f"{column}.npy", values)
+
+    meta = {
+        'version': STORE_FORMAT_VERSION,
+        'rows': len(all_data),
+        'columns': columns,
+        'categories': categories,
+        'seasons': seasons,
+        'sources': source_signatures(source_dir),
+    }
+    with open(tmp_dir / "meta.json", "w") as f:
+        json.dump(meta, f, indent=2)
+
+    # Swap the finished store into place
+    old_dir = store_dir.with_name(store_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if store_dir.exists():
+        os.replace(store_dir, old_dir)
+    os.replace(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    # stderr: the store is rebuilt lazily inside commands whose stdout is JSON for Node.js
+    print(f"Built match store at {store_dir}: {meta['rows']} matches from {len(seasons)} seasons", file=sys.stderr)
+    return meta
+
+
+def open_match_store(source_dir=SOURCE_DIR, store_dir=None):
+    """Metadata for an up-to-date store, rebuilding it if the season CSVs changed"""
+    source_dir = Path(source_dir)
+    store_dir = Path(store_dir) if store_dir else default_store_dir(source_dir)
+
+    meta = _read_meta(store_dir)
+    if (meta is None or meta.get('version') != STORE_FORMAT_VERSION
+            or meta['sources'] != source_signatures(source_dir)):
+        meta = build_match_store(source_dir, store_dir)
+    return meta, store_dir
+
+
+def load_matches(columns=None, seasons=None, source_dir=SOURCE_DIR, store_dir=None, mmap=True):
+    """Load matches from the columnar store.
+
+    columns: list of columns to read (all if None); seasons: iterable of season
+    codes such as '2324' (all if None). String columns come back as pandas
+    categoricals, Date as datetime64, match counts as int8 and other numeric
+    columns as float32 (see COUNT_COLUMNS and INTEGER_COLUMNS).
+    """
+    meta, store_dir = open_match_store(source_dir, store_dir)
+
+    if columns is None:
+        columns = list(meta['columns'])
+    missing = [column for column in columns if column not in meta['columns']]
+    if missing:
+        raise KeyError(f"Columns not in match store: {missing}")
+
+    if seasons is None:
+        row_slices = [slice(0, meta['rows'])]
+    else:
+        wanted = set(seasons)
+        row_slices = [slice(s['start'], s['stop']) for s in meta['seasons'] if s['season'] in wanted]
+
+    data = {}
+    for column in columns:
+        values = np.load(store_dir / f"{column}.npy", mmap_mode='r' if mmap else None)
+        if len(row_slices) == 1:
+            values = values[row_slices[0]]
+        else:
+            values = np.concatenate([values[s] for s in row_slices]) if row_slices else values[:0]
+
+        info = meta['columns'][column]
+        if info['kind'] == 'categorical':
+            data[column] = pd.Categorical.from_codes(np.asarray(values), categories=meta['categories'][info['categories']])
+        else:
+            data[column] = np.asarray(values)
+
+    return pd.DataFrame(data)
+
+
+def season_row_counts(source_dir=SOURCE_DIR, store_dir=None):
+    """Number of matches per season code"""
+    meta, _ = open_match_store(source_dir, store_dir)
+    return {s['season']: s['stop'] - s['start'] for s in meta['seasons']}
+
+
+if __name__ == "__main__":
+    build_match_store()
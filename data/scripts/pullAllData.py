@@ -1,6 +1,14 @@
 import os
+import io
+import json
 import pandas as pd
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from match_store import load_matches, read_season_csv
+from standings import build_standings, write_standings, season_label
+from season_manifest import load_manifest, record_season, refresh_manifest, is_current
 
 # Directories
 DATA_DIR = "data/files/StandardizedSeasonMatches"
@@ -10,6 +18,14 @@ os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(TEAM_FILES_DIR, exist_ok=True)
 os.makedirs(STANDINGS_DIR, exist_ok=True)
 
+# Download settings (point FOOTBALL_DATA_BASE_URL at a local server to test without the network)
+BASE_URL = os.environ.get("FOOTBALL_DATA_BASE_URL", "https://www.football-data.co.uk/mmz4281")
+MAX_DOWNLOAD_WORKERS = 6
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT = 30
+# ETag / Last-Modified of each season's last processed download
+DOWNLOAD_CACHE_PATH = "data/files/download_cache.json"
+
 # Columns to keep
 columns_to_keep = [
     'homeTeamID', 'awayTeamID', 'MatchID', 'Date', 'HomeTeam', 'AwayTeam',
@@ -73,80 +89,138 @@ team_data_map = {
 short_to_team_id = {info["short_name"]: team_id for team_id, info in team_data_map.items()}
 long_to_team_id = {info["long_name"]: team_id for team_id, info in team_data_map.items()}
 short_to_long_name = {info["short_name"]: info["long_name"] for info in team_data_map.values()}
-def download_and_process_season(season_code, season_name):
+def create_session(max_workers=MAX_DOWNLOAD_WORKERS):
+    """HTTP session with pooled connections and retries with exponential backoff."""
+    retry = Retry(
+        total=DOWNLOAD_RETRIES,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=max_workers, pool_maxsize=max_workers)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def load_download_cache():
+    """Load saved ETag / Last-Modified validators per season code."""
+    if not os.path.exists(DOWNLOAD_CACHE_PATH):
+        return {}
+    with open(DOWNLOAD_CACHE_PATH) as f:
+        return json.load(f)
+
+
+def save_download_cache(cache):
+    """Write the validators cache atomically."""
+    tmp_path = DOWNLOAD_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, DOWNLOAD_CACHE_PATH)
+
+
+def fetch_season(session, season_code, validators=None):
+    """Download a season's raw CSV; returns (HTTP status, content, validators).
+
+    With validators from a previous download the request is conditional and an
+    unchanged season comes back as 304 with no content.
+    """
+    url = f"{BASE_URL}/{season_code}/E0.csv"
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+    new_validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return response.status_code, response.content, new_validators
+
+
+def download_and_process_season(season_code, season_name, session=None):
     """Download and process a single season's data."""
+    try:
+        status, content, _ = fetch_season(session or create_session(1), season_code)
+    except requests.RequestException as e:
+        print(f"Failed to download data for season {season_name}: {e}")
+        return
+
+    if status == 200:
+        process_season(content, season_name)
+    else:
+        print(f"Failed to download data for season {season_name} (HTTP {status})")
+
+
+def process_season(content, season_name):
+    """Clean a downloaded season CSV, assign MatchIDs and save it; returns the row count or None."""
     global match_id_counter
-    url = f"https://www.football-data.co.uk/mmz4281/{season_code}/E0.csv"
-    response = requests.get(url)
-    
-    if response.status_code == 200:
-        # Save the raw CSV file
-        raw_file_path = os.path.join(DATA_DIR, f"{season_name}.csv")
-        with open(raw_file_path, "wb") as file:
-            file.write(response.content)
-        
-        # Load the CSV into a DataFrame
-        try:
-            df = pd.read_csv(raw_file_path)
-        except Exception as e:
-            print(f"Error reading file {raw_file_path}: {e}")
-            return
-        
-        expected_columns = [
-            'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR',
-            'Referee', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR',
-            'B365H', 'B365D', 'B365A'
-        ]
-        missing_columns = [col for col in expected_columns if col not in df.columns]
-        extra_columns = [col for col in df.columns if col not in expected_columns]
-
-        if missing_columns:
-            print(f"File {raw_file_path} is missing required columns: {missing_columns}. Skipping...")
-            return
-        
-        if extra_columns:
-            print(f"File {raw_file_path} has extra columns: {extra_columns}. These will be ignored.")
-            df = df[expected_columns]  # Keep only the expected columns
+    raw_file_path = os.path.join(DATA_DIR, f"{season_name}.csv")
 
-        if df.isnull().any(axis=1).sum() > 0:
-            print(f"Warning: {df.isnull().any(axis=1).sum()} rows with empty columns found in {raw_file_path}. These rows will be removed.")
-            df = df.dropna()
+    # Load the CSV into a DataFrame
+    try:
+        df = pd.read_csv(io.BytesIO(content))
+    except Exception as e:
+        print(f"Error reading file {raw_file_path}: {e}")
+        return None
 
+    expected_columns = [
+        'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR',
+        'Referee', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR',
+        'B365H', 'B365D', 'B365A'
+    ]
+    missing_columns = [col for col in expected_columns if col not in df.columns]
+    extra_columns = [col for col in df.columns if col not in expected_columns]
 
-        # Format the Date column to dd/mm/yyyy
-        try:
-            df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce').dt.strftime('%d/%m/%Y')
-        except Exception as e:
-            print(f"Error formatting dates in file {raw_file_path}: {e}")
-            return
-        # Replace short team names with long names
-        df['HomeTeam'] = df['HomeTeam'].map(short_to_long_name).fillna(df['HomeTeam'])
-        df['AwayTeam'] = df['AwayTeam'].map(short_to_long_name).fillna(df['AwayTeam'])
+    if missing_columns:
+        print(f"File {raw_file_path} is missing required columns: {missing_columns}. Skipping...")
+        return None
 
-        # Map team names to unique IDs
-        df['homeTeamID'] = df['HomeTeam'].map(long_to_team_id)
-        df['awayTeamID'] = df['AwayTeam'].map(long_to_team_id)
+    if extra_columns:
+        print(f"File {raw_file_path} has extra columns: {extra_columns}. These will be ignored.")
+        df = df[expected_columns]  # Keep only the expected columns
 
-        # Assign unique match IDs
-        df['MatchID'] = range(match_id_counter, match_id_counter + len(df))
-        match_id_counter += len(df)
-        
-        # Reorder columns to place IDs first
-        id_columns = ['MatchID', 'homeTeamID', 'awayTeamID']
-        other_columns = [col for col in df.columns if col not in id_columns]
-        df = df[id_columns + other_columns]
-
-        # Save the processed file
-        processed_file_path = os.path.join(DATA_DIR, f"{season_name}.csv")
-        df.to_csv(processed_file_path, index=False)
-        print(f"Processed and saved: {processed_file_path}")
-    else:
-        print(f"Failed to download data for season {season_name} (HTTP {response.status_code})")
-        
-        
+    if df.isnull().any(axis=1).sum() > 0:
+        print(f"Warning: {df.isnull().any(axis=1).sum()} rows with empty columns found in {raw_file_path}. These rows will be removed.")
+        df = df.dropna()
 
-        
-def pullalldata():
+
+    # Format the Date column to dd/mm/yyyy
+    try:
+        df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce').dt.strftime('%d/%m/%Y')
+    except Exception as e:
+        print(f"Error formatting dates in file {raw_file_path}: {e}")
+        return None
+    # Replace short team names with long names
+    df['HomeTeam'] = df['HomeTeam'].map(short_to_long_name).fillna(df['HomeTeam'])
+    df['AwayTeam'] = df['AwayTeam'].map(short_to_long_name).fillna(df['AwayTeam'])
+
+    # Map team names to unique IDs
+    df['homeTeamID'] = df['HomeTeam'].map(long_to_team_id)
+    df['awayTeamID'] = df['AwayTeam'].map(long_to_team_id)
+
+    # Assign unique match IDs
+    df['MatchID'] = range(match_id_counter, match_id_counter + len(df))
+    match_id_counter += len(df)
+
+    # Reorder columns to place IDs first
+    id_columns = ['MatchID', 'homeTeamID', 'awayTeamID']
+    other_columns = [col for col in df.columns if col not in id_columns]
+    df = df[id_columns + other_columns]
+
+    # Save the processed file
+    processed_file_path = os.path.join(DATA_DIR, f"{season_name}.csv")
+    df.to_csv(processed_file_path, index=False)
+    record_season(DATA_DIR, f"{season_name}.csv", df['MatchID'])
+    print(f"Processed and saved: {processed_file_path}")
+    return len(df)
+
+
+def pullalldata(max_workers=MAX_DOWNLOAD_WORKERS):
     """Download and process data for all seasons from 2005-06 to 2025-26."""
     # Generate season codes in ascending order (oldest to newest)
     season_codes = [
@@ -156,9 +230,69 @@ def pullalldata():
         "2021", "2122", "2223", "2324", "2425", "2526"
     ]    
     print(f"Season codes to process: {season_codes}")
-    for season_code in season_codes:
+    global match_id_counter
+
+    # Fetch every season concurrently; unchanged seasons answer 304 to the conditional request
+    cache = load_download_cache()
+    session = create_session(max_workers)
+
+    def fetch(season_code):
+        season_file = os.path.join(DATA_DIR, f"EPLS{season_code}.csv")
+        validators = cache.get(season_code) if os.path.exists(season_file) else None
+        try:
+            return fetch_season(session, season_code, validators)
+        except requests.RequestException as e:
+            return None, str(e), None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        responses = list(executor.map(fetch, season_codes))
+
+    # Process in season order so MatchIDs are assigned deterministically
+    match_id_counter = 1
+    for season_code, (status, content, validators) in zip(season_codes, responses):
         season_name = f"EPLS{season_code}"
-        download_and_process_season(season_code, season_name)
+        if status == 200 and process_season(content, season_name) is not None:
+            cache[season_code] = validators
+            continue
+
+        # Any season not freshly processed keeps its existing file, which must still advance
+        # the counter or later seasons would reuse its MatchIDs
+        if status == 200:
+            print(f"Could not process the download for {season_name}; keeping the existing file.")
+        elif status == 304:
+            print(f"{season_name} unchanged since last download.")
+        elif status is None:
+            print(f"Failed to download data for season {season_name}: {content}")
+        else:
+            print(f"Failed to download data for season {season_name} (HTTP {status})")
+        keep_existing_season(season_name)
+
+    save_download_cache(cache)
+
+
+def keep_existing_season(season_name):
+    """Carry an already processed season forward, renumbering it if earlier seasons changed size."""
+    global match_id_counter
+    season_file = os.path.join(DATA_DIR, f"{season_name}.csv")
+    if not os.path.exists(season_file):
+        return
+
+    # The manifest answers the common case (already numbered from the counter) without reading the file
+    entry = load_manifest(DATA_DIR)['seasons'].get(f"{season_name}.csv")
+    if (is_current(entry, season_file) and entry['rows']
+            and entry['min_match_id'] == match_id_counter
+            and entry['max_match_id'] == match_id_counter + entry['rows'] - 1):
+        match_id_counter += entry['rows']
+        return
+
+    df = pd.read_csv(season_file)
+    expected_ids = range(match_id_counter, match_id_counter + len(df))
+    if not df['MatchID'].equals(pd.Series(expected_ids, index=df.index)):
+        df['MatchID'] = expected_ids
+        df.to_csv(season_file, index=False)
+        print(f"Renumbered MatchIDs in {season_file}")
+    record_season(DATA_DIR, f"{season_name}.csv", df['MatchID'])
+    match_id_counter += len(df)
 
 
 def pullrecentdata(season_code):
@@ -166,28 +300,14 @@ def pullrecentdata(season_code):
     global match_id_counter
 
     try:
-        # Load existing data to get the current match ID count
-        all_files = [os.path.join(DATA_DIR, f) for f in os.listdir(DATA_DIR) if f.endswith(".csv")]
-        if all_files:
-            all_data_frames = []
-            for file in all_files:
-                try:
-                    df = pd.read_csv(file)
-                    all_data_frames.append(df)
-                except Exception as e:
-                    print(f"Error reading file {file}: {e}")
-                    continue
-
-            if all_data_frames:
-                all_data = pd.concat(all_data_frames, ignore_index=True)
-                if 'MatchID' in all_data.columns:
-                    match_id_counter = all_data['MatchID'].max() + 1  # Set counter to the next available MatchID
-                else:
-                    print("Warning: 'MatchID' column not found in existing data. Starting from 1.")
-                    match_id_counter = 1
-            else:
-                print("No valid data found in existing files. Starting from MatchID 1.")
-                match_id_counter = 1
+        # The manifest's high-water mark gives the next MatchID; only season files
+        # changed since it was last written are read
+        manifest = refresh_manifest(DATA_DIR)
+        if manifest['seasons'] and manifest['max_match_id'] > 0:
+            match_id_counter = manifest['max_match_id'] + 1  # Set counter to the next available MatchID
+        elif manifest['seasons']:
+            print("No valid data found in existing files. Starting from MatchID 1.")
+            match_id_counter = 1
         else:
             print("No existing data files found. Starting from MatchID 1.")
             match_id_counter = 1
@@ -201,23 +321,19 @@ def pullrecentdata(season_code):
         
 def savealltimematches():
     """Save all-time matches for each team."""
-    all_files = [os.path.join(DATA_DIR, f) for f in os.listdir(DATA_DIR) if f.endswith(".csv")]
-    all_data_frames = []
-    for f in all_files:
-        try:
-            print(f"Reading file: {f}")
-            df = pd.read_csv(f)
-            all_data_frames.append(df)
-        except Exception as e:
-            print(f"Error reading file {f}: {e}")
-            continue
+    try:
+        all_data = load_matches(columns=columns_to_keep, source_dir=DATA_DIR)
+    except Exception as e:
+        print(f"Error reading match store: {e}")
+        return
 
-    if not all_data_frames:
+    if all_data.empty:
         print("No valid data found.")
         return
 
-    all_data = pd.concat(all_data_frames, ignore_index=True)
-    
+    # Write dates back in the dd/mm/yyyy format of the season files
+    all_data['Date'] = all_data['Date'].dt.strftime('%d/%m/%Y')
+
     for team_id, team_info in team_data_map.items():
         team = team_info["long_name"]
         team_matches = all_data[(all_data['HomeTeam'] == team) | (all_data['AwayTeam'] == team)]
@@ -231,88 +347,22 @@ def savealltimematches():
 
 def createyearlystandings():
     """Create yearly standings with per-game and total stats."""
-    all_files = [os.path.join(DATA_DIR, f) for f in os.listdir(DATA_DIR) if f.endswith(".csv")]
-    all_data_frames = []
-
-    for f in all_files:
-        try:
-            print(f"Reading file: {f}")
-            df = pd.read_csv(f)
-
-            # Extract the season from the file name (e.g., "EPLS0708.csv" -> "2007/08")
-            season_code = os.path.basename(f).split('.')[0]  # Get the file name without extension
-            season = f"20{season_code[-4:-2]}/20{season_code[-2:]}"  # Convert "0708" to "2007/08"
-
-            # Add the Season column
-            df['Season'] = season
-
-            all_data_frames.append(df)
-        except Exception as e:
-            print(f"Error reading file {f}: {e}")
-            continue
+    try:
+        all_data = load_matches(source_dir=DATA_DIR)
+    except Exception as e:
+        print(f"Error reading match store: {e}")
+        return
 
-    if not all_data_frames:
+    if all_data.empty:
         print("No valid data found.")
         return
 
-    all_data = pd.concat(all_data_frames, ignore_index=True)
-
-    # Map points for home and away matches
-    all_data['PointsHome'] = all_data['FTR'].map({'H': 3, 'D': 1, 'A': 0})
-    all_data['PointsAway'] = all_data['FTR'].map({'H': 0, 'D': 1, 'A': 3})
-
-    standings = []
-    for season in all_data['Season'].unique():
-        season_data = all_data[all_data['Season'] == season]
-        season_teams = pd.concat([season_data['HomeTeam'], season_data['AwayTeam']]).dropna().unique()
-        season_teams = [str(team) for team in season_teams]  # Ensure all team names are strings
-        teams_stats = []
-
-        for team in season_teams:
-            home_matches = season_data[season_data['HomeTeam'] == team]
-            away_matches = season_data[season_data['AwayTeam'] == team]
-
-            stats = {
-                'TeamId': next((team_id for team_id, info in team_data_map.items() if info["long_name"] == team), None),
-                'Team': team,
-                'Season': season,
-                'MatchesPlayed': len(home_matches) + len(away_matches),
-                'Wins': len(home_matches[home_matches['FTR'] == 'H']) + len(away_matches[away_matches['FTR'] == 'A']),
-                'Draws': len(home_matches[home_matches['FTR'] == 'D']) + len(away_matches[away_matches['FTR'] == 'D']),
-                'Losses': len(home_matches[home_matches['FTR'] == 'A']) + len(away_matches[away_matches['FTR'] == 'H']),
-                'Points': home_matches['PointsHome'].sum() + away_matches['PointsAway'].sum(),
-                'GoalsScored': home_matches['FTHG'].sum() + away_matches['FTAG'].sum(),  # Add this line
-                'GoalsConceded': home_matches['FTAG'].sum() + away_matches['FTHG'].sum(),  # Add this line
-                'GoalDifference': (home_matches['FTHG'].sum() + away_matches['FTAG'].sum()) -
-                                  (home_matches['FTAG'].sum() + away_matches['FTHG'].sum()),  # Add this line
-            }
-
-            # Add per-game and total stats for the requested columns
-            for col in ['HS', 'AS', 'HST', 'AST', 'HC', 'AC', 'HF', 'AF', 'HY', 'AY', 'HR', 'AR']:
-                stats[f"Total{col}"] = home_matches[col].sum() + away_matches[col].sum()
-                stats[f"PerGame{col}"] = stats[f"Total{col}"] / stats['MatchesPlayed'] if stats['MatchesPlayed'] > 0 else 0
-
-            teams_stats.append(stats)
-
-        standings_df = pd.DataFrame(teams_stats)
-
-        # Skip empty DataFrames
-        if standings_df.empty:
-            print(f"Debug: No data found for season {season}")
-            continue
-        # Add Rank column based on Points (higher points = lower rank)
-        standings_df = standings_df.sort_values(by='Points', ascending=False).reset_index(drop=True)
-        standings_df['Rank'] = standings_df.index + 1
-
-        # Reorder columns to place TeamId and Rank as the first columns
-        columns_order = ['TeamId', 'Rank'] + [col for col in standings_df.columns if col not in ['TeamId', 'Rank']]
-        standings_df = standings_df[columns_order]
+    # Convert the season code to a label (e.g., "0708" -> "2007/2008")
+    all_data['Season'] = all_data['Season'].astype(str).map(season_label)
 
-        standings_df = standings_df.sort_values(by='Points', ascending=False).reset_index(drop=True)
-        standings_path = os.path.join(STANDINGS_DIR, f"EPLStandings{season.replace('/', '-')}.csv")
-        standings_df.to_csv(standings_path, index=False)
-        print(f"Standings for season {season} saved to {standings_path}")
-        standings.append(standings_df)
+    standings = build_standings(all_data, long_to_team_id)
+    for standings_path in write_standings(standings, STANDINGS_DIR):
+        print(f"Standings saved to {standings_path}")
 
 def createfinaldataset():
     """Create the final dataset with all relevant stats, including rank, relegations, and titles."""
@@ -393,66 +443,21 @@ def updateyearlystandings(season_code):
             return
 
         print(f"Updating standings for season {season_code} using file {season_file}")
-        df = pd.read_csv(season_file)
-
-        # Extract the season (e.g., "0708" -> "2007/08")
-        season = f"20{season_code[:2]}/20{season_code[2:]}"
-
-        # Map points for home and away matches
-        df['PointsHome'] = df['FTR'].map({'H': 3, 'D': 1, 'A': 0})
-        df['PointsAway'] = df['FTR'].map({'H': 0, 'D': 1, 'A': 3})
-
-        # Calculate standings for the season
-        season_teams = pd.concat([df['HomeTeam'], df['AwayTeam']]).dropna().unique()
-        season_teams = [str(team) for team in season_teams]  # Ensure all team names are strings
-        teams_stats = []
-
-        for team in season_teams:
-            home_matches = df[df['HomeTeam'] == team]
-            away_matches = df[df['AwayTeam'] == team]
-
-            stats = {
-                'TeamId': next((team_id for team_id, info in team_data_map.items() if info["long_name"] == team), None),
-                'Team': team,
-                'Season': season,
-                'MatchesPlayed': len(home_matches) + len(away_matches),
-                'Wins': len(home_matches[home_matches['FTR'] == 'H']) + len(away_matches[away_matches['FTR'] == 'A']),
-                'Draws': len(home_matches[home_matches['FTR'] == 'D']) + len(away_matches[away_matches['FTR'] == 'D']),
-                'Losses': len(home_matches[home_matches['FTR'] == 'A']) + len(away_matches[away_matches['FTR'] == 'H']),
-                'Points': home_matches['PointsHome'].sum() + away_matches['PointsAway'].sum(),
-                'GoalsScored': home_matches['FTHG'].sum() + away_matches['FTAG'].sum(),
-                'GoalsConceded': home_matches['FTAG'].sum() + away_matches['FTHG'].sum(),
-                'GoalDifference': (home_matches['FTHG'].sum() + away_matches['FTAG'].sum()) -
-                                  (home_matches['FTAG'].sum() + away_matches['FTHG'].sum()),
-            }
-
-            # Add per-game and total stats for the requested columns
-            for col in ['HS', 'AS', 'HST', 'AST', 'HC', 'AC', 'HF', 'AF', 'HY', 'AY', 'HR', 'AR']:
-                stats[f"Total{col}"] = home_matches[col].sum() + away_matches[col].sum()
-                stats[f"PerGame{col}"] = stats[f"Total{col}"] / stats['MatchesPlayed'] if stats['MatchesPlayed'] > 0 else 0
-
-            teams_stats.append(stats)
-
-        standings_df = pd.DataFrame(teams_stats)
-
-        # Skip empty DataFrames
+        df = read_season_csv(season_file)
+
+        # Extract the season (e.g., "0708" -> "2007/2008")
+        df['Season'] = season_label(season_code)
+
+        standings_df = build_standings(df, long_to_team_id)
         if standings_df.empty:
-            print(f"No data found for season {season}")
+            print(f"No data found for season {season_label(season_code)}")
             return
 
-        # Add Rank column based on Points (higher points = lower rank)
-        standings_df = standings_df.sort_values(by='Points', ascending=False).reset_index(drop=True)
-        standings_df['Rank'] = standings_df.index + 1
-
-        # Reorder columns to place TeamId and Rank as the first columns
-        columns_order = ['TeamId', 'Rank'] + [col for col in standings_df.columns if col not in ['TeamId', 'Rank']]
-        standings_df = standings_df[columns_order]
-        
-        standings_df = standings_df.sort_values(by='Points', ascending=False).reset_index(drop=True)
-        standings_path = os.path.join(STANDINGS_DIR, f"EPLStandings{season.replace('/', '-')}.csv")
-        standings_df.to_csv(standings_path, index=False)
-        print(f"Standings for season {season} saved to {standings_path}")
+        for standings_path in write_standings(standings_df, STANDINGS_DIR):
+            print(f"Standings for season {season_label(season_code)} saved to {standings_path}")
     except Exception as e:
         print(f"Error updating yearly standings for season {season_code}: {e}")
-        
-pullalldata()
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    pullalldata()
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from pathlib import Path
+
+# Small JSON summary of the season files in StandardizedSeasonMatches: row
+# count, MatchID range, size/mtime and a SHA-256 checksum per file plus the
+# overall max MatchID. Scripts use it to find the next MatchID and to skip
+# season files they have already processed, without reading every CSV.
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def manifest_path(data_dir):
+    return Path(data_dir) / MANIFEST_NAME
+
+
+def file_checksum(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _empty_manifest():
+    return {'version': MANIFEST_VERSION, 'max_match_id': 0, 'seasons': {}}
+
+
+def load_manifest(data_dir):
+    """The saved manifest as-is (empty if missing or from another version)"""
+    path = manifest_path(data_dir)
+    if not path.exists():
+        return _empty_manifest()
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return _empty_manifest()
+    if manifest.get('version') != MANIFEST_VERSION:
+        return _empty_manifest()
+    return manifest
+
+
+def save_manifest(data_dir, manifest):
+    """Write the manifest atomically (temp file + rename)"""
+    manifest['max_match_id'] = max(
+        (entry['max_match_id'] for entry in manifest['seasons'].values() if entry['rows']), default=0
+    )
+    path = manifest_path(data_dir)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _season_entry(path, match_ids):
+    stat = os.stat(path)
+    match_ids = pd.Series(match_ids).dropna()
+    return {
+        'rows': int(len(match_ids)),
+        'min_match_id': int(match_ids.min()) if len(match_ids) else None,
+        'max_match_id': int(match_ids.max()) if len(match_ids) else None,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_checksum(path),
+    }
+
+
+def is_current(entry, path):
+    """Whether a manifest entry still describes the file on disk (size and mtime)"""
+    if entry is None or not os.path.exists(path):
+        return False
+    stat = os.stat(path)
+    return entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+
+
+def record_season(data_dir, file_name, match_ids):
+    """Update the entry for a season file that was just written"""
+    manifest = load_manifest(data_dir)
+    manifest['seasons'][file_name] = _season_entry(Path(data_dir) / file_name, match_ids)
+    save_manifest(data_dir, manifest)
+    return manifest
+
+
+def refresh_manifest(data_dir):
+    """Bring the manifest up to date; only season files whose size or mtime changed are read"""
+    manifest = load_manifest(data_dir)
+    seasons = manifest['seasons']
+    changed = False
+
+    files = {file.name: file for file in sorted(Path(data_dir).glob("EPLS*.csv"))}
+    for name in list(seasons):
+        if name not in files:
+            del seasons[name]
+            changed = True
+
+    for name, file in files.items():
+        if is_current(seasons.get(name), file):
+            continue
+        match_ids = pd.read_csv(file, usecols=['MatchID'])['MatchID']
+        seasons[name] = _season_entry(file, match_ids)
+        changed = True
+
+    if changed or not manifest_path(data_dir).exists():
+        save_manifest(data_dir, manifest)
+    return manifest
+
+
+def next_match_id(data_dir):
+    """First unused MatchID across all season files"""
+    return refresh_manifest(data_dir)['max_match_id'] + 1
+
+
+def changed_files(data_dir, seen_checksums):
+    """Season files whose checksum differs from seen_checksums (file name -> sha256)"""
+    manifest = refresh_manifest(data_dir)
+    return [
+        name for name, entry in manifest['seasons'].items()
+        if seen_checksums.get(name) != entry['sha256']
+    ]
+
+
+if __name__ == "__main__":
+    manifest = refresh_manifest(Path(__file__).resolve().parent.parent / "files" / "StandardizedSeasonMatches")
+    print(f"{len(manifest['seasons'])} season files, max MatchID {manifest['max_match_id']}")
@@ -0,0 +1,82 @@
+import os
+import pandas as pd
+
+# League tables for any number of seasons in one vectorized pass: every match
+# is split into a home row and an away row, and all aggregates come from a
+# single groupby over (Season, Team).
+
+STAT_COLUMNS = ['HS', 'AS', 'HST', 'AST', 'HC', 'AC', 'HF', 'AF', 'HY', 'AY', 'HR', 'AR']
+RANK_ORDER = ['Points', 'GoalDifference', 'GoalsScored']
+
+
+def season_label(season_code):
+    """'0708' -> '2007/2008'"""
+    return f"20{season_code[:2]}/20{season_code[2:]}"
+
+
+def team_rows(matches):
+    """One row per team per match, from that team's point of view"""
+    ftr = matches['FTR'].astype(object)
+    sides = []
+    for team_col, goals_for, goals_against, win, loss in [
+        ('HomeTeam', 'FTHG', 'FTAG', 'H', 'A'),
+        ('AwayTeam', 'FTAG', 'FTHG', 'A', 'H'),
+    ]:
+        side = pd.DataFrame({
+            'Season': matches['Season'].astype(object),
+            'Team': matches[team_col].astype(object),
+            'Wins': (ftr == win).astype(int),
+            'Draws': (ftr == 'D').astype(int),
+            'Losses': (ftr == loss).astype(int),
+            'Points': ftr.map({win: 3, 'D': 1, loss: 0}),
+            'GoalsScored': matches[goals_for],
+            'GoalsConceded': matches[goals_against],
+        })
+        # Stat totals count the raw match columns for every game a team played in
+        for col in STAT_COLUMNS:
+            side[col] = matches[col]
+        sides.append(side)
+
+    rows = pd.concat(sides, ignore_index=True)
+    return rows[rows['Team'].notna()]
+
+
+def build_standings(matches, team_ids=None):
+    """Standings for every season in matches.
+
+    matches needs Season, HomeTeam, AwayTeam, FTR, FTHG, FTAG and the
+    STAT_COLUMNS; team_ids maps team name -> TeamId. Teams are ranked by
+    points, then goal difference, then goals scored.
+    """
+    rows = team_rows(matches)
+    grouped = rows.groupby(['Season', 'Team'], sort=False)
+    standings = grouped.sum(min_count=0)
+    standings.insert(0, 'MatchesPlayed', grouped.size())
+    standings = standings.reset_index()
+
+    standings['GoalDifference'] = standings['GoalsScored'] - standings['GoalsConceded']
+    for col in STAT_COLUMNS:
+        total = standings.pop(col)
+        standings[f"Total{col}"] = total
+        standings[f"PerGame{col}"] = total / standings['MatchesPlayed']
+
+    standings['TeamId'] = standings['Team'].map(team_ids or {})
+    standings = standings.sort_values(
+        ['Season'] + RANK_ORDER, ascending=[True] + [False] * len(RANK_ORDER), kind='stable'
+    ).reset_index(drop=True)
+    standings['Rank'] = standings.groupby('Season', sort=False).cumcount() + 1
+
+    columns = ['TeamId', 'Rank', 'Team', 'Season', 'MatchesPlayed', 'Wins', 'Draws', 'Losses', 'Points',
+               'GoalsScored', 'GoalsConceded', 'GoalDifference']
+    columns += [f"{kind}{col}" for col in STAT_COLUMNS for kind in ('Total', 'PerGame')]
+    return standings[columns]
+
+
+def write_standings(standings, standings_dir):
+    """Save one EPLStandings<season>.csv per season; returns the written paths"""
+    paths = []
+    for season, table in standings.groupby('Season', sort=False):
+        path = os.path.join(standings_dir, f"EPLStandings{season.replace('/', '-')}.csv")
+        table.to_csv(path, index=False)
+        paths.append(path)
+    return paths
@@ -0,0 +1,275 @@
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from match_store import load_matches, SOURCE_DIR
+
+# Synthetic season files for scale testing. Each league is a fixed set of
+# teams with latent attack/defence strengths that drift between seasons;
+# every season is a double round robin. Goals are Poisson draws from those
+# strengths, and shots, cards, corners, fouls and odds follow distributions
+# fitted from the bundled EPL seasons. Output files have the same layout as
+# the EPLS*.csv files written by pullAllData.py.
+
+# Column order of the season files (columns_to_keep in pullAllData.py, MatchID first)
+COLUMNS = [
+    'MatchID', 'homeTeamID', 'awayTeamID', 'Date', 'HomeTeam', 'AwayTeam',
+    'FTHG', 'FTAG', 'FTR', 'HTHG', 'HTAG', 'HTR', 'Referee', 'HS', 'AS',
+    'HST', 'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR', 'B365H',
+    'B365D', 'B365A'
+]
+# Per-side counts drawn from a (negative) binomial fitted to the bundled data
+COUNT_COLUMNS = ['HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+STRENGTH_PERSISTENCE = 0.9  # Correlation of a team's log attack/defence between seasons
+REFEREES_PER_LEAGUE = 20
+MATCHES_PER_ROUND_DAYS = 7
+MAX_GOALS = 10
+
+
+def fit_match_model(source_dir=SOURCE_DIR):
+    """Distribution parameters estimated from the played matches in source_dir"""
+    matches = load_matches(source_dir=source_dir).dropna(subset=['FTHG', 'FTAG'])
+    model = {
+        'home_goals': float(matches['FTHG'].mean()),
+        'away_goals': float(matches['FTAG'].mean()),
+        'half_time_share': float((matches['HTHG'].sum() + matches['HTAG'].sum())
+                                 / (matches['FTHG'].sum() + matches['FTAG'].sum())),
+        'odds_margin': float((1 / matches['B365H'] + 1 / matches['B365D'] + 1 / matches['B365A']).mean() - 1),
+    }
+
+    # Spread of team strength: variance of log goal rates per team-season,
+    # less the part explained by Poisson noise over a season of games
+    seasons = matches['Season'].astype(object)
+    log_rates = {}
+    for side, home_goals, away_goals in [('attack', 'FTHG', 'FTAG'), ('defence', 'FTAG', 'FTHG')]:
+        rows = pd.concat([
+            pd.DataFrame({'Season': seasons, 'Team': matches['HomeTeam'].astype(object),
+                          'Goals': matches[home_goals]}),
+            pd.DataFrame({'Season': seasons, 'Team': matches['AwayTeam'].astype(object),
+                          'Goals': matches[away_goals]}),
+        ])
+        per_team = rows.groupby(['Season', 'Team'])['Goals'].agg(['mean', 'size'])
+        per_team = per_team[(per_team['size'] >= 10) & (per_team['mean'] > 0)]
+        noise = (1 / (per_team['mean'] * per_team['size'])).mean()
+        model[f'{side}_sd'] = float(np.sqrt(max(np.log(per_team['mean']).var() - noise, 0.0)))
+        log_rates[side] = np.log(per_team['mean'])
+    # Good attacks and good defences go together (defence strength = lower conceding rate)
+    model['strength_corr'] = float(log_rates['attack'].corr(-log_rates['defence']))
+
+    # Shots beyond goals, and how many of those extra shots are on target
+    for side, shots, on_target, goals in [('home', 'HS', 'HST', 'FTHG'), ('away', 'AS', 'AST', 'FTAG')]:
+        extra = matches[shots] - matches[goals]
+        model[f'{side}_extra_shots'] = _count_params(extra.clip(lower=0))
+        model[f'{side}_on_target_share'] = float(
+            (matches[on_target] - matches[goals]).clip(lower=0).sum() / extra.clip(lower=0).sum())
+
+    for col in COUNT_COLUMNS:
+        model[col] = _count_params(matches[col])
+    return model
+
+
+def _count_params(values):
+    """Mean and variance of a count column"""
+    values = pd.Series(values).dropna()
+    return {'mean': float(values.mean()), 'var': float(values.var())}
+
+
+def _draw_counts(rng, params, size, scale=1.0):
+    """Negative binomial draws with the fitted mean (times scale) and dispersion; Poisson if not overdispersed"""
+    mean = params['mean'] * np.asarray(scale, dtype=float)
+    ratio = params['var'] / params['mean'] if params['mean'] else 1.0
+    if ratio <= 1:
+        return rng.poisson(mean, size)
+    # Keep the fitted variance/mean ratio when the mean is rescaled
+    n = mean / (ratio - 1)
+    return rng.negative_binomial(n, 1 / ratio, size)
+
+
+def _draw_strengths(rng, model, n_teams, scale=1.0):
+    """Correlated (attack, defence) log strengths with the fitted spread times scale"""
+    corr = model['strength_corr']
+    attack = rng.standard_normal(n_teams)
+    defence = corr * attack + np.sqrt(1 - corr ** 2) * rng.standard_normal(n_teams)
+    return attack * model['attack_sd'] * scale, defence * model['defence_sd'] * scale
+
+
+def round_robin(n_teams):
+    """Double round robin as a list of rounds of (home, away) index pairs (circle method)"""
+    teams = list(range(n_teams)) + ([None] if n_teams % 2 else [])
+    rounds = []
+    for r in range(len(teams) - 1):
+        pairs = []
+        for i in range(len(teams) // 2):
+            home, away = teams[i], teams[-1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if (r + i) % 2 == 0 else (away, home))
+        rounds.append(pairs)
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def outcome_probabilities(home_rate, away_rate):
+    """(home win, draw, away win) probabilities for independent Poisson goal rates"""
+    goals = np.arange(MAX_GOALS + 1)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    home = np.exp(goals * np.log(home_rate)[:, None] - home_rate[:, None] - log_factorial)
+    away = np.exp(goals * np.log(away_rate)[:, None] - away_rate[:, None] - log_factorial)
+    joint = home[:, :, None] * away[:, None, :]
+    home_win = np.tril(np.ones((MAX_GOALS + 1, MAX_GOALS + 1)), -1)
+    draw = np.eye(MAX_GOALS + 1)
+    p_home = (joint * home_win).sum(axis=(1, 2))
+    p_draw = (joint * draw).sum(axis=(1, 2))
+    total = joint.sum(axis=(1, 2))
+    return p_home / total, p_draw / total, (total - p_home - p_draw) / total
+
+
+def _result(home_goals, away_goals):
+    return np.where(home_goals > away_goals, 'H', np.where(home_goals < away_goals, 'A', 'D'))
+
+
+def season_code(start_year):
+    """2007 -> '0708'"""
+    return f"{start_year % 100:02d}{(start_year + 1) % 100:02d}"
+
+
+def generate_league_season(rng, model, league, start_year):
+    """One season of one league as a DataFrame (MatchID is filled in later)
+
+    league is a dict with 'teams', 'team_ids', 'attack', 'defence' and
+    'referees'; strengths are read as they are for this season.
+    """
+    fixtures = [(round_index, home, away)
+                for round_index, pairs in enumerate(round_robin(len(league['teams'])))
+                for home, away in pairs]
+    rounds = np.array([f[0] for f in fixtures])
+    home = np.array([f[1] for f in fixtures])
+    away = np.array([f[2] for f in fixtures])
+    n = len(fixtures)
+
+    # Centre the strengths and correct for the lognormal mean so league scoring matches the fitted rates
+    attack = league['attack'] - league['attack'].mean()
+    defence = league['defence'] - league['defence'].mean()
+    correction = (model['attack_sd'] ** 2 + model['defence_sd'] ** 2) / 2  # Opponents' strengths are independent
+    home_rate = model['home_goals'] * np.exp(attack[home] - defence[away] - correction)
+    away_rate = model['away_goals'] * np.exp(attack[away] - defence[home] - correction)
+    home_goals = rng.poisson(home_rate)
+    away_goals = rng.poisson(away_rate)
+    home_ht = rng.binomial(home_goals, model['half_time_share'])
+    away_ht = rng.binomial(away_goals, model['half_time_share'])
+
+    # Extra shots grow with how dangerous the side is expected to be (damped, since
+    # the fitted dispersion already includes the spread between teams)
+    home_extra = _draw_counts(rng, model['home_extra_shots'], n, np.sqrt(home_rate / model['home_goals']))
+    away_extra = _draw_counts(rng, model['away_extra_shots'], n, np.sqrt(away_rate / model['away_goals']))
+
+    p_home, p_draw, p_away = outcome_probabilities(home_rate, away_rate)
+    margin = 1 + model['odds_margin']
+
+    # First round on the second Saturday of August, one round a week
+    start = pd.Timestamp(year=start_year, month=8, day=8)
+    start += pd.Timedelta(days=(5 - start.dayofweek) % 7)
+    dates = start + pd.to_timedelta(rounds * MATCHES_PER_ROUND_DAYS, unit='D')
+
+    season = pd.DataFrame({
+        'homeTeamID': league['team_ids'][home],
+        'awayTeamID': league['team_ids'][away],
+        'Date': dates.strftime('%d/%m/%Y'),
+        'HomeTeam': league['teams'][home],
+        'AwayTeam': league['teams'][away],
+        'FTHG': home_goals,
+        'FTAG': away_goals,
+        'FTR': _result(home_goals, away_goals),
+        'HTHG': home_ht,
+        'HTAG': away_ht,
+        'HTR': _result(home_ht, away_ht),
+        'Referee': rng.choice(league['referees'], n),
+        'HS': home_goals + home_extra,
+        'AS': away_goals + away_extra,
+        'HST': home_goals + rng.binomial(home_extra, model['home_on_target_share']),
+        'AST': away_goals + rng.binomial(away_extra, model['away_on_target_share']),
+        'B365H': np.round(1 / (p_home * margin), 2),
+        'B365D': np.round(1 / (p_draw * margin), 2),
+        'B365A': np.round(1 / (p_away * margin), 2),
+    })
+    for col in COUNT_COLUMNS:
+        season[col] = _draw_counts(rng, model[col], n)
+    return season
+
+
+def generate_seasons(n_leagues=1, n_teams=20, n_seasons=10, first_season=2000, seed=0, model=None,
+                     first_team_id=1, first_match_id=1, source_dir=SOURCE_DIR):
+    """Synthetic seasons for n_leagues leagues of n_teams teams: season code -> DataFrame.
+
+    All leagues of a season share one frame, like several leagues loaded side
+    by side. Team IDs start at first_team_id and MatchIDs at first_match_id.
+    """
+    if n_teams < 2:
+        raise ValueError("A league needs at least two teams")
+    if first_season < 2000 or first_season + n_seasons > 2099:
+        raise ValueError("Season codes only cover 2000/2001 to 2098/2099")
+    if first_team_id + n_leagues * n_teams > np.iinfo(np.int16).max:
+        raise ValueError("Team IDs must fit in the match store's int16 ID columns")
+
+    rng = np.random.default_rng(seed)
+    model = model or fit_match_model(source_dir)
+
+    leagues = []
+    for league in range(n_leagues):
+        ids = first_team_id + league * n_teams + np.arange(n_teams)
+        attack, defence = _draw_strengths(rng, model, n_teams)
+        leagues.append({
+            'teams': np.array([f"L{league + 1} Team {team + 1:02d}" for team in range(n_teams)]),
+            'team_ids': ids,
+            'attack': attack,
+            'defence': defence,
+            'referees': np.array([f"L{league + 1} Referee {ref + 1:02d}" for ref in range(REFEREES_PER_LEAGUE)]),
+        })
+
+    seasons = {}
+    next_match_id = first_match_id
+    for start_year in range(first_season, first_season + n_seasons):
+        frames = []
+        for league in leagues:
+            frames.append(generate_league_season(rng, model, league, start_year))
+            # AR(1) drift keeps the spread of strengths stable over any number of seasons
+            innovations = _draw_strengths(rng, model, n_teams, np.sqrt(1 - STRENGTH_PERSISTENCE ** 2))
+            for side, innovation in zip(['attack', 'defence'], innovations):
+                league[side] = STRENGTH_PERSISTENCE * league[side] + innovation
+
+        season = pd.concat(frames, ignore_index=True)
+        season.insert(0, 'MatchID', np.arange(next_match_id, next_match_id + len(season)))
+        next_match_id += len(season)
+        seasons[season_code(start_year)] = season[COLUMNS]
+    return seasons
+
+
+def write_seasons(seasons, output_dir):
+    """Save one EPLS<code>.csv per season; returns the written paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for code, season in seasons.items():
+        path = os.path.join(output_dir, f"EPLS{code}.csv")
+        season.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic EPLS*.csv season files")
+    parser.add_argument('output_dir')
+    parser.add_argument('--leagues', type=int, default=1)
+    parser.add_argument('--teams', type=int, default=20)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--first-season', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    seasons = generate_seasons(args.leagues, args.teams, args.seasons, args.first_season, args.seed)
+    paths = write_seasons(seasons, args.output_dir)
+    print(f"Wrote {sum(len(season) for season in seasons.values())} matches to {len(paths)} season files "
+          f"in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])